@@ -0,0 +1,197 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from py2gds.connection import Connection
+from py2gds.exceptions import IndexPopulationFailed
+from py2gds.ingestion import NodeMapping, RelationshipMapping
+from py2gds.query import Query
+from py2gds.queries import Node, Relationship, CreateIndex, ShowIndexes
+from py2gds.rank import Rank, RankConfigurationWithFilter
+
+
+@dataclass(frozen=True)
+class IndexRequirement:
+    """
+    Node lookup by label and properties that py2gds generates. It's covered by any index on the label whose
+    properties are all used by the lookup.
+
+    """
+
+    label: str
+    properties: Tuple[str, ...]
+
+    @property
+    def index_name(self) -> str:
+        return f"{self.label}_{'_'.join(self.properties)}_index"
+
+    def is_covered_by(self, index: "IndexStatus") -> bool:
+        return self.label in index.labels and set(index.properties) <= set(
+            self.properties
+        )
+
+
+@dataclass(frozen=True)
+class IndexStatus:
+    name: str
+    labels: Tuple[str, ...]
+    properties: Tuple[str, ...]
+    state: str
+    population_percent: float
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> "IndexStatus":
+        return cls(
+            result["name"],
+            tuple(result["labelsOrTypes"] or ()),
+            tuple(result["properties"] or ()),
+            result["state"],
+            result["populationPercent"],
+        )
+
+
+@dataclass(frozen=True)
+class IndexAdvisor:
+    """
+    It checks the label and property lookups generated by py2gds (MATCH clauses of nodes, source nodes filters
+    of personalized ranks and ingestion mappings) against the existing indexes, and optionally creates the missing
+    ones with CreateIndex.
+
+    """
+
+    connection: Connection
+
+    def requirements(self, *sources: Any) -> List[IndexRequirement]:
+        requirements = []
+        for source in sources:
+            for requirement in self._requirements_of(source):
+                if requirement not in requirements:
+                    requirements.append(requirement)
+        return requirements
+
+    def existing_indexes(self, log: bool = True) -> List[IndexStatus]:
+        return [
+            IndexStatus.from_result(result)
+            for result in ShowIndexes(self.connection).run(log)
+        ]
+
+    def missing_indexes(self, *sources: Any, log: bool = True) -> List[IndexRequirement]:
+        indexes = self.existing_indexes(log)
+        return [
+            requirement
+            for requirement in self.requirements(*sources)
+            if not any(requirement.is_covered_by(index) for index in indexes)
+        ]
+
+    def label_scans(self, query: Query) -> List[str]:
+        """
+        It explains the query and returns the details of its NodeByLabelScan operators.
+
+        """
+        plan = self.connection.explain(query.cypher, query.parameters)
+        return [
+            operator.get("args", {}).get("Details", "")
+            for operator in self._operators(plan)
+            if operator.get("operatorType", "").startswith("NodeByLabelScan")
+        ]
+
+    def create_missing_indexes(
+        self,
+        *sources: Any,
+        wait: bool = True,
+        timeout: Optional[float] = None,
+        poll_interval: float = 1.0,
+        progress: Optional[Callable[[IndexStatus], None]] = None,
+        log: bool = True,
+    ) -> List[IndexRequirement]:
+        """
+        It creates the indexes that sources need and are missing.
+
+        Args:
+            sources: Index requirements, nodes, relationships, ranks, ranks' configurations or ingestion
+                mappings.
+            wait: it indicates if it waits until the new indexes are populated.
+            timeout: Maximum number of seconds to wait for population.
+            poll_interval: Seconds between population checks.
+            progress: Function called with the status of every new index on each check.
+
+        Returns:
+            Created indexes.
+
+        """
+        missing_indexes = self.missing_indexes(*sources, log=log)
+        for requirement in missing_indexes:
+            CreateIndex(
+                self.connection,
+                requirement.label,
+                list(requirement.properties),
+                requirement.index_name,
+            ).run(log)
+
+        if wait and missing_indexes:
+            self.wait_for_population(
+                [requirement.index_name for requirement in missing_indexes],
+                timeout,
+                poll_interval,
+                progress,
+                log,
+            )
+        return missing_indexes
+
+    def wait_for_population(
+        self,
+        index_names: List[str],
+        timeout: Optional[float] = None,
+        poll_interval: float = 1.0,
+        progress: Optional[Callable[[IndexStatus], None]] = None,
+        log: bool = True,
+    ) -> bool:
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            statuses = [
+                index
+                for index in self.existing_indexes(log)
+                if index.name in index_names
+            ]
+            for status in statuses:
+                if progress:
+                    progress(status)
+                if status.state == "FAILED":
+                    raise IndexPopulationFailed(f"Population of {status.name} failed")
+            online = {status.name for status in statuses if status.state == "ONLINE"}
+            if online >= set(index_names):
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_interval)
+
+    @classmethod
+    def _requirements_of(cls, source: Any) -> Iterator[IndexRequirement]:
+        if isinstance(source, IndexRequirement):
+            yield source
+        elif isinstance(source, Node):
+            if source.properties:
+                yield IndexRequirement(source.label, tuple(sorted(source.properties)))
+        elif isinstance(source, Relationship):
+            yield from cls._requirements_of(source.from_node)
+            yield from cls._requirements_of(source.to_node)
+        elif isinstance(source, RankConfigurationWithFilter):
+            for _, label, filters in source.filter_elements or ():
+                yield IndexRequirement(label, tuple(sorted(filters)))
+        elif isinstance(source, Rank):
+            yield from cls._requirements_of(source.configuration)
+        elif isinstance(source, NodeMapping):
+            yield IndexRequirement(source.label, (source.key,))
+        elif isinstance(source, RelationshipMapping):
+            for node in (source.from_node, source.to_node):
+                yield IndexRequirement(node.label, (node.key,))
+        elif source_node := getattr(source, "node", None):
+            yield from cls._requirements_of(source_node)
+        elif source_relationship := getattr(source, "relationship", None):
+            yield from cls._requirements_of(source_relationship)
+
+    @classmethod
+    def _operators(cls, plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        yield plan
+        for child in plan.get("children", ()):
+            yield from cls._operators(child)
@@ -1,6 +1,18 @@
 from abc import ABC, abstractmethod
 from enum import Enum
-
+from typing import Optional, Tuple
+
+from py2gds.cypher import (
+    Call,
+    Clause,
+    Limit,
+    OrderBy,
+    Return,
+    Skip,
+    Statement,
+    Where,
+    Yield,
+)
 from py2gds.query import Query
 
 
@@ -22,84 +34,80 @@ class Algorithm(Query):
 
     @property
     @abstractmethod
-    def match_lines(self) -> str:
+    def match_clauses(self) -> Tuple[Clause, ...]:
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def call_clause(self) -> Call:
         raise NotImplementedError
 
     @property
     @abstractmethod
-    def call_line(self) -> str:
+    def yield_clause(self) -> Optional[Yield]:
         raise NotImplementedError
 
     @property
     @abstractmethod
-    def yield_line(self) -> str:
+    def with_clause(self) -> Optional[Clause]:
         raise NotImplementedError
 
     @property
     @abstractmethod
-    def with_line(self) -> str:
+    def additional_clauses(self) -> Tuple[Clause, ...]:
         raise NotImplementedError
 
     @property
     @abstractmethod
-    def additional_operation(self) -> str:
+    def where_clause(self) -> Optional[Where]:
         raise NotImplementedError
 
     @property
     @abstractmethod
-    def filter_line(self) -> str:
+    def group_clauses(self) -> Tuple[Clause, ...]:
         raise NotImplementedError
 
     @property
     @abstractmethod
-    def return_line(self) -> str:
+    def return_clause(self) -> Optional[Return]:
         raise NotImplementedError
 
     @property
     @abstractmethod
-    def order_line(self) -> str:
+    def order_clause(self) -> Optional[OrderBy]:
         raise NotImplementedError
 
     @property
     @abstractmethod
-    def limit_line(self) -> str:
+    def limit_clause(self) -> Optional[Limit]:
         raise NotImplementedError
 
     @property
     @abstractmethod
-    def skip_line(self) -> str:
+    def skip_clause(self) -> Optional[Skip]:
         raise NotImplementedError
 
     @property
-    def cypher(self) -> str:
-        cypher = f"""{self.match_lines}
-        {self.call_line}
-        {self.yield_line}
-        {self.with_line}
-        {self.additional_operation}
-        {self.filter_line}
-        {self.return_line}
-        {self.order_line}
-        {self.skip_line}
-        {self.limit_line}
-        """
-
-        return self._clean(cypher)
-
-    @staticmethod
-    def _clean(cypher):
-        non_empty_lines = [
-            stripped_line
-            for line in cypher.split("\n")
-            if (stripped_line := line.strip()) and len(stripped_line)
-        ]
-
-        return "\n".join(non_empty_lines)
+    def statement(self) -> Statement:
+        clauses = (
+            *self.match_clauses,
+            self.call_clause,
+            self.yield_clause,
+            self.with_clause,
+            *self.additional_clauses,
+            self.where_clause,
+            *self.group_clauses,
+            self.return_clause,
+            self.order_clause,
+            self.skip_clause,
+            self.limit_clause,
+        )
+        return Statement(tuple(clause for clause in clauses if clause is not None))
 
 
 class AlgorithmConfiguration(ABC):
     @property
-    def match_lines(self):
+    def match_clauses(self) -> Tuple[Clause, ...]:
         raise NotImplementedError
 
     @property
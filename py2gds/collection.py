@@ -1,35 +1,92 @@
-from dataclasses import dataclass
-from typing import List, Tuple, Dict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, List, Tuple, Dict, Iterator, Optional
 
 from py2gds.connection import Connection
-from py2gds.exceptions import ProjectionNotFound
-from py2gds.projection import TaggedProjection, Projection
+from py2gds.exceptions import ProjectionIsNotSetup, ProjectionNotFound
+from py2gds.progress import ProgressCallback
+from py2gds.projection import TaggedProjection, Projection, ProjectionTemplate
 
 
 @dataclass(frozen=True)
 class Collection:
-    projections: List[TaggedProjection]
+    """
+    Set of tagged projections indexed by tag. Projections generated from templates are only built the first
+    time one of their tags is looked up, so startup and lookups don't depend on the number of combinations.
+
+    """
+
+    tagged_projections: List[TaggedProjection] = field(default_factory=list)
+    templates: Tuple[ProjectionTemplate, ...] = ()
+    connection: Optional[Connection] = None
+    _index: Dict[str, TaggedProjection] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    def __post_init__(self):
+        for projection in self.tagged_projections:
+            self._add_to_index(projection)
 
     @classmethod
     def create_from_projections_parameters(
-        cls, connection: Connection, projections_parameters: Tuple[Dict[str, List[str]]]
+        cls, connection: Connection, projections_parameters: Tuple[Dict[str, Any], ...]
     ):
-        projections = [
-            projection
+        templates = tuple(
+            ProjectionTemplate.create(**projection_parameters)
             for projection_parameters in projections_parameters
-            for projection in TaggedProjection.consolidate(
-                connection, **projection_parameters
-            )
-        ]
-        return Collection(projections)
+        )
+        return Collection(templates=templates, connection=connection)
+
+    @property
+    def projections(self) -> List[TaggedProjection]:
+        """
+        Every projection of the collection. Combinations of templates are built on every access, so lookups
+        should go through get_projection_by_tag.
+
+        """
+        return list(self)
+
+    def __iter__(self) -> Iterator[TaggedProjection]:
+        yield from self.tagged_projections
+        for template in self.templates:
+            for formatter in template.formatters():
+                yield self._build(template, formatter)
+
+    def __len__(self):
+        return len(self.tagged_projections) + sum(
+            len(template) for template in self.templates
+        )
 
     def get_projection_by_tag(self, tag: str) -> Projection:
-        for projection in self.projections:
-            if tag in projection.tags:
-                return projection
+        if projection := self._index.get(tag):
+            return projection
+
+        for template in self.templates:
+            if (formatter := template.match(tag)) is not None:
+                projection = self._build(template, formatter)
+                with self._lock:
+                    return self._add_to_index(projection)[tag]
         raise ProjectionNotFound(f"Projection with tag {tag} not found")
 
-    def create(self, log: bool = True):
-        for projection in self.projections:
+    def create(self, log: bool = True, progress: Optional[ProgressCallback] = None):
+        """
+        It creates the projections that don't exist yet. When progress is set, it's called with the progress of
+        every creation, and the creation is killed if it returns False.
+
+        """
+        for projection in self:
             if not projection.exists(log):
-                projection.create(log)
+                projection.create(log, progress=progress)
+
+    def _build(
+        self, template: ProjectionTemplate, formatter: Dict[str, str]
+    ) -> TaggedProjection:
+        if self.connection is None:
+            raise ProjectionIsNotSetup("Templates need the connection of the collection")
+        return template.projection(self.connection, formatter)
+
+    def _add_to_index(self, projection: TaggedProjection) -> Dict[str, TaggedProjection]:
+        for tag in projection.tags:
+            self._index.setdefault(tag, projection)
+        return self._index
@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from py2gds.connection import Connection
+
+
+@dataclass(frozen=True)
+class Concurrency:
+    """
+    Number of threads GDS uses to compute an algorithm, to load a projection and to write results back.
+    None means that the server default is used.
+
+    """
+
+    concurrency: Optional[int] = None
+    read_concurrency: Optional[int] = None
+    write_concurrency: Optional[int] = None
+
+    @classmethod
+    def from_cores(cls, cores: int, interactive: bool = False) -> "Concurrency":
+        """
+        Default policy derived from the number of cores of the server. Batch jobs use all cores but one, which is
+        left to the transaction and Bolt threads. Interactive jobs are capped to a quarter of the cores so that
+        several of them can run side by side.
+
+        Args:
+            cores: Number of cores available to the database server.
+            interactive: it indicates if the policy is for interactive or batch jobs.
+
+        Returns:
+            Concurrency.
+
+        """
+        threads = max(1, cores // 4) if interactive else max(1, cores - 1)
+        return cls(threads, threads, threads)
+
+    @classmethod
+    def from_server(
+        cls, connection: "Connection", interactive: bool = False
+    ) -> "Concurrency":
+        from py2gds.queries import AvailableProcessors
+
+        return cls.from_cores(AvailableProcessors(connection).run(), interactive)
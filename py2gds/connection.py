@@ -1,23 +1,331 @@
+import asyncio
+import json
 from abc import ABC
-from dataclasses import dataclass
-from typing import Any, Dict, List
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import partial
+from itertools import cycle
+from typing import Any, Dict, List, Tuple, Iterator, Optional
 
-from neo4j import Neo4jDriver, GraphDatabase
+from neo4j import Neo4jDriver, GraphDatabase, Query as DriverQuery
+
+from py2gds.concurrency import Concurrency
+from py2gds.singleflight import SingleFlight
+from py2gds.utils import normalize_cypher
+
+
+class AccessMode(str, Enum):
+    read = "READ"
+    write = "WRITE"
+
+
+def query_key(
+    query: str, access_mode: AccessMode, parameters: Optional[Dict[str, Any]]
+) -> Tuple[str, AccessMode, str]:
+    """
+    Key under which equivalent executions of a query compare equal.
+
+    """
+    return (
+        normalize_cypher(query),
+        access_mode,
+        json.dumps(parameters, sort_keys=True, default=str),
+    )
 
 
 class Connection(ABC):
-    def execute(self, query: str) -> Any:
+    @property
+    def concurrency(self) -> Optional[Concurrency]:
+        """
+        Default concurrency applied to the queries that run through this connection.
+
+        """
+        return None
+
+    @property
+    def members(self) -> Tuple["Connection", ...]:
+        """
+        Connections to every database member that queries sent through this connection may run on.
+
+        """
+        return (self,)
+
+    def execute(
+        self,
+        query: str,
+        access_mode: AccessMode = AccessMode.write,
+        parameters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        raise NotImplementedError
+
+    def stream(
+        self,
+        query: str,
+        access_mode: AccessMode = AccessMode.write,
+        parameters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        It yields the results of the query as they are received. By default, they are fetched with execute.
+
+        """
+        yield from self.execute(query, access_mode, parameters, timeout, metadata)
+
+    def explain(
+        self, query: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        It returns the execution plan of the query without running it.
+
+        """
         raise NotImplementedError
 
 
 @dataclass(frozen=True)
 class Neo4JDriverConnection(Connection):
+    """
+    Connection backed by the official driver. Use a neo4j:// uri against a cluster so the driver routes
+    sessions by access mode: writes go to the leader and reads are balanced over the other members.
+
+    Transactions that run longer than their timeout, or default_timeout when the query doesn't set one, are
+    terminated by the server.
+
+    """
+
     driver: Neo4jDriver
+    default_concurrency: Optional[Concurrency] = None
+    default_timeout: Optional[float] = None
+
+    @classmethod
+    def create(
+        cls,
+        uri: str,
+        user: str,
+        password: str,
+        concurrency: Optional[Concurrency] = None,
+        default_timeout: Optional[float] = None,
+    ) -> "Neo4JDriverConnection":
+        return cls(
+            GraphDatabase.driver(uri, auth=(user, password)),
+            concurrency,
+            default_timeout,
+        )
+
+    @property
+    def concurrency(self) -> Optional[Concurrency]:
+        return self.default_concurrency
+
+    def execute(
+        self,
+        query: str,
+        access_mode: AccessMode = AccessMode.write,
+        parameters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        timeout = timeout if timeout is not None else self.default_timeout
+        with self.driver.session(default_access_mode=access_mode.value) as session:
+            return session.run(
+                DriverQuery(query, metadata, timeout), parameters
+            ).data()
+
+    def stream(
+        self,
+        query: str,
+        access_mode: AccessMode = AccessMode.write,
+        parameters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Records are decoded while the rest are fetched. The session stays open until the iterator is exhausted
+        or closed.
+
+        """
+        timeout = timeout if timeout is not None else self.default_timeout
+        with self.driver.session(default_access_mode=access_mode.value) as session:
+            result = session.run(DriverQuery(query, metadata, timeout), parameters)
+            for record in result:
+                yield record.data()
+
+    def explain(
+        self, query: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        with self.driver.session(default_access_mode=AccessMode.read.value) as session:
+            return session.run(f"EXPLAIN {query}", parameters).consume().plan
+
+
+@dataclass(frozen=True)
+class RoutingConnection(Connection):
+    """
+    It sends write queries to the writer connection and load-balances read queries over the readers in
+    round-robin order. Reads fall back to the writer when there are no readers.
+
+    GDS graphs live in the memory of the member that created them, so projections, ranks and their progress
+    are all sent as writes and stay on the writer.
+
+    """
+
+    writer: Connection
+    readers: Tuple[Connection, ...] = ()
+    _readers_cycle: Iterator[Connection] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_readers_cycle", cycle(self.readers))
 
     @classmethod
-    def create(cls, uri: str, user: str, password: str) -> "Neo4JDriverConnection":
-        return cls(GraphDatabase.driver(uri, auth=(user, password)))
+    def create(
+        cls,
+        writer_uri: str,
+        readers_uris: Tuple[str, ...],
+        user: str,
+        password: str,
+        concurrency: Optional[Concurrency] = None,
+        default_timeout: Optional[float] = None,
+    ) -> "RoutingConnection":
+        return cls(
+            Neo4JDriverConnection.create(
+                writer_uri, user, password, concurrency, default_timeout
+            ),
+            tuple(
+                Neo4JDriverConnection.create(
+                    reader_uri, user, password, concurrency, default_timeout
+                )
+                for reader_uri in readers_uris
+            ),
+        )
+
+    @property
+    def concurrency(self) -> Optional[Concurrency]:
+        return self.writer.concurrency
+
+    @property
+    def members(self) -> Tuple[Connection, ...]:
+        return tuple(
+            member
+            for connection in (self.writer, *self.readers)
+            for member in connection.members
+        )
+
+    def route(self, access_mode: AccessMode) -> Connection:
+        if access_mode == AccessMode.read and self.readers:
+            return next(self._readers_cycle)
+        return self.writer
+
+    def execute(
+        self,
+        query: str,
+        access_mode: AccessMode = AccessMode.write,
+        parameters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        return self.route(access_mode).execute(
+            query, access_mode, parameters, timeout, metadata
+        )
+
+    def stream(
+        self,
+        query: str,
+        access_mode: AccessMode = AccessMode.write,
+        parameters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        return self.route(access_mode).stream(
+            query, access_mode, parameters, timeout, metadata
+        )
+
+    def explain(
+        self, query: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        return self.route(AccessMode.read).explain(query, parameters)
+
+
+@dataclass(frozen=True)
+class SingleFlightConnection(Connection):
+    """
+    It shares one in-flight execution among concurrent callers sending the same normalized query with the same
+    parameters, from threads or asyncio tasks. Only reads are coalesced unless coalesce_writes is set, because
+    two identical writes are usually meant to run twice. Callers joining an in-flight execution share the
+    timeout and metadata of the one that started it.
+
+    """
+
+    connection: Connection
+    coalesce_writes: bool = False
+    _flights: SingleFlight = field(
+        default_factory=SingleFlight, repr=False, compare=False
+    )
+
+    @property
+    def concurrency(self) -> Optional[Concurrency]:
+        return self.connection.concurrency
+
+    @property
+    def members(self) -> Tuple[Connection, ...]:
+        return self.connection.members
+
+    @staticmethod
+    def key(
+        query: str, access_mode: AccessMode, parameters: Optional[Dict[str, Any]]
+    ) -> Tuple[str, AccessMode, str]:
+        return query_key(query, access_mode, parameters)
+
+    def execute(
+        self,
+        query: str,
+        access_mode: AccessMode = AccessMode.write,
+        parameters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        if access_mode == AccessMode.write and not self.coalesce_writes:
+            return self.connection.execute(
+                query, access_mode, parameters, timeout, metadata
+            )
+        return self._flights.do(
+            self.key(query, access_mode, parameters),
+            lambda: self.connection.execute(
+                query, access_mode, parameters, timeout, metadata
+            ),
+        )
+
+    def stream(
+        self,
+        query: str,
+        access_mode: AccessMode = AccessMode.write,
+        parameters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streams aren't shared: every caller consumes its own results.
+
+        """
+        return self.connection.stream(query, access_mode, parameters, timeout, metadata)
+
+    async def execute_async(
+        self,
+        query: str,
+        access_mode: AccessMode = AccessMode.write,
+        parameters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        execute = partial(
+            self.connection.execute, query, access_mode, parameters, timeout, metadata
+        )
+        if access_mode == AccessMode.write and not self.coalesce_writes:
+            return await asyncio.get_running_loop().run_in_executor(None, execute)
+        return await self._flights.do_async(
+            self.key(query, access_mode, parameters), execute
+        )
 
-    def execute(self, query: str) -> List[Dict[str, Any]]:
-        with self.driver.session() as session:
-            return session.run(query).data()
+    def explain(
+        self, query: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        return self.connection.explain(query, parameters)
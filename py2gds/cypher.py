@@ -0,0 +1,408 @@
+"""
+Clause-level representation of Cypher statements. Queries build a Statement out of clauses, rewrite passes
+work on the clauses, and the statement is rendered in a single pass with literals and names escaped.
+
+"""
+import re
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Any, Callable, List, Mapping, Optional, Tuple
+
+from py2gds.utils import quote_identifier
+
+SIMPLE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+ALIAS = re.compile(r"\s+AS\s+(\w+)$", re.IGNORECASE)
+AGGREGATION = re.compile(
+    r"\b(?:collect|count|sum|avg|min|max|percentileCont|percentileDisc|stDev)\s*\(",
+    re.IGNORECASE,
+)
+
+
+def quote(value: str) -> str:
+    escaped_value = value.replace("\\", "\\\\").replace("'", "\\'")
+    return f"'{escaped_value}'"
+
+
+def name(value: str) -> str:
+    """
+    It renders a label, relationship type, property key or variable, quoting it only when needed.
+
+    """
+    return value if SIMPLE_NAME.match(value) else quote_identifier(value)
+
+
+@dataclass(frozen=True)
+class Expression:
+    """
+    Cypher expression rendered verbatim, e.g. a variable or a parameter.
+
+    """
+
+    text: str
+
+    def __str__(self):
+        return self.text
+
+
+def literal(value: Any) -> str:
+    if isinstance(value, Expression):
+        return value.text
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, Enum):
+        return literal(value.value)
+    if isinstance(value, str):
+        return quote(value)
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, Mapping):
+        return map_literal(value)
+    if isinstance(value, (list, tuple)):
+        return f"[{', '.join(literal(item) for item in value)}]"
+    return quote(str(value))
+
+
+def map_literal(properties: Mapping[str, Any]) -> str:
+    items = ", ".join(
+        f"{name(key)}: {literal(value)}" for key, value in properties.items()
+    )
+    return f"{{{items}}}"
+
+
+def node_pattern(
+    reference: Optional[str] = None,
+    label: Optional[str] = None,
+    properties: Optional[Mapping[str, Any]] = None,
+) -> str:
+    pattern = name(reference) if reference else ""
+    if label:
+        pattern += f":{name(label)}"
+    if properties:
+        pattern += f" {map_literal(properties)}"
+    return f"({pattern})"
+
+
+def alias(item: str) -> str:
+    """
+    Name under which a projected item is available to the following clauses.
+
+    """
+    match = ALIAS.search(item)
+    return match.group(1) if match else item.strip()
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """
+    Boolean expression of a WHERE. variables are the ones it reads, and None means they are unknown, so the
+    predicate is never moved.
+
+    """
+
+    expression: str
+    variables: Optional[Tuple[str, ...]] = None
+
+
+def predicates_line(predicates: Tuple[Predicate, ...]) -> str:
+    if not predicates:
+        return ""
+    return "\nWHERE " + " AND ".join(predicate.expression for predicate in predicates)
+
+
+class Clause:
+    @property
+    def is_empty(self) -> bool:
+        return False
+
+    @property
+    def bound(self) -> Optional[Tuple[str, ...]]:
+        """
+        Variables available after the clause, or None when the clause keeps the ones before it.
+
+        """
+        return None
+
+    def render(self) -> str:
+        raise NotImplementedError
+
+
+@dataclass(frozen=True)
+class Raw(Clause):
+    text: str
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.text.strip()
+
+    def render(self) -> str:
+        return self.text
+
+
+@dataclass(frozen=True)
+class Match(Clause):
+    patterns: Tuple[str, ...]
+    optional: bool = False
+    predicates: Tuple[Predicate, ...] = ()
+
+    def render(self) -> str:
+        verb = "OPTIONAL MATCH" if self.optional else "MATCH"
+        return f"{verb} {', '.join(self.patterns)}{predicates_line(self.predicates)}"
+
+
+@dataclass(frozen=True)
+class Call(Clause):
+    procedure: str
+    arguments: Tuple[Any, ...] = ()
+
+    def render(self) -> str:
+        arguments = ", ".join(literal(argument) for argument in self.arguments)
+        return f"CALL {self.procedure}({arguments})"
+
+
+@dataclass(frozen=True)
+class Yield(Clause):
+    items: Tuple[str, ...]
+    predicates: Tuple[Predicate, ...] = ()
+
+    @property
+    def bound(self) -> Optional[Tuple[str, ...]]:
+        return tuple(alias(item) for item in self.items)
+
+    def render(self) -> str:
+        return f"YIELD {', '.join(self.items)}{predicates_line(self.predicates)}"
+
+
+@dataclass(frozen=True)
+class With(Clause):
+    items: Tuple[str, ...]
+    predicates: Tuple[Predicate, ...] = ()
+
+    @property
+    def aggregates(self) -> bool:
+        return any(AGGREGATION.search(item) for item in self.items)
+
+    @property
+    def bound(self) -> Optional[Tuple[str, ...]]:
+        return tuple(alias(item) for item in self.items)
+
+    def passes_through(self, variable: str) -> bool:
+        return not self.aggregates and variable in self.items
+
+    def render(self) -> str:
+        return f"WITH {', '.join(self.items)}{predicates_line(self.predicates)}"
+
+
+@dataclass(frozen=True)
+class Unwind(Clause):
+    expression: str
+    variable: str
+
+    def render(self) -> str:
+        return f"UNWIND {self.expression} AS {self.variable}"
+
+
+@dataclass(frozen=True)
+class Where(Clause):
+    predicates: Tuple[Predicate, ...]
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.predicates
+
+    def render(self) -> str:
+        return predicates_line(self.predicates).lstrip("\n")
+
+
+@dataclass(frozen=True)
+class Create(Clause):
+    patterns: Tuple[str, ...]
+
+    def render(self) -> str:
+        return "CREATE " + ",\n".join(self.patterns)
+
+
+@dataclass(frozen=True)
+class Delete(Clause):
+    variables: Tuple[str, ...]
+    detach: bool = False
+
+    def render(self) -> str:
+        verb = "DETACH DELETE" if self.detach else "DELETE"
+        return f"{verb} {', '.join(self.variables)}"
+
+
+@dataclass(frozen=True)
+class Remove(Clause):
+    items: Tuple[str, ...]
+
+    def render(self) -> str:
+        return f"REMOVE {', '.join(self.items)}"
+
+
+@dataclass(frozen=True)
+class Return(Clause):
+    items: Tuple[str, ...]
+
+    @property
+    def bound(self) -> Optional[Tuple[str, ...]]:
+        return tuple(alias(item) for item in self.items)
+
+    def render(self) -> str:
+        return f"RETURN {', '.join(self.items)}"
+
+
+@dataclass(frozen=True)
+class OrderBy(Clause):
+    items: Tuple[str, ...]
+    descending: bool = False
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.items
+
+    def render(self) -> str:
+        direction = " DESC" if self.descending else ""
+        return f"ORDER BY {', '.join(self.items)}{direction}"
+
+
+@dataclass(frozen=True)
+class Skip(Clause):
+    count: Optional[int]
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.count
+
+    def render(self) -> str:
+        return f"SKIP {self.count}"
+
+
+@dataclass(frozen=True)
+class Limit(Clause):
+    count: Optional[int]
+
+    @property
+    def is_empty(self) -> bool:
+        return self.count is None
+
+    def render(self) -> str:
+        return f"LIMIT {self.count}"
+
+
+Pass = Callable[[Tuple[Clause, ...]], Tuple[Clause, ...]]
+
+
+def attach_where(clauses: Tuple[Clause, ...]) -> Tuple[Clause, ...]:
+    """
+    It merges standalone WHERE clauses into the MATCH, YIELD or WITH they filter.
+
+    """
+    if not any(isinstance(clause, Where) for clause in clauses):
+        return clauses
+    attached: List[Clause] = []
+    for clause in clauses:
+        previous = attached[-1] if attached else None
+        if isinstance(clause, Where) and isinstance(previous, (Match, Yield, With)):
+            attached[-1] = replace(
+                previous, predicates=previous.predicates + clause.predicates
+            )
+        else:
+            attached.append(clause)
+    return tuple(attached)
+
+
+def remove_dead_clauses(clauses: Tuple[Clause, ...]) -> Tuple[Clause, ...]:
+    """
+    It drops clauses that don't change the result: empty ones and a WITH that only carries the variables of
+    the clause before it. A WITH followed by ORDER BY, SKIP or LIMIT is kept, since they belong to it.
+
+    """
+    clauses = tuple(clause for clause in clauses if not clause.is_empty)
+    alive: List[Clause] = []
+    for index, clause in enumerate(clauses):
+        following = clauses[index + 1] if index + 1 < len(clauses) else None
+        if (
+            isinstance(clause, With)
+            and not clause.predicates
+            and not isinstance(following, (OrderBy, Skip, Limit))
+            and alive
+            and alive[-1].bound is not None
+            and clause.items == alive[-1].bound
+        ):
+            continue
+        alive.append(clause)
+    return tuple(alive)
+
+
+def push_down_predicates(clauses: Tuple[Clause, ...]) -> Tuple[Clause, ...]:
+    """
+    It moves predicates of a WITH to the YIELD or WITH before it when every variable they read is carried
+    unchanged, so rows are discarded before the projection is computed for them.
+
+    """
+    if not any(isinstance(clause, With) and clause.predicates for clause in clauses):
+        return clauses
+    rewritten: List[Clause] = list(clauses)
+    moved = True
+    while moved:
+        moved = False
+        for index in range(1, len(rewritten)):
+            clause, previous = rewritten[index], rewritten[index - 1]
+            if not isinstance(clause, With) or not isinstance(previous, (Yield, With)):
+                continue
+            bound = previous.bound or ()
+            movable = tuple(
+                predicate
+                for predicate in clause.predicates
+                if predicate.variables is not None
+                and all(
+                    clause.passes_through(variable) and variable in bound
+                    for variable in predicate.variables
+                )
+            )
+            if not movable:
+                continue
+            rewritten[index - 1] = replace(
+                previous, predicates=previous.predicates + movable
+            )
+            rewritten[index] = replace(
+                clause,
+                predicates=tuple(
+                    predicate
+                    for predicate in clause.predicates
+                    if predicate not in movable
+                ),
+            )
+            moved = True
+    return tuple(rewritten)
+
+
+DEFAULT_PASSES: Tuple[Pass, ...] = (
+    attach_where,
+    push_down_predicates,
+    remove_dead_clauses,
+)
+
+
+@dataclass(frozen=True)
+class Statement:
+    clauses: Tuple[Clause, ...]
+
+    def __add__(self, other: "Statement") -> "Statement":
+        return Statement(self.clauses + other.clauses)
+
+    def optimize(self, passes: Tuple[Pass, ...] = DEFAULT_PASSES) -> "Statement":
+        clauses = self.clauses
+        for optimization_pass in passes:
+            clauses = optimization_pass(clauses)
+        return Statement(clauses)
+
+    def render(self) -> str:
+        return "\n".join(
+            clause.render() for clause in self.clauses if not clause.is_empty
+        )
+
+    def __str__(self):
+        return self.optimize().render()
@@ -1,12 +1,32 @@
-from dataclasses import dataclass
-from typing import Union, Tuple, Optional, List, Dict, Any
+from dataclasses import dataclass, replace
+from functools import partial
+from hashlib import blake2b
+from typing import Union, Tuple, Optional, List, Dict, Any, Iterator
 
 from py2gds.algorithm import AlgorithmType, Algorithm
 from py2gds.collection import Collection
 from py2gds.connection import Connection
 from py2gds.exceptions import ProjectionIsNotSetup
-from py2gds.projection import NativeProjection, ProjectionIdentity, Projection
+from py2gds.fingerprint import ChangeDetector
+from py2gds.pagination import PaginatedRanking
+from py2gds.planner import ProjectionPlanner
+from py2gds.progress import ProgressCallback, Stage, monitor
+from py2gds.projection import (
+    NativeProjection,
+    ProjectionIdentity,
+    Projection,
+    Relationships,
+)
+from py2gds.query import (
+    QUERIES_EXECUTOR,
+    RunningQuery,
+    new_tag,
+    run_cancellable,
+)
 from py2gds.rank import (
+    FusedRank,
+    StreamFusedRank,
+    WriteFusedRank,
     WriteArticleRank,
     WritePageRank,
     StreamPageRank,
@@ -15,6 +35,16 @@ from py2gds.rank import (
     RankConfigurationWithFilter,
 )
 from py2gds.utils import builder
+from py2gds.warmup import ProjectionWarmUp
+
+STREAM_RANKS = {
+    AlgorithmType.PageRank: StreamPageRank,
+    AlgorithmType.ArticleRank: StreamArticleRank,
+}
+WRITE_RANKS = {
+    AlgorithmType.PageRank: WritePageRank,
+    AlgorithmType.ArticleRank: WriteArticleRank,
+}
 
 
 @dataclass()
@@ -26,33 +56,62 @@ class QueryBuilder:
 
     _graph_connection: Connection = None
     _collection: Collection = None
+    _planner: ProjectionPlanner = None
+    _warm_up: ProjectionWarmUp = None
     _projection: Projection = None
     _algorithm: AlgorithmType = None
+    _additional_algorithms: Tuple[AlgorithmType, ...] = ()
     _config: RankConfiguration = None
     _prepared_query: Algorithm = None
     _max_iterations: int = 20
     _damping_factor: float = 0.80
+    _concurrency: Optional[int] = None
+    _read_concurrency: Optional[int] = None
+    _write_concurrency: Optional[int] = None
     _write_property: Optional[str] = None
+    _relationship_weight_property: Optional[str] = None
+    _node_labels: Optional[Tuple[str, ...]] = None
+    _relationship_types: Optional[Tuple[str, ...]] = None
     _filter_elements: Optional[List[Tuple[str, str, Dict[str, str]]]] = None
+    _labels_filter: Optional[Tuple[str, ...]] = None
+    _subgraph: bool = False
+    _group_by: Optional[str] = None
+    _group_limit: Optional[int] = None
+    _normalize_per_group: bool = False
     _returned_properties: Optional[Tuple[str, ...]] = None
     _sort_by_properties: Optional[Tuple[str, ...]] = None
     _sort_descending: bool = False
     _n_rows: Optional[int] = None
     _first_row: Optional[int] = None
+    _tracking_property: Optional[str] = None
+
+    @property
+    def projection(self) -> Projection:
+        return self._projection
 
     @property
     def prepared_query(self):
         if self._prepared_query:
             return self._prepared_query
 
-        if self._write_property:
+        if self._additional_algorithms:
+            self._prepared_query = self._fused_query()
+        elif self._write_property:
             if self._algorithm == AlgorithmType.PageRank:
                 self._prepared_query = WritePageRank(
-                    self._graph_connection, self._projection, self._config,
+                    self._graph_connection,
+                    self._projection,
+                    self._config,
+                    labels_filter=self._labels_filter,
+                    subgraph=self._subgraph,
                 )
             else:
                 self._prepared_query = WriteArticleRank(
-                    self._graph_connection, self._projection, self._config,
+                    self._graph_connection,
+                    self._projection,
+                    self._config,
+                    labels_filter=self._labels_filter,
+                    subgraph=self._subgraph,
                 )
         elif self._algorithm == AlgorithmType.PageRank:
             self._prepared_query = StreamPageRank(
@@ -64,6 +123,11 @@ class QueryBuilder:
                 sort_by_properties=self._sort_by_properties,
                 sort_descending=self._sort_descending,
                 skip=self._first_row,
+                labels_filter=self._labels_filter,
+                subgraph=self._subgraph,
+                group_by=self._group_by,
+                group_limit=self._group_limit,
+                normalize_per_group=self._normalize_per_group,
             )
         else:
             self._prepared_query = StreamArticleRank(
@@ -75,6 +139,11 @@ class QueryBuilder:
                 sort_by_properties=self._sort_by_properties,
                 sort_descending=self._sort_descending,
                 skip=self._first_row,
+                labels_filter=self._labels_filter,
+                subgraph=self._subgraph,
+                group_by=self._group_by,
+                group_limit=self._group_limit,
+                normalize_per_group=self._normalize_per_group,
             )
         return self._prepared_query
 
@@ -83,20 +152,78 @@ class QueryBuilder:
         self,
         graph_connection: Optional[Connection] = None,
         collection: Optional[Collection] = None,
+        planner: Optional[ProjectionPlanner] = None,
+        warm_up: Optional[ProjectionWarmUp] = None,
     ):
         self._graph_connection = graph_connection
         self._collection = collection
+        self._planner = planner
+        self._warm_up = warm_up
+
+    def _fused_query(self) -> FusedRank:
+        algorithms = tuple(
+            dict.fromkeys((self._algorithm, *self._additional_algorithms))
+        )
+        if self._write_property:
+            return WriteFusedRank(
+                self._graph_connection,
+                tuple(
+                    WRITE_RANKS[algorithm](
+                        self._graph_connection,
+                        self._projection,
+                        replace(
+                            self._config,
+                            write_property=f"{self._write_property}_{algorithm.value}",
+                        ),
+                        labels_filter=self._labels_filter,
+                        subgraph=self._subgraph,
+                    )
+                    for algorithm in algorithms
+                ),
+            )
+        return StreamFusedRank(
+            self._graph_connection,
+            tuple(
+                STREAM_RANKS[algorithm](
+                    self._graph_connection,
+                    self._projection,
+                    self._config,
+                    labels_filter=self._labels_filter,
+                    subgraph=self._subgraph,
+                )
+                for algorithm in algorithms
+            ),
+            limit=self._n_rows,
+            returned_properties=self._returned_properties,
+            sort_by_properties=self._sort_by_properties,
+            sort_descending=self._sort_descending,
+            skip=self._first_row,
+        )
 
     @builder
-    def rank(self, algorithm: AlgorithmType):
+    def rank(self, algorithm: AlgorithmType, *additional_algorithms: AlgorithmType):
+        """
+        It sets the algorithm of the query. When additional algorithms are given, all of them run on the
+        projection in a single query that returns a score column per algorithm, named as its procedure, e.g.
+        pageRank and articleRank. When writing, every algorithm writes the property name followed by its
+        type, e.g. score_pagerank.
+
+        Args:
+            algorithm: Enum string that define the used algorithm.
+            additional_algorithms: Algorithms fused with the first one.
+
+        """
         self._algorithm = algorithm
+        self._additional_algorithms = additional_algorithms
 
     @builder
     def projected_by(
         self,
         labels: Union[Tuple[str, ...], str] = '"*"',
-        relationships: Union[Tuple[str, ...], str] = '"*"',
+        relationships: Relationships = '"*"',
         tag: Optional[str] = None,
+        node_properties: Tuple[str, ...] = (),
+        relationship_properties: Tuple[str, ...] = (),
     ):
         if tag and not self._collection:
             raise ProjectionIsNotSetup(
@@ -109,13 +236,83 @@ class QueryBuilder:
         else:
             self._projection = NativeProjection(
                 self._graph_connection,
-                ProjectionIdentity(labels=labels, relationships=relationships),
+                ProjectionIdentity(
+                    labels=labels,
+                    relationships=relationships,
+                    node_properties=node_properties,
+                    relationship_properties=relationship_properties,
+                ),
             )
 
     @builder
-    def set(self, max_iterations: int, damping_factor: float):
-        self._max_iterations = max_iterations
-        self._damping_factor = damping_factor
+    def labelled(self, *labels: str, subgraph: bool = False):
+        """
+        It keeps only the nodes with every given label in the output.
+
+        Args:
+            labels: Labels that returned nodes must have.
+            subgraph: Whether the rank may run only on the nodes with the label, through nodeLabels, instead of on
+                the whole projection. It changes the scores, but computation and transfer scale with the labelled
+                nodes. It only applies to a single label that is projected.
+
+        """
+        self._labels_filter = labels
+        self._subgraph = subgraph
+
+    @builder
+    def weighted_by(self, property_name: str):
+        """
+        When using this function, the rank uses the given relationship property as weight. The property must be
+        projected, see relationship_properties parameter of projected_by.
+
+        Args:
+            property_name: Name of the relationship property used as weight.
+
+        """
+        self._relationship_weight_property = property_name
+
+    @builder
+    def personalized_by(self, *filter_elements: Tuple[str, str, Dict[str, str]]):
+        """
+        When using this function, the rank is personalized: it starts from the nodes matching the filter elements.
+
+        Args:
+            filter_elements: Reference, label and property values of the source nodes, e.g.
+                ("home", "Page", {"name": "Home"}).
+
+        """
+        self._filter_elements = list(filter_elements)
+
+    @builder
+    def set(
+        self,
+        max_iterations: Optional[int] = None,
+        damping_factor: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        read_concurrency: Optional[int] = None,
+        write_concurrency: Optional[int] = None,
+    ):
+        """
+        This function allows to set algorithm's parameters. Parameters left as None keep their current value.
+
+        Args:
+            max_iterations: The maximum number of iterations of Rank to run.
+            damping_factor: The damping factor of the Rank calculation.
+            concurrency: Number of threads used to run the algorithm.
+            read_concurrency: Number of threads used to create the projection.
+            write_concurrency: Number of threads used to write the scores.
+
+        """
+        if max_iterations is not None:
+            self._max_iterations = max_iterations
+        if damping_factor is not None:
+            self._damping_factor = damping_factor
+        if concurrency is not None:
+            self._concurrency = concurrency
+        if read_concurrency is not None:
+            self._read_concurrency = read_concurrency
+        if write_concurrency is not None:
+            self._write_concurrency = write_concurrency
 
     @builder
     def select(self, *returned_properties: str):
@@ -163,6 +360,24 @@ class QueryBuilder:
         """
         self._n_rows = n_rows
 
+    @builder
+    def top_per(self, group_by_property: str, n: int, normalize: bool = False):
+        """
+        It returns the n nodes with the highest score of every group of nodes sharing a property value. Groups
+        are sliced in the server, so only n rows per group are transferred.
+
+        Args:
+            group_by_property: Node property whose values define the groups. It's returned with every row.
+            n: Number of rows of every group.
+            normalize: Whether scores are divided by the top score of their group.
+
+        """
+        if n <= 0:
+            raise ValueError(f"Every group needs at least one row, got {n}")
+        self._group_by = group_by_property
+        self._group_limit = n
+        self._normalize_per_group = normalize
+
     @builder
     def write(self, property_name: str):
         """
@@ -174,12 +389,108 @@ class QueryBuilder:
         """
         self._write_property = property_name
 
+    @builder
+    def skip_unchanged(self, tracking_property: str):
+        """
+        When using this function, a written rank is skipped if the nodes and relationships of its projection
+        didn't change since it was last written. Changes are detected by the counts of the projected labels and
+        relationship types, and by the maximum of tracking_property. Edits that keep the counts and don't update
+        tracking_property aren't detected. Projections of every label can't be used, since they would hold the
+        nodes storing the fingerprints.
+
+        Args:
+            tracking_property: Node property updated by the application on every change, e.g. a timestamp. It has
+                to be updated on both nodes of a created, deleted or updated relationship too.
+
+        """
+        if not tracking_property:
+            raise ValueError("skip_unchanged needs a tracking property")
+        self._tracking_property = tracking_property
+
+    def paginate(
+        self, page_size: int = 20, ttl: float = 300.0, label: Optional[str] = None
+    ) -> PaginatedRanking:
+        """
+        It returns a paginated ranking: the rank is computed once into a node property and its pages are read
+        with cursors, instead of running the rank again for every SKIP/LIMIT page. Pages are filtered by
+        labels_filter, while skip, limit and top_per can't be used with it.
+
+        Args:
+            page_size: Number of rows of every page.
+            ttl: Seconds before the ranking is computed again. Cursors expire with it.
+            label: Label of ranked nodes. By default, the label of a single-label projection.
+
+        Returns:
+            PaginatedRanking.
+
+        """
+        if self._n_rows is not None or self._first_row or self._group_by:
+            raise ValueError(
+                "Paginated rankings are read with cursors, skip, limit and top_per "
+                "can't be used"
+            )
+        labels = self._projection.identity.labels
+        if not label and labels != '"*"' and len(labels) == 1:
+            label = labels[0]
+
+        h = blake2b(digest_size=8)
+        h.update(
+            repr(
+                (
+                    self._projection.name,
+                    self._algorithm,
+                    self._max_iterations,
+                    self._damping_factor,
+                    self._relationship_weight_property,
+                    self._filter_elements,
+                    self._labels_filter,
+                    self._subgraph,
+                )
+            ).encode()
+        )
+        return PaginatedRanking(
+            self._graph_connection,
+            replace(self, _prepared_query=None, _additional_algorithms=()),
+            f"py2gds_rank_{h.hexdigest()}",
+            page_size,
+            ttl,
+            label,
+            self._returned_properties,
+            tuple(self._labels_filter or ()),
+        )
+
+    @property
+    def _result_key(self) -> str:
+        h = blake2b(digest_size=8)
+        h.update(
+            repr(
+                (
+                    self._projection.name,
+                    self._algorithm,
+                    self._additional_algorithms,
+                    self._max_iterations,
+                    self._damping_factor,
+                    self._relationship_weight_property,
+                    self._filter_elements,
+                    self._labels_filter,
+                    self._subgraph,
+                    self._write_property,
+                )
+            ).encode()
+        )
+        return f"{self._write_property}_{h.hexdigest()}"
+
     def _setup_config(self):
         if self._filter_elements:
             self._config = RankConfigurationWithFilter(
                 max_iterations=self._max_iterations,
                 damping_factor=self._damping_factor,
                 write_property=self._write_property,
+                concurrency=self._concurrency,
+                write_concurrency=self._write_concurrency,
+                relationship_weight_property=self._relationship_weight_property,
+                node_labels=self._node_labels,
+                relationship_types=self._relationship_types,
                 filter_elements=self._filter_elements,
             )
         else:
@@ -187,21 +498,172 @@ class QueryBuilder:
                 max_iterations=self._max_iterations,
                 damping_factor=self._damping_factor,
                 write_property=self._write_property,
+                concurrency=self._concurrency,
+                write_concurrency=self._write_concurrency,
+                relationship_weight_property=self._relationship_weight_property,
+                node_labels=self._node_labels,
+                relationship_types=self._relationship_types,
             )
 
-    def _setup_projection(self, log: bool = True):
+    def _setup_plan(self, log: bool = True):
+        if not self._planner or self._prepared_query:
+            return
+        plan = self._planner.plan(self._projection, log)
+        self._projection = plan.projection
+        self._node_labels = plan.node_labels
+        self._relationship_types = plan.relationship_types
+
+    def _setup_projection(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+    ):
+        if self._warm_up and self._warm_up.wait(self._projection):
+            return
         if not self._projection.exists(log):
-            self._projection.create(log)
+            self._projection.create(log, self._read_concurrency, timeout, tag, progress)
+
+    def create_projection(
+        self, log: bool = True, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        It creates the projection of the query unless it already exists or is built by the warm-up.
+
+        Returns:
+            Whether the projection was created.
 
-    def run(self, log: bool = True) -> str:
+        """
+        if self._warm_up and self._warm_up.wait(self._projection):
+            return False
+        if self._projection.exists(log):
+            return False
+        self._projection.create(log, self._read_concurrency, timeout)
+        return True
+
+    def run(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+        force: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        It creates the projection if needed and runs the algorithm.
+
+        Args:
+            log: Whether to log the queries.
+            timeout: Maximum number of seconds each transaction may run before the server terminates it.
+            tag: Tag of the transactions, used to list or kill them. A random one is used when it isn't set.
+            progress: Callback called with the progress of the projection creation and then of the algorithm,
+                each one from 0% to 100% and told apart by its stage. The run is killed when it returns False.
+            force: Whether to write the rank even if skip_unchanged was used and the data didn't change.
+
+        Returns:
+            Results of the algorithm, or an empty list when the rank was skipped.
+
+        """
+        if progress:
+            tag = tag or new_tag()
+        change: Optional[Tuple[ChangeDetector, str, str]] = None
+        if self._tracking_property and self._write_property:
+            if self._projection.identity.labels == '"*"':
+                raise ValueError(
+                    "skip_unchanged can't be used with a projection of every label"
+                )
+            detector = ChangeDetector(self._graph_connection, self._tracking_property)
+            key = self._result_key
+            fingerprint = detector.fingerprint(self._projection.identity, log)
+            if not force and detector.is_unchanged(key, fingerprint, log):
+                return []
+            change = (detector, key, fingerprint)
+        self._setup_plan(log)
         self._setup_config()
-        self._setup_projection(log)
+        self._setup_projection(log, timeout, tag, progress)
+
+        query = self.prepared_query
+        if progress:
+            query = query.with_job_id(tag)
+        with monitor(self._graph_connection, tag, progress, Stage.rank):
+            results = query.run(log, timeout, tag)
+        if change:
+            detector, key, fingerprint = change
+            detector.store(key, fingerprint, log)
+        return results
+
+    def stream(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        It creates the projection if needed and yields the results of the algorithm as they are received, e.g.
+        to feed a ParallelPipeline.
 
-        return self.prepared_query.run(log)
+        Args:
+            log: Whether to log the queries.
+            timeout: Maximum number of seconds each transaction may run before the server terminates it.
+            tag: Tag of the transactions, used to list or kill them. A random one is used when it isn't set.
 
-    def __str__(self):
+        Returns:
+            Iterator of results of the algorithm.
+
+        """
+        self._setup_plan(log)
         self._setup_config()
-        return self.prepared_query.cypher
+        self._setup_projection(log, timeout, tag)
+        return self.prepared_query.stream(log, timeout, tag)
+
+    async def run_async(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+        force: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Same as run, but cancelling the awaiting task kills the server transactions of the run.
+
+        """
+        tag = tag or new_tag()
+        return await run_cancellable(
+            self._graph_connection,
+            tag,
+            partial(self.run, log, timeout, tag, progress, force),
+            log,
+        )
+
+    def start(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+        force: bool = False,
+    ) -> RunningQuery:
+        """
+        It runs in the background and returns a handle to wait for the results or cancel the run.
+
+        """
+        tag = tag or new_tag()
+        return RunningQuery(
+            self._graph_connection,
+            tag,
+            QUERIES_EXECUTOR.submit(self.run, log, timeout, tag, progress, force),
+        )
+
+    def __str__(self):
+        """
+        The query is rendered on a copy of the builder and without planning, so rendering doesn't talk to the
+        database or change the query that runs. Until the query runs, it shows the requested projection.
+        """
+        builder = replace(self)
+        builder._setup_config()
+        return builder.prepared_query.cypher
 
 
 class Query:
@@ -220,6 +682,8 @@ class Query:
         cls,
         graph_connection: Connection,
         collection: Optional[Collection] = None,
+        planner: Optional[ProjectionPlanner] = None,
+        warm_up: Optional[ProjectionWarmUp] = None,
         **kwargs: Any,
     ) -> QueryBuilder:
         """
@@ -228,35 +692,49 @@ class Query:
         Args:
             graph_connection: Connection used to talk with the database.
             collection: If this parameter is used, projections can be used selecting it by tag in projected_by function.
+            planner: If this parameter is used, the query reuses an existing projection that contains the requested
+                one instead of creating it.
+            warm_up: If this parameter is used, the query waits for the projection when it's being built by the
+                warm-up instead of creating it.
 
         Returns:
             QueryBuilder.
 
         """
-        return cls._builder(**kwargs).using(graph_connection, collection)
+        return cls._builder(**kwargs).using(
+            graph_connection, collection, planner, warm_up
+        )
 
     @classmethod
-    def rank(cls, algorithm: AlgorithmType, **kwargs: Any) -> QueryBuilder:
+    def rank(
+        cls,
+        algorithm: AlgorithmType,
+        *additional_algorithms: AlgorithmType,
+        **kwargs: Any,
+    ) -> QueryBuilder:
         """
         Query builder entry point. It initializes query building with the algorithm that we are going to use in that
         query.
 
         Args:
             algorithm: Enum string that define the used algorithm.
+            additional_algorithms: Algorithms run with the first one in a single query, see QueryBuilder.rank.
 
         Returns:
             QueryBuilder.
 
         """
-        return cls._builder(**kwargs).rank(algorithm)
+        return cls._builder(**kwargs).rank(algorithm, *additional_algorithms)
 
     @classmethod
     def projected_by(
         cls,
         *,
         labels: Union[Tuple[str, ...], str] = '"*"',
-        relationships: Union[Tuple[str, ...], str] = '"*"',
+        relationships: Relationships = '"*"',
         tag: Optional[str] = None,
+        node_properties: Tuple[str, ...] = (),
+        relationship_properties: Tuple[str, ...] = (),
         **kwargs: Any,
     ) -> QueryBuilder:
         """
@@ -264,18 +742,76 @@ class Query:
 
         Args:
             labels: Labels' names used to create the projection.
-            relationships: Relationships' names used to create the projection.
+            relationships: Relationships' names, or RelationshipProjection with their orientation and
+                aggregation, used to create the projection.
             tag: if a collection is used (see using method), can get a projection by tag using this parameter.
+            node_properties: Node properties loaded into the projection.
+            relationship_properties: Relationship properties loaded into the projection.
+
+        Returns:
+            QueryBuilder.
+
+        """
+        return cls._builder(**kwargs).projected_by(
+            labels, relationships, tag, node_properties, relationship_properties
+        )
+
+    @classmethod
+    def labelled(
+        cls, *labels: str, subgraph: bool = False, **kwargs: Any
+    ) -> QueryBuilder:
+        """
+        Query builder entry point. It keeps only the nodes with every given label in the output.
+
+        Args:
+            labels: Labels that returned nodes must have.
+            subgraph: Whether the rank may run only on the nodes with the label, through nodeLabels.
+
+        Returns:
+            QueryBuilder.
+
+        """
+        return cls._builder(**kwargs).labelled(*labels, subgraph=subgraph)
+
+    @classmethod
+    def weighted_by(cls, property_name: str, **kwargs: Any) -> QueryBuilder:
+        """
+        Query builder entry point. It sets the relationship property used as weight by the rank.
+
+        Args:
+            property_name: Name of the relationship property used as weight.
+
+        Returns:
+            QueryBuilder.
+
+        """
+        return cls._builder(**kwargs).weighted_by(property_name)
+
+    @classmethod
+    def personalized_by(
+        cls, *filter_elements: Tuple[str, str, Dict[str, str]], **kwargs: Any
+    ) -> QueryBuilder:
+        """
+        Query builder entry point. It sets the source nodes of a personalized rank.
+
+        Args:
+            filter_elements: Reference, label and property values of the source nodes.
 
         Returns:
             QueryBuilder.
 
         """
-        return cls._builder(**kwargs).projected_by(labels, relationships, tag)
+        return cls._builder(**kwargs).personalized_by(*filter_elements)
 
     @classmethod
     def set(
-        cls, max_iterations: int, damping_factor: float, **kwargs: Any
+        cls,
+        max_iterations: Optional[int] = None,
+        damping_factor: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        read_concurrency: Optional[int] = None,
+        write_concurrency: Optional[int] = None,
+        **kwargs: Any,
     ) -> QueryBuilder:
         """
         Query builder entry point. It initializes query with algorithm's parameters.
@@ -283,12 +819,21 @@ class Query:
         Args:
             max_iterations: The maximum number of iterations of Rank to run.
             damping_factor: The damping factor of the Rank calculation.
+            concurrency: Number of threads used to run the algorithm.
+            read_concurrency: Number of threads used to create the projection.
+            write_concurrency: Number of threads used to write the scores.
 
         Returns:
             QueryBuilder
 
         """
-        return cls._builder(**kwargs).set(max_iterations, damping_factor)
+        return cls._builder(**kwargs).set(
+            max_iterations,
+            damping_factor,
+            concurrency,
+            read_concurrency,
+            write_concurrency,
+        )
 
     @classmethod
     def write(cls, property_name: str, **kwargs: Any) -> QueryBuilder:
@@ -337,6 +882,25 @@ class Query:
             *sort_by_properties, descending=descending
         )
 
+    @classmethod
+    def top_per(
+        cls, group_by_property: str, n: int, normalize: bool = False, **kwargs: Any
+    ):
+        """
+        Query builder entry point. It returns the n nodes with the highest score of every group of nodes sharing
+        a property value.
+
+        Args:
+            group_by_property: Node property whose values define the groups.
+            n: Number of rows of every group.
+            normalize: Whether scores are divided by the top score of their group.
+
+        Returns:
+            QueryBuilder
+
+        """
+        return cls._builder(**kwargs).top_per(group_by_property, n, normalize)
+
     @classmethod
     def skip(cls, first_row: int, **kwargs: Any):
         """
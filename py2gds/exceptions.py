@@ -8,3 +8,47 @@ class ProjectionIsNotSetup(Exception):
 
 class NeededPropertyNameNotSpecified(Exception):
     pass
+
+
+class MissingDependency(Exception):
+    pass
+
+
+class IngestionFailed(Exception):
+    pass
+
+
+class UnsupportedFileFormat(Exception):
+    pass
+
+
+class IndexPopulationFailed(Exception):
+    pass
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorExpired(InvalidCursor):
+    pass
+
+
+class RecordingNotFound(Exception):
+    pass
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+class ConcurrencyLimitExceeded(Exception):
+    pass
+
+
+class IncompatibleRanks(Exception):
+    pass
+
+
+class InvalidSchedule(Exception):
+    pass
@@ -0,0 +1,166 @@
+import logging
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import Any, Dict, Optional, Tuple
+
+from py2gds.connection import AccessMode, Connection
+from py2gds.cypher import name, quote
+from py2gds.projection import ProjectionIdentity, RelationshipProjection
+from py2gds.query import Query
+
+FINGERPRINT_LABEL = "Py2gdsFingerprint"
+
+
+@dataclass(frozen=True)
+class GraphStatisticsQuery(Query):
+    """
+    It counts the nodes of every label and the relationships of every type of a projection identity. Counts
+    are read from the count store, so it doesn't scan the graph. Fingerprint nodes aren't counted as nodes of
+    the graph. When tracking_property is set, its maximum on the projected nodes is also returned, e.g. a last
+    update timestamp kept by the application.
+
+    """
+
+    identity: ProjectionIdentity
+    tracking_property: Optional[str] = None
+
+    @property
+    def labels(self) -> Tuple[Optional[str], ...]:
+        if self.identity.labels == '"*"':
+            return (None,)
+        return tuple(sorted(set(self.identity.labels)))
+
+    @property
+    def relationship_types(self) -> Tuple[Optional[str], ...]:
+        if self.identity.relationships == '"*"':
+            return (None,)
+        return tuple(
+            sorted(
+                {
+                    RelationshipProjection.of(relationship).type
+                    for relationship in self.identity.relationships
+                }
+            )
+        )
+
+    @property
+    def cypher(self) -> str:
+        branches = []
+        for label in self.labels:
+            key = quote(f"nodes:{label or '*'}")
+            if label:
+                branches.append(
+                    f"MATCH (n:{name(label)}) RETURN {key} AS key, count(n) AS value"
+                )
+            else:
+                branches.append(
+                    f"MATCH (n) WITH count(n) AS nodes "
+                    f"MATCH (f:{FINGERPRINT_LABEL}) "
+                    f"RETURN {key} AS key, nodes - count(f) AS value"
+                )
+        for relationship_type in self.relationship_types:
+            pattern = "()-[r]->()"
+            if relationship_type:
+                pattern = f"()-[r:{name(relationship_type)}]->()"
+            key = quote(f"relationships:{relationship_type or '*'}")
+            branches.append(f"MATCH {pattern} RETURN {key} AS key, count(r) AS value")
+        if self.tracking_property:
+            tracking_property = name(self.tracking_property)
+            for label in self.labels:
+                pattern = f"(n:{name(label)})" if label else "(n)"
+                key = quote(f"max:{label or '*'}.{self.tracking_property}")
+                branches.append(
+                    f"MATCH {pattern} "
+                    f"RETURN {key} AS key, max(n.{tracking_property}) AS value"
+                )
+        return "\nUNION ALL\n".join(branches)
+
+    @property
+    def access_mode(self) -> AccessMode:
+        return AccessMode.read
+
+    def run(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        results = super().run(log, timeout, tag)
+        return {result["key"]: result["value"] for result in results}
+
+
+@dataclass(frozen=True)
+class ReadFingerprintQuery(Query):
+    key: str
+
+    @property
+    def cypher(self) -> str:
+        return f"""MATCH (f:{FINGERPRINT_LABEL} {{key: $key}})
+        RETURN f.fingerprint AS fingerprint"""
+
+    @property
+    def access_mode(self) -> AccessMode:
+        return AccessMode.read
+
+    @property
+    def parameters(self) -> Optional[Dict[str, Any]]:
+        return {"key": self.key}
+
+
+@dataclass(frozen=True)
+class WriteFingerprintQuery(Query):
+    key: str
+    fingerprint: str
+
+    @property
+    def cypher(self) -> str:
+        return f"""MERGE (f:{FINGERPRINT_LABEL} {{key: $key}})
+        SET f.fingerprint = $fingerprint, f.updatedAt = timestamp()"""
+
+    @property
+    def parameters(self) -> Optional[Dict[str, Any]]:
+        return {"key": self.key, "fingerprint": self.fingerprint}
+
+
+@dataclass(frozen=True)
+class ChangeDetector:
+    """
+    It tells whether the data behind a projection changed since a result was last written. The fingerprint of
+    the data is the counts of its labels and relationship types plus the maximum of tracking_property, and it's
+    stored in a Py2gdsFingerprint node under the key of the written result.
+
+    Counts alone miss balanced edits, e.g. a relationship deleted and another one created, and the last
+    committed transaction can't be used since writing the rank commits one, so tracking_property is required.
+    It's read from the projected nodes only: the application has to bump it on both nodes of a relationship it
+    creates, deletes or updates. Edits that keep the counts and don't bump it aren't detected, e.g. properties
+    updated by other writers or relationships rewired by a bulk import.
+
+    """
+
+    connection: Connection
+    tracking_property: str
+
+    def __post_init__(self):
+        if not self.tracking_property:
+            raise ValueError("Change detection needs a tracking property")
+
+    def fingerprint(self, identity: ProjectionIdentity, log: bool = True) -> str:
+        statistics = GraphStatisticsQuery(
+            self.connection, identity, self.tracking_property
+        ).run(log)
+        h = blake2b(digest_size=16)
+        h.update(repr(sorted(statistics.items())).encode())
+        return h.hexdigest()
+
+    def stored(self, key: str, log: bool = True) -> Optional[str]:
+        results = ReadFingerprintQuery(self.connection, key).run(log)
+        return results[0]["fingerprint"] if results else None
+
+    def store(self, key: str, fingerprint: str, log: bool = True):
+        WriteFingerprintQuery(self.connection, key, fingerprint).run(log)
+
+    def is_unchanged(self, key: str, fingerprint: str, log: bool = True) -> bool:
+        unchanged = self.stored(key, log) == fingerprint
+        if unchanged:
+            logging.info(f"Data of {key} didn't change, skipping")
+        return unchanged
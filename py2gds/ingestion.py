@@ -0,0 +1,344 @@
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from queue import Queue, Full
+from threading import Thread, Lock, Event
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from neo4j.exceptions import TransientError, ServiceUnavailable, SessionExpired
+
+from py2gds.connection import Connection
+from py2gds.exceptions import (
+    MissingDependency,
+    IngestionFailed,
+    UnsupportedFileFormat,
+)
+from py2gds.query import Query
+from py2gds.utils import quote_identifier
+
+Row = Dict[str, Any]
+
+RETRYABLE_ERRORS = (TransientError, ServiceUnavailable, SessionExpired)
+
+
+def read_csv(path: Union[str, Path], **reader_parameters: Any) -> Iterator[Row]:
+    with open(path, newline="") as csv_file:
+        yield from csv.DictReader(csv_file, **reader_parameters)
+
+
+def read_jsonl(path: Union[str, Path]) -> Iterator[Row]:
+    with open(path) as jsonl_file:
+        for line in jsonl_file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_parquet(path: Union[str, Path], batch_size: int = 10_000) -> Iterator[Row]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise MissingDependency(
+            "You must install 'pyarrow' (py2gds[arrow]) to read parquet files"
+        ) from error
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size):
+        yield from batch.to_pylist()
+
+
+READERS = {
+    ".csv": read_csv,
+    ".jsonl": read_jsonl,
+    ".ndjson": read_jsonl,
+    ".parquet": read_parquet,
+}
+
+
+def read_rows(path: Union[str, Path]) -> Iterator[Row]:
+    """
+    It streams the rows of a CSV, JSONL or Parquet file, chosen by the file suffix.
+
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in READERS:
+        raise UnsupportedFileFormat(f"Files with suffix {suffix} can't be read")
+    return READERS[suffix](path)
+
+
+@dataclass(frozen=True)
+class NodeMapping:
+    """
+    It maps every row to a node with the given label, merged by its key property. properties maps node
+    properties to row columns.
+
+    """
+
+    label: str
+    key: str
+    key_column: Optional[str] = None
+    properties: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def cypher(self) -> str:
+        return (
+            "UNWIND $rows AS row\n"
+            f"MERGE (n:{quote_identifier(self.label)} {{{quote_identifier(self.key)}: row.key}})\n"
+            "SET n += row.properties"
+        )
+
+    def parameters(self, row: Row) -> Row:
+        return {
+            "key": row[self.key_column or self.key],
+            "properties": {
+                property_name: row[column]
+                for property_name, column in self.properties.items()
+            },
+        }
+
+
+@dataclass(frozen=True)
+class NodeReference:
+    label: str
+    key: str
+    column: str
+
+
+@dataclass(frozen=True)
+class RelationshipMapping:
+    """
+    It maps every row to a relationship between two existing nodes, which are looked up by their key property.
+
+    """
+
+    type: str
+    from_node: NodeReference
+    to_node: NodeReference
+    properties: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def cypher(self) -> str:
+        from_node = self.from_node
+        to_node = self.to_node
+        return (
+            "UNWIND $rows AS row\n"
+            f"MATCH (from:{quote_identifier(from_node.label)} {{{quote_identifier(from_node.key)}: row.from}})\n"
+            f"MATCH (to:{quote_identifier(to_node.label)} {{{quote_identifier(to_node.key)}: row.to}})\n"
+            f"MERGE (from)-[r:{quote_identifier(self.type)}]->(to)\n"
+            "SET r += row.properties"
+        )
+
+    def parameters(self, row: Row) -> Row:
+        return {
+            "from": row[self.from_node.column],
+            "to": row[self.to_node.column],
+            "properties": {
+                property_name: row[column]
+                for property_name, column in self.properties.items()
+            },
+        }
+
+
+Mapping = Union[NodeMapping, RelationshipMapping]
+
+
+@dataclass(frozen=True)
+class UnwindBatch(Query):
+    mapping: Mapping
+    rows: List[Row]
+
+    @property
+    def cypher(self) -> str:
+        return self.mapping.cypher
+
+    @property
+    def parameters(self) -> Optional[Dict[str, Any]]:
+        return {"rows": self.rows}
+
+
+@dataclass
+class Checkpoint:
+    """
+    Number of leading batches already committed, stored in a file so an interrupted ingestion resumes after them.
+    Batches commit out of order, so it only moves forward when every previous batch is committed too.
+
+    """
+
+    path: Union[str, Path]
+    batch_size: int
+    committed_batches: int = 0
+    _done: Set[int] = field(default_factory=set, repr=False)
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], batch_size: int) -> "Checkpoint":
+        if not os.path.exists(path):
+            return cls(path, batch_size)
+
+        with open(path) as checkpoint_file:
+            state = json.load(checkpoint_file)
+        if state["batch_size"] != batch_size:
+            raise IngestionFailed(
+                f"Checkpoint {path} was written with batch size {state['batch_size']}"
+            )
+        return cls(path, batch_size, state["committed_batches"])
+
+    def commit(self, batch_index: int):
+        with self._lock:
+            self._done.add(batch_index)
+            committed_batches = self.committed_batches
+            while self.committed_batches in self._done:
+                self._done.remove(self.committed_batches)
+                self.committed_batches += 1
+            if self.committed_batches != committed_batches:
+                self._save()
+
+    def _save(self):
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w") as checkpoint_file:
+            json.dump(
+                {
+                    "batch_size": self.batch_size,
+                    "committed_batches": self.committed_batches,
+                },
+                checkpoint_file,
+            )
+        os.replace(temporary_path, self.path)
+
+
+@dataclass
+class IngestionReport:
+    rows: int = 0
+    batches: int = 0
+    skipped_rows: int = 0
+    retries: int = 0
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    def add(self, rows: int, retries: int):
+        with self._lock:
+            self.rows += rows
+            self.batches += 1
+            self.retries += retries
+
+
+@dataclass
+class IngestionPipeline:
+    """
+    It streams rows through a mapping into UNWIND batches that several writer threads send concurrently. Sessions
+    come from the driver's connection pool. At most max_pending_batches batches wait in memory: reading blocks
+    while writers are behind. Transient errors are retried with exponential backoff, and a checkpoint file
+    lets an interrupted ingestion resume without rewriting committed batches.
+
+    """
+
+    connection: Connection
+    mapping: Mapping
+    batch_size: int = 10_000
+    workers: int = 4
+    max_pending_batches: int = 8
+    max_retries: int = 5
+    retry_delay: float = 0.5
+    checkpoint_path: Optional[Union[str, Path]] = None
+
+    def run_file(self, path: Union[str, Path], log: bool = True) -> IngestionReport:
+        return self.run(read_rows(path), log)
+
+    def run(self, rows: Iterable[Row], log: bool = True) -> IngestionReport:
+        checkpoint = (
+            Checkpoint.load(self.checkpoint_path, self.batch_size)
+            if self.checkpoint_path
+            else None
+        )
+        report = IngestionReport()
+        pending: Queue = Queue(self.max_pending_batches)
+        failures: List[Exception] = []
+        stop = Event()
+        writers = [
+            Thread(
+                target=self._write_batches,
+                args=(pending, checkpoint, report, failures, stop, log),
+                name=f"py2gds-writer-{index}",
+                daemon=True,
+            )
+            for index in range(self.workers)
+        ]
+        for writer in writers:
+            writer.start()
+
+        try:
+            for batch_index, batch in enumerate(self._batches(rows)):
+                if checkpoint and batch_index < checkpoint.committed_batches:
+                    report.skipped_rows += len(batch)
+                    continue
+                if not self._put(pending, (batch_index, batch), stop):
+                    break
+        finally:
+            for _ in writers:
+                pending.put(None)
+            for writer in writers:
+                writer.join()
+
+        if failures:
+            raise IngestionFailed(
+                f"Ingestion stopped after {report.batches} batches"
+            ) from failures[0]
+        return report
+
+    def _batches(self, rows: Iterable[Row]) -> Iterator[List[Row]]:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _put(pending: Queue, item: Tuple[int, List[Row]], stop: Event) -> bool:
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _write_batches(
+        self,
+        pending: Queue,
+        checkpoint: Optional[Checkpoint],
+        report: IngestionReport,
+        failures: List[Exception],
+        stop: Event,
+        log: bool,
+    ):
+        while (item := pending.get()) is not None:
+            if stop.is_set():
+                continue
+            batch_index, batch = item
+            try:
+                retries = self._write(batch, log)
+            except Exception as error:
+                failures.append(error)
+                stop.set()
+                continue
+            report.add(len(batch), retries)
+            if checkpoint:
+                checkpoint.commit(batch_index)
+
+    def _write(self, batch: List[Row], log: bool) -> int:
+        query = UnwindBatch(
+            self.connection, self.mapping, [self.mapping.parameters(row) for row in batch]
+        )
+        attempt = 0
+        while True:
+            try:
+                query.run(log)
+                return attempt
+            except RETRYABLE_ERRORS:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self.retry_delay * 2 ** attempt)
+                attempt += 1
@@ -0,0 +1,232 @@
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from threading import Condition, Lock
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple, Type
+
+from neo4j.exceptions import TransientError, ServiceUnavailable, SessionExpired
+
+from py2gds.concurrency import Concurrency
+from py2gds.connection import AccessMode, Connection
+from py2gds.exceptions import CircuitOpen, ConcurrencyLimitExceeded
+
+OVERLOAD_ERRORS = (TransientError, ServiceUnavailable, SessionExpired)
+HEAVY_QUERY = re.compile(
+    r"\bgds\.(?!graph\.(?:exists|list)\b|beta\.listProgress\b|util\.)", re.IGNORECASE
+)
+ADMIN_QUERY = re.compile(r"\bdbms\.", re.IGNORECASE)
+
+
+@dataclass
+class AIMDLimit:
+    """
+    Limit of in-flight queries that grows by one every time a full limit of queries finishes under
+    latency_threshold seconds, and is multiplied by backoff when a query is slower or fails with an overload
+    error.
+
+    """
+
+    limit: float = 8
+    min_limit: int = 1
+    max_limit: int = 256
+    latency_threshold: float = 1.0
+    backoff: float = 0.7
+
+    def update(self, latency: float, overloaded: bool = False) -> int:
+        if overloaded or latency > self.latency_threshold:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        return int(self.limit)
+
+
+@dataclass
+class Limiter:
+    """
+    It bounds the number of in-flight queries to a limit adjusted from their observed latency. Callers wait
+    for a free slot up to timeout seconds.
+
+    """
+
+    limit: AIMDLimit = field(default_factory=AIMDLimit)
+    timeout: Optional[float] = None
+    _in_flight: int = field(default=0, repr=False)
+    _condition: Condition = field(default_factory=Condition, repr=False)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def available(self) -> int:
+        return max(0, int(self.limit.limit) - self._in_flight)
+
+    @contextmanager
+    def slot(self, overload_errors: Tuple[Type[Exception], ...] = OVERLOAD_ERRORS):
+        self.acquire()
+        start = time.perf_counter()
+        overloaded = False
+        try:
+            yield
+        except overload_errors:
+            overloaded = True
+            raise
+        finally:
+            self.release(time.perf_counter() - start, overloaded)
+
+    def acquire(self):
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._in_flight < int(self.limit.limit), self.timeout
+            ):
+                raise ConcurrencyLimitExceeded(
+                    f"No query slot freed up in {self.timeout} seconds"
+                )
+            self._in_flight += 1
+
+    def release(self, latency: float, overloaded: bool = False):
+        with self._condition:
+            self._in_flight -= 1
+            self.limit.update(latency, overloaded)
+            self._condition.notify_all()
+
+
+class CircuitState(str, Enum):
+    closed = "closed"
+    open = "open"
+    half_open = "half_open"
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    It opens when the rate of overload errors among the last window queries reaches failure_rate, and then
+    rejects queries straight away for reset_timeout seconds. After that, one probe query is let through: the
+    circuit closes if it succeeds and opens again if it fails.
+
+    """
+
+    failure_rate: float = 0.5
+    window: int = 20
+    minimum_requests: int = 10
+    reset_timeout: float = 30.0
+    _results: Deque[bool] = field(default_factory=deque, repr=False)
+    _state: CircuitState = CircuitState.closed
+    _opened_at: float = field(default=0.0, repr=False)
+    _probing: bool = field(default=False, repr=False)
+    _lock: Lock = field(default_factory=Lock, repr=False)
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            if (
+                self._state == CircuitState.open
+                and time.monotonic() - self._opened_at >= self.reset_timeout
+            ):
+                self._state = CircuitState.half_open
+            return self._state
+
+    def allow(self):
+        state = self.state
+        with self._lock:
+            if state == CircuitState.closed:
+                return
+            if state == CircuitState.half_open and not self._probing:
+                self._probing = True
+                return
+        raise CircuitOpen("Too many queries are failing, try again later")
+
+    def record(self, failed: bool):
+        with self._lock:
+            if self._state == CircuitState.half_open:
+                self._probing = False
+                self._results.clear()
+                if failed:
+                    self._open()
+                else:
+                    self._state = CircuitState.closed
+                return
+            self._results.append(failed)
+            if len(self._results) > self.window:
+                self._results.popleft()
+            if (
+                len(self._results) >= self.minimum_requests
+                and sum(self._results) / len(self._results) >= self.failure_rate
+            ):
+                self._open()
+
+    def _open(self):
+        self._state = CircuitState.open
+        self._opened_at = time.monotonic()
+        self._results.clear()
+
+
+@dataclass(frozen=True)
+class LimitedConnection(Connection):
+    """
+    It protects the server from overload. GDS procedures and plain Cypher queries go through separate
+    limiters, so cheap lookups aren't queued behind algorithm runs, and a circuit breaker sheds every query
+    while the server keeps failing. Transaction management procedures aren't limited, so running jobs can
+    always be listed and killed.
+
+    """
+
+    connection: Connection
+    heavy: Limiter = field(
+        default_factory=lambda: Limiter(AIMDLimit(4, latency_threshold=60.0))
+    )
+    light: Limiter = field(default_factory=lambda: Limiter(AIMDLimit(32)))
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+
+    @property
+    def concurrency(self) -> Optional[Concurrency]:
+        return self.connection.concurrency
+
+    @property
+    def members(self) -> Tuple[Connection, ...]:
+        return self.connection.members
+
+    @staticmethod
+    def is_heavy(query: str) -> bool:
+        return bool(HEAVY_QUERY.search(query))
+
+    def limiter(self, query: str) -> Limiter:
+        return self.heavy if self.is_heavy(query) else self.light
+
+    def execute(
+        self,
+        query: str,
+        access_mode: AccessMode = AccessMode.write,
+        parameters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        if ADMIN_QUERY.search(query):
+            return self.connection.execute(
+                query, access_mode, parameters, timeout, metadata
+            )
+        with self._guarded(query):
+            return self.connection.execute(
+                query, access_mode, parameters, timeout, metadata
+            )
+
+    def explain(
+        self, query: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        return self.connection.explain(query, parameters)
+
+    @contextmanager
+    def _guarded(self, query: str) -> Iterator[None]:
+        self.breaker.allow()
+        failed = False
+        try:
+            with self.limiter(query).slot():
+                yield
+        except (ConcurrencyLimitExceeded, *OVERLOAD_ERRORS):
+            failed = True
+            raise
+        finally:
+            self.breaker.record(failed)
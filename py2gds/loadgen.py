@@ -0,0 +1,452 @@
+"""
+Load generator for py2gds workloads. It runs a mix of DSL query chains described in a JSON workload spec and
+reports throughput, latency percentiles and error rates per query type:
+
+    py2gds-loadgen workload.json --concurrency 8 --duration 60
+
+Example of workload spec:
+
+    {
+        "connection": {"type": "replay", "path": "trace.jsonl.gz", "latency_scale": 1.0},
+        "collection": [{"labels": ["{site}Page"], "relationships": ["{site}_LINKS"], "tags": ["{site}"],
+                        "modifiers": {"site": ["es", "en"]}}],
+        "queries": [
+            {"name": "site_rank", "weight": 3,
+             "steps": [["rank", "pagerank"], ["projected_by", {"tag": "es"}], ["limit", 10]]},
+            {"name": "home_rank",
+             "steps": [["rank", "articlerank"], ["projected_by", {"labels": ["Page"], "relationships": ["LINKS"]}]],
+             "filters": [[["home", "Page", {"name": "Home"}]], [["home", "Page", {"name": "About"}]]]}
+        ],
+        "mode": "threads", "concurrency": 4, "duration": 10
+    }
+
+Connections can be "neo4j" (uri, user, password, readers, default_timeout), "replay" (path, latency_scale) or
+"fake" (results, latency), and any of them is recorded when "record" is set to a path.
+
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import cycle
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from py2gds.algorithm import AlgorithmType
+from py2gds.collection import Collection
+from py2gds.connection import (
+    AccessMode,
+    Connection,
+    Neo4JDriverConnection,
+    RoutingConnection,
+)
+from py2gds.dsl import Query, QueryBuilder
+from py2gds.recording import RecordingConnection, ReplayConnection
+
+STEPS = (
+    "rank",
+    "projected_by",
+    "weighted_by",
+    "set",
+    "write",
+    "select",
+    "order_by",
+    "skip",
+    "limit",
+)
+
+
+@dataclass(frozen=True)
+class CannedConnection(Connection):
+    """
+    Connection that answers every query with the same results after a fixed latency, to measure the
+    client-side cost of the library.
+
+    """
+
+    results: Tuple[Dict[str, Any], ...] = ()
+    latency: float = 0.0
+
+    def execute(
+        self,
+        query: str,
+        access_mode: AccessMode = AccessMode.write,
+        parameters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        if self.latency:
+            time.sleep(self.latency)
+        if "gds.graph.exists" in query:
+            return [{"exists": True}]
+        return list(self.results)
+
+
+def create_connection(spec: Dict[str, Any]) -> Connection:
+    spec = dict(spec)
+    connection_type = spec.pop("type", "neo4j")
+    record_path = spec.pop("record", None)
+    connection: Connection
+    if connection_type == "neo4j":
+        readers = spec.pop("readers", ())
+        if readers:
+            connection = RoutingConnection.create(
+                spec.pop("uri"), tuple(readers), **spec
+            )
+        else:
+            connection = Neo4JDriverConnection.create(**spec)
+    elif connection_type == "replay":
+        connection = ReplayConnection.load(**spec)
+    elif connection_type == "fake":
+        connection = CannedConnection(
+            tuple(spec.get("results", ())), spec.get("latency", 0.0)
+        )
+    else:
+        raise ValueError(f"Unknown connection type {connection_type}")
+    if record_path:
+        return RecordingConnection(connection, record_path)
+    return connection
+
+
+def _hashable(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_hashable(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _hashable(item)) for key, item in value.items()))
+    return value
+
+
+def _keyword_arguments(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: _hashable(value) for key, value in arguments.items()}
+
+
+@dataclass(frozen=True)
+class WorkloadQuery:
+    """
+    Type of query of the workload: a chain of DSL steps and, for personalized ranks, the sets of source
+    nodes filters used in turns.
+
+    """
+
+    name: str
+    steps: Tuple[Tuple[str, Any], ...]
+    weight: float = 1.0
+    filters: Tuple[Tuple[Tuple[str, str, Dict[str, Any]], ...], ...] = ()
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, Any]) -> "WorkloadQuery":
+        steps = tuple(
+            (step[0], step[1] if len(step) > 1 else None) for step in spec["steps"]
+        )
+        for method, _ in steps:
+            if method not in STEPS:
+                raise ValueError(f"Unknown DSL step {method}")
+        filters = tuple(
+            tuple(tuple(filter_element) for filter_element in filter_set)
+            for filter_set in spec.get("filters", ())
+        )
+        return cls(spec["name"], steps, spec.get("weight", 1.0), filters)
+
+    def builders(
+        self, connection: Connection, collection: Optional[Collection] = None
+    ) -> Iterator[QueryBuilder]:
+        filters = cycle(self.filters) if self.filters else None
+        while True:
+            builder = Query.using(connection, collection)
+            if filters:
+                builder = builder.personalized_by(*next(filters))
+            for method, arguments in self.steps:
+                builder = self._apply(builder, method, arguments)
+            yield builder
+
+    @staticmethod
+    def _apply(builder: QueryBuilder, method: str, arguments: Any) -> QueryBuilder:
+        if method == "rank":
+            return builder.rank(AlgorithmType(arguments))
+        if isinstance(arguments, dict):
+            return getattr(builder, method)(**_keyword_arguments(arguments))
+        arguments = _hashable(arguments)
+        if isinstance(arguments, tuple):
+            return getattr(builder, method)(*arguments)
+        return getattr(builder, method)(arguments)
+
+
+@dataclass
+class QueryStats:
+    latencies: List[float] = field(default_factory=list)
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies) + sum(self.errors.values())
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.errors.values()) / self.requests if self.requests else 0.0
+
+    def percentile(self, percent: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        index = max(0, int(round(percent / 100 * len(latencies))) - 1)
+        return latencies[index]
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "throughput": len(self.latencies) / elapsed if elapsed else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "error_rate": self.error_rate,
+            "errors": dict(self.errors),
+        }
+
+
+@dataclass
+class LoadReport:
+    stats: Dict[str, QueryStats] = field(
+        default_factory=lambda: defaultdict(QueryStats)
+    )
+    elapsed: float = 0.0
+    _lock: Lock = field(default_factory=Lock, repr=False)
+
+    def success(self, name: str, latency: float):
+        with self._lock:
+            self.stats[name].latencies.append(latency)
+
+    def error(self, name: str, error: Exception):
+        with self._lock:
+            self.stats[name].errors[type(error).__name__] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        total = QueryStats()
+        for stats in self.stats.values():
+            total.latencies.extend(stats.latencies)
+            for error, count in stats.errors.items():
+                total.errors[error] += count
+        return {
+            "elapsed": self.elapsed,
+            "queries": {
+                name: stats.summary(self.elapsed) for name, stats in self.stats.items()
+            },
+            "total": total.summary(self.elapsed),
+        }
+
+    def format(self) -> str:
+        summary = self.summary()
+        titles = ("requests", "req/s", "p50 ms", "p95 ms", "p99 ms")
+        header = "".join(f"{title:>10}" for title in titles)
+        lines = [f"{'query':<24}{header}{'errors':>9}"]
+        for name, stats in {**summary["queries"], "total": summary["total"]}.items():
+            percentiles = [
+                f"{'-':>10}" if stats[key] is None else f"{stats[key] * 1000:>10.1f}"
+                for key in ("p50", "p95", "p99")
+            ]
+            lines.append(
+                f"{name:<24}{stats['requests']:>10}{stats['throughput']:>10.1f}"
+                f"{''.join(percentiles)}{stats['error_rate']:>9.1%}"
+            )
+        return "\n".join(lines)
+
+
+@dataclass
+class Workload:
+    """
+    It runs a weighted mix of queries until duration seconds pass or requests queries are sent. Queries are
+    sent at a fixed rate when it is set, otherwise concurrency workers send them back to back. At a fixed rate,
+    latencies are measured from the time each query was scheduled, so the time queries wait behind slow ones
+    is counted instead of being omitted.
+
+    """
+
+    connection: Connection
+    queries: Sequence[WorkloadQuery]
+    collection: Optional[Collection] = None
+    mode: str = "threads"
+    concurrency: int = 1
+    rate: Optional[float] = None
+    duration: Optional[float] = None
+    requests: Optional[int] = None
+    seed: Optional[int] = None
+    _random: random.Random = field(init=False, repr=False)
+    _builders: Dict[str, Iterator[QueryBuilder]] = field(init=False, repr=False)
+    _lock: Lock = field(default_factory=Lock, repr=False)
+    _sent: int = field(default=0, repr=False)
+
+    def __post_init__(self):
+        if not self.duration and not self.requests:
+            raise ValueError("The workload needs a duration or a number of requests")
+        self._random = random.Random(self.seed)
+        self._builders = {
+            query.name: query.builders(self.connection, self.collection)
+            for query in self.queries
+        }
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, Any]) -> "Workload":
+        connection = create_connection(spec["connection"])
+        collection = None
+        if spec.get("collection"):
+            collection = Collection.create_from_projections_parameters(
+                connection,
+                tuple(
+                    _keyword_arguments(parameters) for parameters in spec["collection"]
+                ),
+            )
+        return cls(
+            connection,
+            [WorkloadQuery.from_spec(query) for query in spec["queries"]],
+            collection,
+            spec.get("mode", "threads"),
+            spec.get("concurrency", 1),
+            spec.get("rate"),
+            spec.get("duration"),
+            spec.get("requests"),
+            spec.get("seed"),
+        )
+
+    def run(self) -> LoadReport:
+        report = LoadReport()
+        start = time.perf_counter()
+        if self.mode == "asyncio":
+            asyncio.run(self._run_async(report, start))
+        elif self.mode == "threads":
+            self._run_threads(report, start)
+        else:
+            raise ValueError(f"Unknown mode {self.mode}")
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def next_query(self, start: float) -> Optional[Tuple[str, QueryBuilder]]:
+        with self._lock:
+            if self.requests and self._sent >= self.requests:
+                return None
+            if self.duration and time.perf_counter() - start >= self.duration:
+                return None
+            self._sent += 1
+            query = self._random.choices(
+                self.queries, [query.weight for query in self.queries]
+            )[0]
+            return query.name, next(self._builders[query.name])
+
+    def _run_threads(self, report: LoadReport, start: float):
+        with ThreadPoolExecutor(self.concurrency, "py2gds-loadgen") as executor:
+            if not self.rate:
+                for _ in range(self.concurrency):
+                    executor.submit(self._closed_loop, report, start)
+                return
+            while next_query := self.next_query(start):
+                executor.submit(
+                    self._send, report, *next_query, self._scheduled_at(start)
+                )
+                self._pace(start)
+
+    def _closed_loop(self, report: LoadReport, start: float):
+        while next_query := self.next_query(start):
+            self._send(report, *next_query)
+
+    @staticmethod
+    def _send(
+        report: LoadReport,
+        name: str,
+        builder: QueryBuilder,
+        scheduled_at: Optional[float] = None,
+    ):
+        sent_at = scheduled_at or time.perf_counter()
+        try:
+            builder.run(log=False)
+        except Exception as error:
+            report.error(name, error)
+        else:
+            report.success(name, time.perf_counter() - sent_at)
+
+    def _scheduled_at(self, start: float) -> Optional[float]:
+        if not self.rate:
+            return None
+        return start + (self._sent - 1) / self.rate
+
+    def _pace(self, start: float):
+        if not self.rate:
+            return
+        time.sleep(max(0.0, start + self._sent / self.rate - time.perf_counter()))
+
+    async def _run_async(self, report: LoadReport, start: float):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+        while next_query := self.next_query(start):
+            scheduled_at = self._scheduled_at(start)
+            await semaphore.acquire()
+            task = asyncio.ensure_future(
+                self._send_async(report, *next_query, scheduled_at)
+            )
+            task.add_done_callback(lambda _: semaphore.release())
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            if self.rate:
+                await asyncio.sleep(
+                    max(0.0, start + self._sent / self.rate - time.perf_counter())
+                )
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    @staticmethod
+    async def _send_async(
+        report: LoadReport,
+        name: str,
+        builder: QueryBuilder,
+        scheduled_at: Optional[float] = None,
+    ):
+        sent_at = scheduled_at or time.perf_counter()
+        try:
+            await builder.run_async(log=False)
+        except Exception as error:
+            report.error(name, error)
+        else:
+            report.success(name, time.perf_counter() - sent_at)
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="py2gds-loadgen", description="Run a py2gds workload and report latencies."
+    )
+    parser.add_argument("spec", help="Path of the JSON workload spec.")
+    parser.add_argument("--mode", choices=("threads", "asyncio"))
+    parser.add_argument("--concurrency", type=int)
+    parser.add_argument("--rate", type=float, help="Queries per second.")
+    parser.add_argument("--duration", type=float, help="Seconds to run.")
+    parser.add_argument("--requests", type=int, help="Number of queries to send.")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    arguments = parse_arguments(argv)
+    with open(arguments.spec) as file:
+        spec = json.load(file)
+    for name in ("mode", "concurrency", "rate", "duration", "requests", "seed"):
+        if getattr(arguments, name) is not None:
+            spec[name] = getattr(arguments, name)
+
+    workload = Workload.from_spec(spec)
+    try:
+        report = workload.run()
+    finally:
+        if isinstance(workload.connection, RecordingConnection):
+            workload.connection.close()
+
+    if arguments.json:
+        print(json.dumps(report.summary(), indent=2))
+    else:
+        print(report.format())
+    return 1 if report.summary()["total"]["error_rate"] == 1.0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
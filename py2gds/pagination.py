@@ -0,0 +1,213 @@
+import base64
+import json
+import time
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from py2gds.advisor import IndexAdvisor, IndexRequirement
+from py2gds.connection import AccessMode, Connection
+from py2gds.exceptions import InvalidCursor, CursorExpired
+from py2gds.queries import DropIndex, RemoveProperty
+from py2gds.query import Query, new_tag
+from py2gds.utils import quote_identifier
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """
+    Position after the last row of a page: its score and node id. It's only valid for the generation of the
+    ranking score_property that it was issued for, until expires_at.
+
+    """
+
+    score_property: str
+    generation: Optional[str]
+    score: float
+    node_id: int
+    expires_at: float
+
+    def encode(self) -> str:
+        state = [
+            self.score_property,
+            self.generation,
+            self.score,
+            self.node_id,
+            self.expires_at,
+        ]
+        return base64.urlsafe_b64encode(json.dumps(state).encode()).decode()
+
+    @classmethod
+    def decode(
+        cls, token: str, score_property: str, generation: Optional[str] = None
+    ) -> "Cursor":
+        """
+        It rejects cursors of other rankings, expired cursors and, when generation is set, cursors issued
+        before the ranking was recomputed.
+
+        """
+        try:
+            cursor = cls(*json.loads(base64.urlsafe_b64decode(token.encode())))
+        except (ValueError, TypeError):
+            raise InvalidCursor(f"Cursor {token} is malformed")
+        if cursor.score_property != score_property:
+            raise InvalidCursor(f"Cursor {token} belongs to another ranking")
+        if cursor.expires_at <= time.time():
+            raise CursorExpired(f"Cursor {token} has expired")
+        if generation is not None and cursor.generation != generation:
+            raise CursorExpired(f"Cursor {token} belongs to a recomputed ranking")
+        return cursor
+
+
+@dataclass(frozen=True)
+class Page:
+    rows: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class RankingPageQuery(Query):
+    score_property: str
+    page_size: int
+    label: Optional[str] = None
+    returned_properties: Optional[Tuple[str, ...]] = None
+    cursor: Optional[Cursor] = None
+    labels_filter: Tuple[str, ...] = ()
+
+    @property
+    def cypher(self) -> str:
+        labels = dict.fromkeys((self.label,) if self.label else ())
+        labels.update(dict.fromkeys(self.labels_filter))
+        label = "".join(f":{quote_identifier(label)}" for label in labels)
+        score = f"node.{quote_identifier(self.score_property)}"
+        after_cursor = (
+            f"\nAND {score} <= $score AND ({score} < $score OR id(node) > $nodeId)"
+            if self.cursor
+            else ""
+        )
+        if self.returned_properties:
+            returned_nodes = ", ".join(
+                f"node.{quote_identifier(returned_property)} AS {quote_identifier(returned_property)}"
+                for returned_property in self.returned_properties
+            )
+        else:
+            returned_nodes = "node"
+
+        return (
+            f"MATCH (node{label})\n"
+            f"WHERE {score} IS NOT NULL{after_cursor}\n"
+            f"RETURN {returned_nodes}, {score} AS score, id(node) AS nodeId\n"
+            "ORDER BY score DESC, nodeId ASC\n"
+            "LIMIT $pageSize"
+        )
+
+    @property
+    def access_mode(self) -> AccessMode:
+        return AccessMode.read
+
+    @property
+    def parameters(self) -> Optional[Dict[str, Any]]:
+        parameters: Dict[str, Any] = {"pageSize": self.page_size}
+        if self.cursor:
+            parameters.update(score=self.cursor.score, nodeId=self.cursor.node_id)
+        return parameters
+
+
+@dataclass
+class PaginatedRanking:
+    """
+    It computes a ranking once into an indexed node property with a write rank, and serves its pages with keyset
+    pagination on (score, node id). Pages don't recompute the rank and cursors are stateless, so any process can
+    serve the next page until the cursor expires. After ttl seconds the ranking is recomputed on the next first
+    page request. Every generation is written into its own property, named after score_property and the
+    generation, and pages switch to it once it's written, so readers never see a half written ranking. Scores
+    of the previous generation are removed after the switch, and its cursors are rejected by the process that
+    recomputed it.
+
+    """
+
+    connection: Connection
+    builder: Any
+    score_property: str
+    page_size: int = 20
+    ttl: float = 300.0
+    label: Optional[str] = None
+    returned_properties: Optional[Tuple[str, ...]] = None
+    labels_filter: Tuple[str, ...] = ()
+    _expires_at: float = 0.0
+    _generation: Optional[str] = None
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    def generation_property(self, generation: Optional[str]) -> str:
+        if not generation:
+            return self.score_property
+        return f"{self.score_property}_{generation}"
+
+    def compute(self, log: bool = True):
+        generation = new_tag()
+        score_property = self.generation_property(generation)
+        self.builder.write(score_property).run(log)
+        if self.label:
+            IndexAdvisor(self.connection).create_missing_indexes(
+                IndexRequirement(self.label, (score_property,)), log=log
+            )
+        previous_generation = self._generation
+        self._expires_at = time.time() + self.ttl
+        self._generation = generation
+        if previous_generation:
+            self._remove(previous_generation, log)
+
+    def _remove(self, generation: str, log: bool = True):
+        score_property = self.generation_property(generation)
+        RemoveProperty(self.connection, score_property).run(log)
+        if self.label:
+            index_name = IndexRequirement(self.label, (score_property,)).index_name
+            DropIndex(self.connection, index_name).run(log)
+
+    def page(self, cursor: Optional[str] = None, log: bool = True) -> Page:
+        """
+        It returns the page after the cursor, or the first page when there's no cursor.
+
+        Args:
+            cursor: Token returned as next_cursor by the previous page.
+
+        Returns:
+            Page with the rows and the cursor of the next page, which is None in the last page.
+
+        """
+        generation: Optional[str]
+        if cursor:
+            decoded_cursor = Cursor.decode(
+                cursor, self.score_property, self._generation
+            )
+            generation = decoded_cursor.generation
+            expires_at = decoded_cursor.expires_at
+        else:
+            decoded_cursor = None
+            with self._lock:
+                if self._expires_at <= time.time():
+                    self.compute(log)
+                generation = self._generation
+                expires_at = self._expires_at
+
+        rows = RankingPageQuery(
+            self.connection,
+            self.generation_property(generation),
+            self.page_size,
+            self.label,
+            self.returned_properties,
+            decoded_cursor,
+            self.labels_filter,
+        ).run(log)
+
+        next_cursor = None
+        if len(rows) == self.page_size:
+            last_row = rows[-1]
+            next_cursor = Cursor(
+                self.score_property,
+                generation,
+                last_row["score"],
+                last_row["nodeId"],
+                expires_at,
+            ).encode()
+        return Page(rows, next_cursor)
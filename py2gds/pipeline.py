@@ -0,0 +1,92 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional
+
+from py2gds.exceptions import MissingDependency
+
+Row = Dict[str, Any]
+
+
+def chunked(rows: Iterable[Row], size: int) -> Iterator[List[Row]]:
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def _to_arrow(chunk: List[Row]) -> bytes:
+    try:
+        import pyarrow as pa
+    except ImportError as error:
+        raise MissingDependency(
+            "You must install 'pyarrow' (py2gds[arrow]) to send chunks as Arrow"
+        ) from error
+
+    batch = pa.RecordBatch.from_pylist(chunk)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def _from_arrow(buffer: bytes) -> Any:
+    import pyarrow as pa
+
+    return pa.ipc.open_stream(buffer).read_next_batch()
+
+
+def _transform_chunk(
+    transform: Callable[[Any], Iterable[Any]], chunk: Any, arrow: bool
+) -> List[Any]:
+    if arrow:
+        chunk = _from_arrow(chunk)
+    results = transform(chunk)
+    if hasattr(results, "to_pylist"):
+        return results.to_pylist()
+    return list(results)
+
+
+@dataclass(frozen=True)
+class ParallelPipeline:
+    """
+    It applies transform to chunks of rows in a pool of processes, so CPU heavy post-processing uses every core
+    and overlaps with the decoding of the rows, which keeps going in the calling process. Results are yielded in
+    the order of the rows. At most max_pending chunks are in flight, so a fast stream doesn't pile up in memory.
+
+    transform receives a list of rows and returns an iterable of results. It must be picklable, e.g. a module
+    level function. When arrow is set, chunks are sent as Arrow IPC buffers instead of pickled rows and
+    transform receives a pyarrow.RecordBatch, which suits vectorized transforms over flat rows. It needs pyarrow.
+
+    """
+
+    transform: Callable[[Any], Iterable[Any]]
+    chunk_size: int = 10_000
+    max_workers: Optional[int] = None
+    max_pending: Optional[int] = None
+    arrow: bool = False
+
+    @property
+    def workers(self) -> int:
+        return self.max_workers or os.cpu_count() or 1
+
+    def map(self, rows: Iterable[Row]) -> Iterator[Any]:
+        max_pending = self.max_pending or 2 * self.workers
+        pending: Deque[Future] = deque()
+        with ProcessPoolExecutor(self.workers) as executor:
+            try:
+                for chunk in chunked(rows, self.chunk_size):
+                    payload: Any = _to_arrow(chunk) if self.arrow else chunk
+                    pending.append(
+                        executor.submit(
+                            _transform_chunk, self.transform, payload, self.arrow
+                        )
+                    )
+                    if len(pending) >= max_pending:
+                        yield from pending.popleft().result()
+                while pending:
+                    yield from pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
@@ -0,0 +1,133 @@
+import time
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from py2gds.connection import Connection
+from py2gds.projection import (
+    Projection,
+    NativeProjection,
+    ListProjectionsQuery,
+    RelationshipProjection,
+)
+
+
+@dataclass(frozen=True)
+class ProjectionPlan:
+    """
+    Projection that serves a request and the algorithm-level filters needed to restrict it to the requested
+    subgraph. Filters are None when the projection matches the request exactly.
+
+    """
+
+    projection: Projection
+    node_labels: Optional[Tuple[str, ...]] = None
+    relationship_types: Optional[Tuple[str, ...]] = None
+
+
+@dataclass
+class ProjectionPlanner:
+    """
+    It answers projection requests with existing projections. When a known projection already exists in the
+    graph catalog and is a superset of the requested one, the request is served by it through nodeLabels and
+    relationshipTypes filters instead of creating a new in-memory graph.
+
+    The graph catalog is listed at most once every catalog_ttl seconds, so projections created or dropped in the
+    meantime by someone else may be missed until it expires.
+
+    """
+
+    connection: Connection
+    catalog_ttl: float = 5.0
+    _projections: Dict[str, Projection] = field(default_factory=dict)
+    _catalog: Set[str] = field(default_factory=set, repr=False)
+    _catalog_listed_at: Optional[float] = field(default=None, repr=False)
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    @classmethod
+    def create(
+        cls, connection: Connection, projections: Iterable[Projection] = ()
+    ) -> "ProjectionPlanner":
+        planner = cls(connection)
+        for projection in projections:
+            planner.register(projection)
+        return planner
+
+    def register(self, projection: Projection):
+        with self._lock:
+            self._projections[projection.name] = projection
+
+    def catalog(self, log: bool = True) -> Set[str]:
+        """
+        Names of the projections in the graph catalog.
+
+        """
+        with self._lock:
+            listed_at = self._catalog_listed_at
+            if listed_at is not None and time.monotonic() - listed_at < self.catalog_ttl:
+                return self._catalog
+        names = set(ListProjectionsQuery(self.connection).run(log))
+        with self._lock:
+            self._catalog = names
+            self._catalog_listed_at = time.monotonic()
+        return names
+
+    def invalidate(self):
+        with self._lock:
+            self._catalog_listed_at = None
+
+    def plan(self, projection: Projection, log: bool = True) -> ProjectionPlan:
+        existing_names = self.catalog(log)
+        if projection.name in existing_names or not self._is_reusable(projection):
+            return ProjectionPlan(projection)
+
+        with self._lock:
+            candidates = [
+                candidate
+                for name, candidate in self._projections.items()
+                if name in existing_names
+                and self._is_reusable(candidate)
+                and candidate.identity.covers(projection.identity)
+            ]
+        if not candidates:
+            self.register(projection)
+            return ProjectionPlan(projection)
+
+        superset = min(candidates, key=self._size)
+        return ProjectionPlan(
+            superset,
+            self._filter(projection.identity.labels, superset.identity.labels),
+            self._filter(
+                self._types(projection.identity.relationships),
+                self._types(superset.identity.relationships),
+            ),
+        )
+
+    @staticmethod
+    def _is_reusable(projection: Projection) -> bool:
+        return isinstance(projection, NativeProjection)
+
+    @staticmethod
+    def _size(projection: Projection) -> int:
+        identity = projection.identity
+        return (
+            len(identity.labels)
+            + len(identity.relationships)
+            + len(identity.node_properties)
+            + len(identity.relationship_properties)
+        )
+
+    @staticmethod
+    def _types(relationships) -> Tuple[str, ...]:
+        if relationships == '"*"':
+            return relationships
+        return tuple(
+            RelationshipProjection.of(relationship).type
+            for relationship in relationships
+        )
+
+    @staticmethod
+    def _filter(requested, available) -> Optional[Tuple[str, ...]]:
+        if requested == '"*"' or set(requested) == set(available):
+            return None
+        return tuple(requested)
@@ -0,0 +1,154 @@
+import logging
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from enum import Enum
+from threading import Event, Thread
+from typing import Any, Callable, ContextManager, Dict, List, Optional
+
+from py2gds.connection import Connection
+from py2gds.query import Query, kill
+
+
+class Stage(str, Enum):
+    projection = "projection"
+    rank = "rank"
+
+
+@dataclass(frozen=True)
+class JobProgress:
+    """
+    Progress of one stage of a run: the projection creation or the rank. Each stage goes from 0% to 100%, so
+    callbacks tell them apart by stage, while phase is the task reported by GDS.
+
+    """
+
+    job_id: str
+    percent: Optional[float]
+    phase: Optional[str]
+    elapsed: float
+    eta: Optional[float] = None
+    stage: Optional[Stage] = None
+
+    @classmethod
+    def from_result(
+        cls, result: Dict[str, Any], elapsed: float, stage: Optional[Stage] = None
+    ) -> "JobProgress":
+        percent = cls._percent(result["progress"])
+        eta = None
+        if percent:
+            eta = elapsed * (100 - percent) / percent
+        return cls(result["jobId"], percent, result["taskName"], elapsed, eta, stage)
+
+    @staticmethod
+    def _percent(progress: Any) -> Optional[float]:
+        if isinstance(progress, (int, float)):
+            return float(progress)
+        try:
+            return float(str(progress).rstrip("%"))
+        except ValueError:
+            return None
+
+
+ProgressCallback = Callable[[JobProgress], Optional[bool]]
+
+
+@dataclass(frozen=True)
+class ListProgressQuery(Query):
+    job_id: str
+
+    @property
+    def cypher(self) -> str:
+        return """CALL gds.beta.listProgress()
+        YIELD jobId, taskName, progress
+        WHERE jobId = $jobId
+        RETURN jobId, taskName, progress"""
+
+    @property
+    def parameters(self) -> Optional[Dict[str, Any]]:
+        return {"jobId": self.job_id}
+
+    def run(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        return self.run_on_members(log, timeout)
+
+
+@dataclass
+class ProgressMonitor:
+    """
+    It polls the progress of a GDS job in a side thread while the context is open and passes it to callback.
+    The job id is also the tag of its transactions, so when callback returns False the job is killed.
+
+    """
+
+    connection: Connection
+    job_id: str
+    callback: ProgressCallback
+    interval: float = 1.0
+    log: bool = False
+    stage: Optional[Stage] = None
+    _stop: Event = field(default_factory=Event, repr=False)
+    _thread: Optional[Thread] = field(default=None, repr=False)
+    _started_at: float = field(default=0.0, repr=False)
+
+    def __enter__(self) -> "ProgressMonitor":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        if exc_type is None:
+            self.callback(
+                JobProgress(self.job_id, 100.0, None, self.elapsed, 0.0, self.stage)
+            )
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started_at
+
+    def start(self):
+        self._started_at = time.monotonic()
+        self._thread = Thread(
+            target=self._watch, name=f"py2gds-progress-{self.job_id}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def poll(self) -> List[JobProgress]:
+        return [
+            JobProgress.from_result(result, self.elapsed, self.stage)
+            for result in ListProgressQuery(self.connection, self.job_id).run(self.log)
+        ]
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            try:
+                progresses = self.poll()
+            except Exception as error:
+                logging.warning(f"Progress of {self.job_id} not available: {error}")
+                return
+            for progress in progresses:
+                if self.callback(progress) is False:
+                    kill(self.connection, self.job_id, self.log)
+                    return
+
+
+def monitor(
+    connection: Connection,
+    job_id: Optional[str],
+    callback: Optional[ProgressCallback],
+    stage: Optional[Stage] = None,
+) -> ContextManager:
+    if callback is None:
+        return nullcontext()
+    if not job_id:
+        raise ValueError("Progress can only be monitored for tagged jobs")
+    return ProgressMonitor(connection, job_id, callback, stage=stage)
@@ -1,27 +1,167 @@
+import re
 from abc import ABC
-from dataclasses import dataclass, field
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import cached_property
+from dataclasses import dataclass, field, replace
+from enum import Enum
 from hashlib import blake2b
 from itertools import product
-from typing import Union, List, Tuple, Dict
+from string import Formatter
+from threading import Lock
+from typing import (
+    ContextManager,
+    Union,
+    List,
+    Tuple,
+    Dict,
+    Optional,
+    Any,
+    Iterable,
+    Iterator,
+    Mapping,
+    Pattern,
+)
 
 from py2gds.connection import Connection
-from py2gds.query import Query
+from py2gds.cypher import Call, Expression, Return, Statement, Yield
+from py2gds.progress import ProgressCallback, Stage, monitor
+from py2gds.query import Query, new_tag
+from py2gds.singleflight import SingleFlight
+
+PROJECTIONS_CREATIONS = SingleFlight()
+
+
+@dataclass(frozen=True, eq=False)
+class ConnectionKey:
+    """
+    Key of a connection in PROJECTIONS_CREATIONS. It compares by identity, since connections may not be
+    hashable, and holds the connection, so its id can't be reused by another one while the key is in use.
+
+    """
+
+    connection: Connection
+
+    def __hash__(self):
+        return id(self.connection)
+
+    def __eq__(self, other):
+        return isinstance(other, ConnectionKey) and other.connection is self.connection
+
+
+class Orientation(str, Enum):
+    natural = "NATURAL"
+    reverse = "REVERSE"
+    undirected = "UNDIRECTED"
+
+
+class Aggregation(str, Enum):
+    default = "DEFAULT"
+    none = "NONE"
+    min = "MIN"
+    max = "MAX"
+    sum = "SUM"
+    single = "SINGLE"
+    count = "COUNT"
+
+
+@dataclass(frozen=True)
+class RelationshipProjection:
+    """
+    Projection of one relationship type. Directed link graphs should use NATURAL orientation: UNDIRECTED
+    doubles the relationships held in memory and changes the semantics of ranks.
+
+    """
+
+    type: str
+    orientation: Orientation = Orientation.undirected
+    aggregation: Aggregation = Aggregation.default
+
+    @classmethod
+    def of(
+        cls, relationship: Union[str, "RelationshipProjection"]
+    ) -> "RelationshipProjection":
+        if isinstance(relationship, RelationshipProjection):
+            return relationship
+        return cls(relationship)
+
+    @property
+    def is_default(self) -> bool:
+        return self == RelationshipProjection(self.type)
+
+    @property
+    def key(self) -> str:
+        if self.is_default:
+            return self.type
+        return f"{self.type}:{self.orientation.value}:{self.aggregation.value}"
+
+    def __str__(self):
+        aggregation_part = (
+            f", aggregation:'{self.aggregation.value}'"
+            if self.aggregation != Aggregation.default
+            else ""
+        )
+        return (
+            f"{self.type}:{{type:'{self.type}', "
+            f"orientation:'{self.orientation.value}'{aggregation_part}}}"
+        )
+
+
+Relationships = Union[Tuple[Union[str, RelationshipProjection], ...], str]
 
 
 @dataclass(frozen=True)
 class ProjectionIdentity:
     labels: Union[Tuple[str, ...], str] = '"*"'
-    relationships: Union[Tuple[str, ...], str] = '"*"'
+    relationships: Relationships = '"*"'
+    node_properties: Tuple[str, ...] = ()
+    relationship_properties: Tuple[str, ...] = ()
 
     def __hash__(self):
+        return self.digest
+
+    @cached_property
+    def digest(self) -> str:
         h = blake2b()
         identity = {
             "labels": tuple(sorted(set(self.labels))),
-            "relationships": tuple(sorted(set(self.relationships))),
+            "relationships": tuple(sorted(set(self.relationships_keys))),
         }
+        if self.node_properties:
+            identity["node_properties"] = tuple(sorted(set(self.node_properties)))
+        if self.relationship_properties:
+            identity["relationship_properties"] = tuple(
+                sorted(set(self.relationship_properties))
+            )
         h.update(str(identity.values()).encode())
         return h.hexdigest()
 
+    def covers(self, other: "ProjectionIdentity") -> bool:
+        """
+        It indicates if a projection with this identity holds every node, relationship and property of a
+        projection with the other identity, so the other can be served filtering this one by labels and types.
+
+        """
+        if (self.labels == '"*"') != (other.labels == '"*"'):
+            return False
+        if (self.relationships == '"*"') != (other.relationships == '"*"'):
+            return False
+        return (
+            set(other.labels) <= set(self.labels)
+            and set(other.relationships_keys) <= set(self.relationships_keys)
+            and set(other.node_properties) <= set(self.node_properties)
+            and set(other.relationship_properties) <= set(self.relationship_properties)
+        )
+
+    @property
+    def relationships_keys(self) -> Union[Tuple[str, ...], str]:
+        if self.relationships == '"*"':
+            return self.relationships
+        return tuple(
+            RelationshipProjection.of(relationship).key
+            for relationship in self.relationships
+        )
+
 
 @dataclass(frozen=True)
 class Projection(ABC):
@@ -44,8 +184,34 @@ class Projection(ABC):
     def delete_query(self) -> Query:
         return DeleteProjectionQuery(self.connection, self.name)
 
-    def create(self, log: bool = True):
-        return self.create_query.run(log)
+    def create(
+        self,
+        log: bool = True,
+        read_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+    ):
+        """
+        It creates the projection. Concurrent creations of the same projection through the same connection share
+        a single gds.graph.create call. When progress is set, it's called with the progress of the creation.
+
+        """
+        create_query = self.create_query
+        if read_concurrency:
+            create_query = replace(create_query, read_concurrency=read_concurrency)
+        if progress:
+            tag = tag or new_tag()
+            create_query = replace(create_query, job_id=tag)
+
+        def run():
+            with monitor(self.connection, tag, progress, Stage.projection):
+                return create_query.run(log, timeout, tag)
+
+        results = PROJECTIONS_CREATIONS.do(
+            (ConnectionKey(self.connection), self.name), run
+        )
+        return list(results)
 
     def exists(self, log: bool = True):
         return self.exists_query.run(log)[0]["exists"]
@@ -53,6 +219,21 @@ class Projection(ABC):
     def delete(self, log: bool = True):
         return self.delete_query.run(log)
 
+    @property
+    def has_fixed_name(self) -> bool:
+        """
+        Whether the name of the projection never changes, so queries may embed it in cached Cypher.
+
+        """
+        return True
+
+    def in_use(self) -> ContextManager[str]:
+        """
+        It marks the projection as used by a query while the context is open.
+
+        """
+        return nullcontext(self.name)
+
 
 @dataclass(frozen=True)
 class NativeProjection(Projection):
@@ -64,11 +245,15 @@ class NativeProjection(Projection):
 
     @property
     def create_query(self) -> Query:
+        concurrency = self.connection.concurrency
         return CreateProjectionQuery(
             self.connection,
             self.name,
             self.identity.labels,
             self.identity.relationships,
+            concurrency.read_concurrency if concurrency else None,
+            self.identity.node_properties,
+            self.identity.relationship_properties,
         )
 
 
@@ -76,58 +261,405 @@ class NativeProjection(Projection):
 class TaggedProjection(NativeProjection):
     tags: List[str] = field(default_factory=list)
 
+    @classmethod
+    def from_parameters(
+        cls, connection: Connection, tags: Iterable[str] = (), **identity_parameters
+    ) -> "TaggedProjection":
+        return cls(connection, ProjectionIdentity(**identity_parameters), list(tags))
+
     @classmethod
     def consolidate(
         cls, connection: Connection, **projection_parameters: Dict[str, List[str]]
     ) -> List["TaggedProjection"]:
-        if modifiers := projection_parameters.pop("modifiers", False):
-            combinations = list(product(*modifiers.values()))
-            formatters = [
-                {k: v for k, v in zip(modifiers.keys(), combination)}
-                for combination in list(combinations)
-            ]
-
-            projections_parameters = [
-                {
-                    k: tuple(map(lambda x: x.format(**formatter), v))
-                    for k, v in projection_parameters.items()
-                }
-                for formatter in formatters
-            ]
-            return [
-                TaggedProjection(connection, **projection_parameters)
-                for projection_parameters in projections_parameters
-            ]
-
-        return [TaggedProjection(connection, **projection_parameters)]
+        template = ProjectionTemplate.create(**projection_parameters)
+        return [
+            template.projection(connection, formatter)
+            for formatter in template.formatters()
+        ]
+
+
+@dataclass
+class Generations:
+    """
+    Physical projections behind a logical one. Queries pin the generation that was current when they started,
+    and a retired generation is only released when its last query finishes.
+
+    """
+
+    current: str
+    version: int = 0
+    _in_flight: Dict[str, int] = field(default_factory=dict, repr=False)
+    _retired: List[str] = field(default_factory=list, repr=False)
+    _pinned: ContextVar = field(
+        default_factory=lambda: ContextVar("py2gds_generation", default=None),
+        repr=False,
+    )
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    @property
+    def name(self) -> str:
+        pinned = self._pinned.get()
+        return self.current if pinned is None else pinned
+
+    def next_name(self, base_name: str) -> str:
+        with self._lock:
+            return f"{base_name}_v{self.version + 1}"
+
+    def acquire(self) -> str:
+        with self._lock:
+            name = self.name
+            self._in_flight[name] = self._in_flight.get(name, 0) + 1
+            return name
+
+    def release(self, name: str) -> List[str]:
+        with self._lock:
+            self._in_flight[name] -= 1
+            if not self._in_flight[name]:
+                del self._in_flight[name]
+            return self._pop_unused()
+
+    def swap(self, name: str) -> List[str]:
+        """
+        It makes name the current generation and returns the retired generations that are no longer used.
+
+        """
+        with self._lock:
+            self._retired.append(self.current)
+            self.current = name
+            self.version += 1
+            return self._pop_unused()
+
+    @contextmanager
+    def pinned(self, name: str):
+        token = self._pinned.set(name)
+        try:
+            yield name
+        finally:
+            self._pinned.reset(token)
+
+    def _pop_unused(self) -> List[str]:
+        unused = [name for name in self._retired if name not in self._in_flight]
+        self._retired = [name for name in self._retired if name in self._in_flight]
+        return unused
+
+
+@dataclass(frozen=True)
+class RefreshableProjection(TaggedProjection):
+    """
+    Projection that can be rebuilt without downtime. A refresh creates the next generation under a versioned
+    name while the current one keeps serving, swaps the logical name and drops the old generation once the
+    queries that were using it finish.
+
+    """
+
+    generations: Generations = field(default=None, repr=False, compare=False)
+    _refresh_lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.generations is None:
+            object.__setattr__(self, "generations", Generations(self.base_name))
+
+    @classmethod
+    def of(cls, projection: NativeProjection) -> "RefreshableProjection":
+        return cls(
+            projection.connection,
+            projection.identity,
+            list(getattr(projection, "tags", [])),
+        )
+
+    @property
+    def base_name(self) -> str:
+        return str(super().name)
+
+    @property
+    def name(self) -> str:
+        return self.generations.name
+
+    @property
+    def has_fixed_name(self) -> bool:
+        return False
+
+    @contextmanager
+    def in_use(self):
+        name = self.generations.acquire()
+        try:
+            with self.generations.pinned(name):
+                yield name
+        finally:
+            self._drop(self.generations.release(name))
+
+    def refresh(self, log: bool = True, read_concurrency: Optional[int] = None) -> str:
+        """
+        It builds a new generation of the projection and switches to it.
+
+        Args:
+            log: Whether to log the queries.
+            read_concurrency: Concurrency used to load the new generation.
+
+        Returns:
+            Name of the new generation.
+
+        """
+        with self._refresh_lock:
+            name = self.generations.next_name(self.base_name)
+            create_query = replace(self.create_query, name=name)
+            if read_concurrency:
+                create_query = replace(create_query, read_concurrency=read_concurrency)
+            create_query.run(log)
+            self._drop(self.generations.swap(name), log)
+            return name
+
+    def _drop(self, names: List[str], log: bool = True):
+        for name in names:
+            DeleteProjectionQuery(self.connection, name).run(log)
+
+
+@dataclass(frozen=True)
+class ProjectionTemplate:
+    """
+    Projection parameters whose strings may reference modifiers, e.g. labels=("{site}Page",) and
+    tags=("{site}_pages",) with modifiers={"site": ["a", "b"]}. Each combination of modifiers' values is a
+    projection, but combinations are only built when they are needed: a tag is resolved by matching it against
+    the tag templates, without enumerating the combinations.
+
+    """
+
+    parameters: Tuple[Tuple[str, Any], ...]
+    modifiers: Tuple[Tuple[str, Tuple[str, ...]], ...] = ()
+    tags_patterns: Tuple[Tuple[Pattern, Dict[str, str]], ...] = field(
+        default=(), compare=False
+    )
+
+    @classmethod
+    def create(
+        cls,
+        modifiers: Optional[
+            Union[Mapping[str, Iterable[str]], Iterable[Tuple[str, Iterable[str]]]]
+        ] = None,
+        **parameters: Any,
+    ) -> "ProjectionTemplate":
+        """
+        Modifiers map every name to its values, given as a mapping or as pairs.
+
+        """
+        modifiers_values = tuple(
+            (name, tuple(values)) for name, values in dict(modifiers or {}).items()
+        )
+        tags_patterns = tuple(
+            cls._tag_pattern(tag, dict(modifiers_values))
+            for tag in parameters.get("tags", ())
+        )
+        return cls(tuple(parameters.items()), modifiers_values, tags_patterns)
+
+    @staticmethod
+    def _tag_pattern(
+        tag: str, modifiers: Dict[str, Tuple[str, ...]]
+    ) -> Tuple[Pattern, Dict[str, str]]:
+        pattern = []
+        groups: Dict[str, str] = {}
+        for literal, modifier, _, _ in Formatter().parse(tag):
+            pattern.append(re.escape(literal))
+            if modifier is None:
+                continue
+            if modifier in groups:
+                pattern.append(f"(?P={groups[modifier]})")
+                continue
+            groups[modifier] = f"m{len(groups)}"
+            values = sorted(modifiers.get(modifier, ()), key=len, reverse=True)
+            alternatives = "|".join(map(re.escape, values)) or "(?!)"
+            pattern.append(f"(?P<{groups[modifier]}>{alternatives})")
+        return re.compile("".join(pattern)), groups
+
+    def __len__(self):
+        combinations = 1
+        for _, values in self.modifiers:
+            combinations *= len(values)
+        return combinations
+
+    def formatters(self) -> Iterator[Dict[str, str]]:
+        names = [name for name, _ in self.modifiers]
+        for combination in product(*(values for _, values in self.modifiers)):
+            yield dict(zip(names, combination))
+
+    def match(self, tag: str) -> Optional[Dict[str, str]]:
+        """
+        Modifiers the tag doesn't reference take their first value, so the tag resolves to the first combination
+        carrying it.
+
+        """
+        if not len(self):
+            return None
+        for pattern, groups in self.tags_patterns:
+            if matched := pattern.fullmatch(tag):
+                formatter = {name: values[0] for name, values in self.modifiers}
+                formatter.update(
+                    {name: matched.group(group) for name, group in groups.items()}
+                )
+                return formatter
+        return None
+
+    def projection(
+        self, connection: Connection, formatter: Dict[str, str]
+    ) -> TaggedProjection:
+        return TaggedProjection.from_parameters(
+            connection,
+            **{
+                name: self._format(value, formatter)
+                for name, value in self.parameters
+            },
+        )
+
+    @classmethod
+    def _format(cls, value: Any, formatter: Dict[str, str]) -> Any:
+        if isinstance(value, str):
+            return value.format(**formatter)
+        if isinstance(value, RelationshipProjection):
+            return replace(value, type=value.type.format(**formatter))
+        return tuple(cls._format(element, formatter) for element in value)
+
+
+@dataclass(frozen=True)
+class FilteredProjection(Projection):
+    """
+    Subgraph of an existing projection that only keeps the nodes and relationships matching the filters.
+    Filters use GDS subgraph syntax, e.g. "n:Page AND n.visits > 10" or "r.weight > 0.5".
+
+    """
+
+    source: Projection
+    node_filter: str = "*"
+    relationship_filter: str = "*"
+
+    @classmethod
+    def of(
+        cls, source: Projection, node_filter: str = "*", relationship_filter: str = "*"
+    ) -> "FilteredProjection":
+        return cls(
+            source.connection,
+            source.identity,
+            source,
+            node_filter,
+            relationship_filter,
+        )
+
+    @property
+    def name(self):
+        h = blake2b()
+        h.update(
+            str((self.source.name, self.node_filter, self.relationship_filter)).encode()
+        )
+        return h.hexdigest()
+
+    @property
+    def has_fixed_name(self) -> bool:
+        return self.source.has_fixed_name
+
+    @property
+    def create_query(self) -> Query:
+        concurrency = self.connection.concurrency
+        return CreateSubgraphProjectionQuery(
+            self.connection,
+            self.name,
+            self.source.name,
+            self.node_filter,
+            self.relationship_filter,
+            concurrency.read_concurrency if concurrency else None,
+        )
+
+    def create(
+        self,
+        log: bool = True,
+        read_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+    ):
+        if not self.source.exists(log):
+            self.source.create(log, read_concurrency, timeout, tag, progress)
+        return super().create(log, read_concurrency, timeout, tag, progress)
 
 
 @dataclass(frozen=True)
 class CreateProjectionQuery(Query):
     name: str
     labels: Union[Tuple[str, ...], str] = '"*"'
-    relationships: Union[Tuple[str, ...], str] = '"*"'
+    relationships: Relationships = '"*"'
+    read_concurrency: Optional[int] = None
+    node_properties: Tuple[str, ...] = ()
+    relationship_properties: Tuple[str, ...] = ()
+    job_id: Optional[str] = None
 
     @property
-    def cypher(self) -> str:
-        relationships = self.relationships
-        if relationships != '"*"':
-            relationships = ",".join(
-                [
-                    f"{relationship}:{{type:'{relationship}', orientation:'UNDIRECTED'}}"
-                    for relationship in self.relationships
-                ]
+    def configuration(self) -> Dict[str, Any]:
+        configuration = {}
+        if self.node_properties:
+            configuration["nodeProperties"] = list(self.node_properties)
+        if self.relationship_properties:
+            configuration["relationshipProperties"] = list(
+                self.relationship_properties
             )
-            relationships = f"{{{relationships}}}"
+        if self.read_concurrency:
+            configuration["readConcurrency"] = self.read_concurrency
+        if self.job_id:
+            configuration["jobId"] = self.job_id
+        return configuration
 
-        query = f"""CALL gds.graph.create(
-        '{self.name}',
-        {list(self.labels)},
-        {relationships}
+    @property
+    def statement(self) -> Statement:
+        relationships = Expression(self.relationships)
+        if self.relationships != '"*"':
+            relationships = ",".join(
+                str(RelationshipProjection.of(relationship))
+                for relationship in self.relationships
+            )
+            relationships = Expression(f"{{{relationships}}}")
+        labels = self.labels
+        labels = Expression(labels) if labels == '"*"' else list(labels)
+        arguments = (str(self.name), labels, relationships)
+        if self.configuration:
+            arguments += (self.configuration,)
+        return Statement(
+            (
+                Call("gds.graph.create", arguments),
+                Yield(("graphName", "nodeCount", "relationshipCount", "createMillis")),
+            )
         )
-        YIELD graphName, nodeCount, relationshipCount, createMillis;"""
 
-        return query
+
+@dataclass(frozen=True)
+class CreateSubgraphProjectionQuery(Query):
+    name: str
+    source_name: str
+    node_filter: str = "*"
+    relationship_filter: str = "*"
+    read_concurrency: Optional[int] = None
+    job_id: Optional[str] = None
+
+    @property
+    def configuration(self) -> Dict[str, Any]:
+        configuration = {}
+        if self.read_concurrency:
+            configuration["concurrency"] = self.read_concurrency
+        if self.job_id:
+            configuration["jobId"] = self.job_id
+        return configuration
+
+    @property
+    def statement(self) -> Statement:
+        arguments = (
+            str(self.name),
+            str(self.source_name),
+            self.node_filter,
+            self.relationship_filter,
+        )
+        if self.configuration:
+            arguments += (self.configuration,)
+        return Statement(
+            (
+                Call("gds.beta.graph.subgraph", arguments),
+                Yield(("graphName", "nodeCount", "relationshipCount", "createMillis")),
+            )
+        )
 
 
 @dataclass(frozen=True)
@@ -135,8 +667,27 @@ class ExistsProjectionQuery(Query):
     name: str
 
     @property
-    def cypher(self) -> str:
-        return f"CALL gds.graph.exists('{self.name}') YIELD exists;"
+    def statement(self) -> Statement:
+        return Statement(
+            (Call("gds.graph.exists", (str(self.name),)), Yield(("exists",)))
+        )
+
+
+@dataclass(frozen=True)
+class ListProjectionsQuery(Query):
+    @property
+    def statement(self) -> Statement:
+        return Statement(
+            (Call("gds.graph.list"), Yield(("graphName",)), Return(("graphName",)))
+        )
+
+    def run(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> List[str]:
+        return [result["graphName"] for result in super().run(log, timeout, tag)]
 
 
 @dataclass(frozen=True)
@@ -144,5 +695,5 @@ class DeleteProjectionQuery(Query):
     name: str
 
     @property
-    def cypher(self) -> str:
-        return f"CALL gds.graph.drop('{self.name}')"
+    def statement(self) -> Statement:
+        return Statement((Call("gds.graph.drop", (str(self.name),)),))
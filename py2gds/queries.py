@@ -1,8 +1,26 @@
 from dataclasses import dataclass
 from typing import Any, Dict, Optional, Iterable, List
 
-from py2gds.query import Query
-from py2gds.utils import to_json_without_quotes, match_clause
+from py2gds.connection import AccessMode
+from py2gds.query import Query, TAG_KEY
+from py2gds.cypher import (
+    Call,
+    Create,
+    Delete,
+    Expression,
+    Limit,
+    Match,
+    Predicate,
+    Raw,
+    Remove,
+    Return,
+    Statement,
+    With,
+    Yield,
+    map_literal,
+    name,
+    node_pattern,
+)
 
 
 @dataclass(frozen=True)
@@ -12,8 +30,7 @@ class Node:
     reference: Optional[str] = None
 
     def __str__(self):
-        properties = to_json_without_quotes(self.properties) if self.properties else ""
-        return f"({self.reference or ''}:{self.label} {properties})"
+        return node_pattern(self.reference, self.label, self.properties)
 
 
 @dataclass(frozen=True)
@@ -23,21 +40,26 @@ class Relationship:
     properties: Dict[str, Any]
     to_node: Node
 
-    def __str__(self):
+    def pattern(self, reference: Optional[str] = None, with_properties: bool = True):
+        properties = f" {map_literal(self.properties)}" if with_properties else ""
         return (
-            f"({self.from_node.reference})-[:{self.type} "
-            f"{to_json_without_quotes(self.properties)}]->({self.to_node.reference})"
+            f"{node_pattern(self.from_node.reference)}"
+            f"-[{name(reference) if reference else ''}:{name(self.type)}{properties}]->"
+            f"{node_pattern(self.to_node.reference)}"
         )
 
+    def __str__(self):
+        return self.pattern()
+
 
 @dataclass(frozen=True)
 class CreateNode(Query):
     node: Node
 
     @property
-    def cypher(self) -> str:
-        return f"""CREATE
-        (:{self.node.label} {to_json_without_quotes(self.node.properties)})"""
+    def statement(self) -> Statement:
+        pattern = node_pattern(label=self.node.label, properties=self.node.properties)
+        return Statement((Create((pattern,)),))
 
 
 @dataclass(frozen=True)
@@ -46,19 +68,10 @@ class CreateNodes(Query):
     relationships: Optional[Iterable[Relationship]]
 
     @property
-    def cypher(self) -> str:
-        nodes_composition = ",\n".join((str(node) for node in self.nodes))
-        relationships_composition = (
-            ",\n".join((str(relationship) for relationship in self.relationships))
-            if self.relationships
-            else ""
-        )
-        nodes_and_relationships = ",\n".join(
-            [nodes_composition, relationships_composition]
-        )
-        return f"""CREATE
-        {nodes_and_relationships};
-        """
+    def statement(self) -> Statement:
+        patterns = [str(node) for node in self.nodes]
+        patterns.extend(str(relationship) for relationship in self.relationships or ())
+        return Statement((Create(tuple(patterns)),))
 
 
 @dataclass(frozen=True)
@@ -66,9 +79,14 @@ class MatchNode(Query):
     node: Node
 
     @property
-    def cypher(self) -> str:
-        return f"""{match_clause(self.node.reference, self.node.label, self.node.properties)}
-        RETURN {self.node.reference}"""
+    def statement(self) -> Statement:
+        reference = self.node.reference or "n"
+        pattern = node_pattern(reference, self.node.label, self.node.properties)
+        return Statement((Match((pattern,)), Return((reference,))))
+
+    @property
+    def access_mode(self) -> AccessMode:
+        return AccessMode.read
 
 
 @dataclass(frozen=True)
@@ -77,11 +95,10 @@ class DeleteNode(Query):
     force: bool = False
 
     @property
-    def cypher(self) -> str:
-        delete_verb = "DETACH DELETE" if self.force else "DELETE"
-
-        return f"""{match_clause(self.node.reference, self.node.label, self.node.properties)}
-        {delete_verb} {self.node.reference}"""
+    def statement(self) -> Statement:
+        reference = self.node.reference or "n"
+        pattern = node_pattern(reference, self.node.label, self.node.properties)
+        return Statement((Match((pattern,)), Delete((reference,), detach=self.force)))
 
 
 @dataclass(frozen=True)
@@ -96,9 +113,14 @@ class DeleteNodes(Query):
         ]
         return "\n".join(delete_node_queries)
 
-    def run(self, log: bool = True) -> Any:
+    def run(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> Any:
         for node in self.nodes:
-            DeleteNode(self.connection, node, self.force).run(log=log)
+            DeleteNode(self.connection, node, self.force).run(log, timeout, tag)
 
 
 @dataclass(frozen=True)
@@ -106,13 +128,14 @@ class CreateRelationShip(Query):
     relationship: Relationship
 
     @property
-    def cypher(self) -> str:
-        return (
-            f"MATCH {str(self.relationship.from_node)}, {str(self.relationship.to_node)} \n"
-            f"CREATE ({self.relationship.from_node.reference})"
-            f"-[r:{self.relationship.type} {to_json_without_quotes(self.relationship.properties)}]->"
-            f"({self.relationship.to_node.reference}) \n"
-            f"RETURN type(r)"
+    def statement(self) -> Statement:
+        relationship = self.relationship
+        return Statement(
+            (
+                Match((str(relationship.from_node), str(relationship.to_node))),
+                Create((relationship.pattern("r"),)),
+                Return(("type(r)",)),
+            )
         )
 
 
@@ -121,12 +144,13 @@ class DeleteRelationship(Query):
     relationship: Relationship
 
     @property
-    def cypher(self) -> str:
-        return (
-            f"MATCH {str(self.relationship.from_node)}"
-            f"-[r:{self.relationship.type}]->{str(self.relationship.to_node)}"
-            f" DELETE r"
+    def statement(self) -> Statement:
+        relationship = self.relationship
+        pattern = (
+            f"{relationship.from_node}-[r:{name(relationship.type)}]->"
+            f"{relationship.to_node}"
         )
+        return Statement((Match((pattern,)), Delete(("r",))))
 
 
 @dataclass(frozen=True)
@@ -141,9 +165,16 @@ class DeleteRelationships(Query):
         ]
         return "\n".join(delete_relationships_queries)
 
-    def run(self, log: bool = True) -> Any:
+    def run(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> Any:
         for relationship in self.relationships:
-            DeleteRelationship(self.connection, relationship).run(log=log)
+            DeleteRelationship(self.connection, relationship).run(
+                log, timeout, tag
+            )
 
 
 @dataclass(frozen=True)
@@ -152,15 +183,32 @@ class CheckProperty(Query):
     property_name: str
 
     @property
-    def cypher(self) -> str:
-        return f"""MATCH (n:{self.label})
-        WHERE EXISTS (n.{self.property_name})
-        RETURN n LIMIT 1
-        """
+    def statement(self) -> Statement:
+        return Statement(
+            (
+                Match(
+                    (node_pattern("n", self.label),),
+                    predicates=(
+                        Predicate(f"EXISTS (n.{name(self.property_name)})", ("n",)),
+                    ),
+                ),
+                Return(("n",)),
+                Limit(1),
+            )
+        )
 
-    def run(self, log: bool = True) -> bool:
-        results = super().run(log)
-        return len(results.data()) == 0
+    @property
+    def access_mode(self) -> AccessMode:
+        return AccessMode.read
+
+    def run(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> bool:
+        results = super().run(log, timeout, tag)
+        return len(results) == 0
 
 
 @dataclass(frozen=True)
@@ -168,9 +216,8 @@ class RemoveProperty(Query):
     name: str
 
     @property
-    def cypher(self) -> str:
-        return f"""MATCH (n)
-        REMOVE n.{self.name}"""
+    def statement(self) -> Statement:
+        return Statement((Match(("(n)",)), Remove((f"n.{name(self.name)}",))))
 
 
 @dataclass(frozen=True)
@@ -178,12 +225,27 @@ class CheckLabel(Query):
     label: str
 
     @property
-    def cypher(self) -> str:
-        return f"MATCH (n:{self.label}) WITH count(n)>0 as exists RETURN exists"
+    def statement(self) -> Statement:
+        return Statement(
+            (
+                Match((node_pattern("n", self.label),)),
+                With(("count(n) > 0 AS exists",)),
+                Return(("exists",)),
+            )
+        )
 
-    def run(self, log: bool = True) -> bool:
-        results = super().run(log)
-        return results.data()[0]["exists"]
+    @property
+    def access_mode(self) -> AccessMode:
+        return AccessMode.read
+
+    def run(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> bool:
+        results = super().run(log, timeout, tag)
+        return results[0]["exists"]
 
 
 @dataclass(frozen=True)
@@ -193,11 +255,17 @@ class CreateIndex(Query):
     index_name: str
 
     @property
-    def cypher(self) -> str:
-        properties_part = ", ".join([f"n.{property}" for property in self.properties])
-
-        return f"""CREATE INDEX {self.index_name or f"{self.label}_index"} FOR (n:{self.label}) 
-        ON ({properties_part})"""
+    def statement(self) -> Statement:
+        index_name = name(self.index_name or f"{self.label}_index")
+        properties = ", ".join(f"n.{name(property)}" for property in self.properties)
+        return Statement(
+            (
+                Raw(
+                    f"CREATE INDEX {index_name} FOR {node_pattern('n', self.label)}\n"
+                    f"ON ({properties})"
+                ),
+            )
+        )
 
 
 @dataclass(frozen=True)
@@ -205,5 +273,139 @@ class DropIndex(Query):
     index_name: str
 
     @property
-    def cypher(self) -> str:
-        return f"""DROP INDEX {self.index_name}"""
+    def statement(self) -> Statement:
+        return Statement((Raw(f"DROP INDEX {name(self.index_name)}"),))
+
+
+@dataclass(frozen=True)
+class AvailableProcessors(Query):
+    @property
+    def statement(self) -> Statement:
+        return Statement(
+            (
+                Call("dbms.queryJmx", ("java.lang:type=OperatingSystem",)),
+                Yield(("attributes",)),
+                Return(("attributes.AvailableProcessors.value AS processors",)),
+            )
+        )
+
+    @property
+    def access_mode(self) -> AccessMode:
+        return AccessMode.read
+
+    def run(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> int:
+        return super().run(log, timeout, tag)[0]["processors"]
+
+
+@dataclass(frozen=True)
+class ShowIndexes(Query):
+    @property
+    def statement(self) -> Statement:
+        columns = ("name", "labelsOrTypes", "properties", "state", "populationPercent")
+        return Statement(
+            (
+                Raw("SHOW INDEXES"),
+                Yield(
+                    columns + ("entityType",),
+                    predicates=(Predicate("entityType = 'NODE'", ("entityType",)),),
+                ),
+                Return(columns),
+            )
+        )
+
+    @property
+    def access_mode(self) -> AccessMode:
+        return AccessMode.read
+
+
+@dataclass(frozen=True)
+class ListTaggedTransactions(Query):
+    """
+    Transactions issued by py2gds on every member of the connection. It lists all of them when tag isn't set.
+
+    """
+
+    tag: Optional[str] = None
+
+    @property
+    def statement(self) -> Statement:
+        return Statement(
+            (
+                Call("dbms.listTransactions"),
+                Yield(
+                    (
+                        "transactionId",
+                        "metaData",
+                        "currentQuery",
+                        "status",
+                        "elapsedTimeMillis",
+                    ),
+                    predicates=(self.tag_predicate,),
+                ),
+                Return(
+                    (
+                        "transactionId",
+                        f"metaData.{TAG_KEY} AS tag",
+                        "metaData.query AS query",
+                        "currentQuery",
+                        "status",
+                        "elapsedTimeMillis",
+                    )
+                ),
+            )
+        )
+
+    @property
+    def tag_predicate(self) -> Predicate:
+        if self.tag is None:
+            return Predicate(f"metaData.{TAG_KEY} IS NOT NULL", ("metaData",))
+        return Predicate(f"metaData.{TAG_KEY} = $tag", ("metaData",))
+
+    @property
+    def access_mode(self) -> AccessMode:
+        return AccessMode.read
+
+    @property
+    def parameters(self) -> Optional[Dict[str, Any]]:
+        return {"tag": self.tag}
+
+    def metadata(self, tag: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        return None
+
+    def run(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        return self.run_on_members(log, timeout)
+
+
+@dataclass(frozen=True)
+class KillTaggedTransactions(ListTaggedTransactions):
+    """
+    It terminates the transactions issued by py2gds on every member of the connection, or only the ones
+    tagged with tag when it is set.
+
+    """
+
+    @property
+    def statement(self) -> Statement:
+        return Statement(
+            (
+                Call("dbms.listTransactions"),
+                Yield(("transactionId", "metaData"), predicates=(self.tag_predicate,)),
+                Call("dbms.killTransaction", (Expression("transactionId"),)),
+                Yield(("message",)),
+                Return(("transactionId", f"metaData.{TAG_KEY} AS tag", "message")),
+            )
+        )
+
+    @property
+    def access_mode(self) -> AccessMode:
+        return AccessMode.write
@@ -1,9 +1,68 @@
+import asyncio
 import logging
-from abc import abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from uuid import uuid4
 
-from py2gds.connection import Connection
+from py2gds.connection import Connection, AccessMode
+from py2gds.cypher import Statement
+
+TAG_KEY = "py2gds"
+QUERIES_EXECUTOR = ThreadPoolExecutor(thread_name_prefix="py2gds-query")
+
+
+def new_tag() -> str:
+    return uuid4().hex
+
+
+def kill(connection: Connection, tag: str, log: bool = True) -> List[Dict[str, Any]]:
+    """
+    It terminates the server transactions tagged with tag on every member of the connection.
+
+    """
+    from py2gds.queries import KillTaggedTransactions
+
+    return KillTaggedTransactions(connection, tag).run(log)
+
+
+async def run_cancellable(
+    connection: Connection, tag: str, function: Callable[[], Any], log: bool = True
+) -> Any:
+    """
+    It runs function in a worker thread. If the awaiting task is cancelled, the server transactions tagged
+    with tag are killed too, so the work doesn't keep running after the client stopped waiting for it.
+
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(QUERIES_EXECUTOR, function)
+    except asyncio.CancelledError:
+        await loop.run_in_executor(QUERIES_EXECUTOR, kill, connection, tag, log)
+        raise
+
+
+@dataclass(frozen=True)
+class RunningQuery:
+    """
+    Handle of a query running in the background. Cancelling it kills its server transactions.
+
+    """
+
+    connection: Connection
+    tag: str
+    future: Future
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        return self.future.result(timeout)
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def cancel(self, log: bool = True) -> List[Dict[str, Any]]:
+        self.future.cancel()
+        return kill(self.connection, self.tag, log)
 
 
 @dataclass(frozen=True)
@@ -11,11 +70,126 @@ class Query:
     connection: Connection
 
     @property
-    @abstractmethod
-    def cypher(self) -> str:
+    def statement(self) -> Statement:
         raise NotImplementedError
 
-    def run(self, log: bool = True) -> Any:
+    @property
+    def cacheable(self) -> bool:
+        """
+        Whether the rendered Cypher can be kept for the lifetime of the query. It can't when it embeds state
+        that changes between executions, e.g. the current generation of a refreshable projection.
+
+        """
+        return True
+
+    @property
+    def cypher(self) -> str:
+        """
+        The statement is optimized and rendered once per query when it's cacheable, queries are immutable.
+
+        """
+        cypher = self.__dict__.get("_cypher")
+        if cypher is None:
+            cypher = self.statement.optimize().render()
+            if self.cacheable:
+                object.__setattr__(self, "_cypher", cypher)
+        return cypher
+
+    @property
+    def access_mode(self) -> AccessMode:
+        return AccessMode.write
+
+    @property
+    def parameters(self) -> Optional[Dict[str, Any]]:
+        return None
+
+    def metadata(self, tag: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Transaction metadata. The tag is what ListTaggedTransactions and KillTaggedTransactions look for.
+
+        """
+        return {TAG_KEY: tag or new_tag(), "query": type(self).__name__}
+
+    def run(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> Any:
+        cypher = self.cypher
+        if log:
+            logging.info(f"Running query:\n {cypher}")
+        return self.connection.execute(
+            cypher,
+            self.access_mode,
+            self.parameters,
+            timeout,
+            self.metadata(tag),
+        )
+
+    def stream(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> Iterator[Any]:
+        """
+        Same as run, but results are yielded as they are received instead of being returned at the end.
+
+        """
+        cypher = self.cypher
         if log:
-            logging.info(f"Running query:\n {self.cypher}")
-        return self.connection.execute(self.cypher)
+            logging.info(f"Running query:\n {cypher}")
+        yield from self.connection.stream(
+            cypher,
+            self.access_mode,
+            self.parameters,
+            timeout,
+            self.metadata(tag),
+        )
+
+    def run_on_members(
+        self, log: bool = True, timeout: Optional[float] = None
+    ) -> List[Any]:
+        """
+        It runs the query on every member of the connection and chains their results.
+
+        """
+        cypher = self.cypher
+        if log:
+            logging.info(f"Running query:\n {cypher}")
+        return [
+            result
+            for member in self.connection.members
+            for result in member.execute(
+                cypher,
+                self.access_mode,
+                self.parameters,
+                timeout,
+                self.metadata(),
+            )
+        ]
+
+    async def run_async(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> Any:
+        tag = tag or new_tag()
+        return await run_cancellable(
+            self.connection, tag, partial(self.run, log, timeout, tag), log
+        )
+
+    def start(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> RunningQuery:
+        tag = tag or new_tag()
+        return RunningQuery(
+            self.connection,
+            tag,
+            QUERIES_EXECUTOR.submit(self.run, log, timeout, tag),
+        )
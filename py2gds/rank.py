@@ -1,11 +1,43 @@
 from abc import abstractmethod
-from dataclasses import dataclass
-from typing import Optional, List, Dict, Any, Iterable, Tuple
+from dataclasses import dataclass, replace
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
 
 from py2gds.algorithm import Algorithm, AlgorithmOperation, AlgorithmConfiguration
-from py2gds.exceptions import NeededPropertyNameNotSpecified
+from py2gds.concurrency import Concurrency
+from py2gds.connection import AccessMode
+from py2gds.exceptions import IncompatibleRanks, NeededPropertyNameNotSpecified
+from py2gds.cypher import (
+    Call,
+    Clause,
+    Expression,
+    Limit,
+    Match,
+    OrderBy,
+    Predicate,
+    Return,
+    Skip,
+    Statement,
+    Unwind,
+    Where,
+    With,
+    Yield,
+    alias,
+    map_literal,
+    name,
+    node_pattern,
+)
 from py2gds.projection import Projection
-from py2gds.utils import match_clause
+from py2gds.query import Query
+
+WRITE_ARTICLE_RANK_ITEMS = (
+    "nodes",
+    "iterations",
+    "createMillis",
+    "computeMillis",
+    "writeMillis",
+    "dampingFactor",
+    "writeProperty",
+)
 
 
 @dataclass(frozen=True)
@@ -13,28 +45,55 @@ class RankConfiguration(AlgorithmConfiguration):
     max_iterations: int = 20
     damping_factor: float = 0.80
     write_property: Optional[str] = None
+    concurrency: Optional[int] = None
+    write_concurrency: Optional[int] = None
+    relationship_weight_property: Optional[str] = None
+    node_labels: Optional[Tuple[str, ...]] = None
+    relationship_types: Optional[Tuple[str, ...]] = None
+    job_id: Optional[str] = None
 
     @property
-    def match_lines(self):
-        return ""
+    def match_clauses(self) -> Tuple[Clause, ...]:
+        return ()
 
     @property
     def source_nodes(self) -> str:
         source_nodes = ""
         return f"[{source_nodes}]"
 
-    def __str__(self):
-        inner_lines = [
-            f"maxIterations: {self.max_iterations}",
-            f"dampingFactor: {self.damping_factor}",
-        ]
+    @property
+    def items(self) -> Dict[str, Any]:
+        items: Dict[str, Any] = {
+            "maxIterations": self.max_iterations,
+            "dampingFactor": self.damping_factor,
+        }
+        if self.concurrency:
+            items["concurrency"] = self.concurrency
+        if self.node_labels:
+            items["nodeLabels"] = list(self.node_labels)
+        if self.relationship_types:
+            items["relationshipTypes"] = list(self.relationship_types)
+        if self.relationship_weight_property:
+            items["relationshipWeightProperty"] = self.relationship_weight_property
         if self.write_property:
-            inner_lines.append(f"writeProperty: '{self.write_property}'")
-        inner_lines = ",\n".join(inner_lines)
+            items["writeProperty"] = self.write_property
+            if self.write_concurrency:
+                items["writeConcurrency"] = self.write_concurrency
+        if self.job_id:
+            items["jobId"] = self.job_id
+        return items
+
+    def with_defaults(self, defaults: Optional[Concurrency]) -> "RankConfiguration":
+        if not defaults:
+            return self
+        return replace(
+            self,
+            concurrency=self.concurrency or defaults.concurrency,
+            write_concurrency=self.write_concurrency or defaults.write_concurrency,
+        )
 
-        return f"""{{
-            {inner_lines}
-        }}"""
+    def __str__(self):
+        return map_literal(self.items)
 
 
 @dataclass(frozen=True)
@@ -42,40 +101,42 @@ class RankConfigurationWithFilter(RankConfiguration):
     filter_elements: Optional[List[Tuple[str, str, Dict[str, str]]]] = None
 
     @property
-    def match_lines(self):
-        return "".join(
-            [
-                match_clause(reference, label, filter)
-                for reference, label, filter in self.filter_elements
-            ]
-        )
+    def match_clauses(self) -> Tuple[Clause, ...]:
+        """
+        Every filter element collects its matches into one list before the algorithm call, so the query keeps a
+        single row and the rank runs once however many nodes match.
+
+        """
+        clauses: List[Clause] = []
+        collected_names: List[str] = []
+        for (reference, label, filter), source_nodes_name in zip(
+            self.filter_elements or (), self.source_nodes_names
+        ):
+            clauses.append(
+                Match((node_pattern(reference, label, filter),), optional=True)
+            )
+            clauses.append(
+                With((*collected_names, f"collect({reference}) AS {source_nodes_name}"))
+            )
+            collected_names.append(source_nodes_name)
+        return tuple(clauses)
 
     @property
-    def source_nodes_names(self) -> Optional[List[str]]:
-        return [filter_element[0] for filter_element in self.filter_elements]
+    def source_nodes_names(self) -> List[str]:
+        return [
+            f"{filter_element[0]}_nodes"
+            for filter_element in self.filter_elements or ()
+        ]
 
     @property
     def source_nodes(self) -> str:
-        source_nodes = ", ".join(self.source_nodes_names)
-        return f"[{source_nodes}]"
-
-    def __str__(self):
-        write_property_part = (
-            f", writeProperty: '{self.write_property}'" if self.write_property else ""
-        )
+        return " + ".join(self.source_nodes_names) or "[]"
 
-        inner_lines = ",\n".join(
-            [
-                f"maxIterations: {self.max_iterations}",
-                f"dampingFactor: {self.damping_factor}",
-                f"sourceNodes: {self.source_nodes}",
-                f"{write_property_part}",
-            ]
-        )
-
-        return f"""{{
-            {inner_lines}
-        }}"""
+    @property
+    def items(self) -> Dict[str, Any]:
+        items = list(super().items.items())
+        items.insert(2, ("sourceNodes", Expression(self.source_nodes)))
+        return dict(items)
 
 
 @dataclass(frozen=True)
@@ -89,11 +150,57 @@ class Rank(Algorithm):
     sort_by_properties: Optional[Iterable[str]] = None
     sort_descending: bool = False
     skip: Optional[int] = None
+    subgraph: bool = False
+    group_by: Optional[str] = None
+    group_limit: Optional[int] = None
+    normalize_per_group: bool = False
 
     @property
-    def additional_filter(self) -> str:
+    def additional_filter(self) -> Optional[str]:
         return self._additional_filter
 
+    @property
+    def access_mode(self) -> AccessMode:
+        """
+        GDS graphs live in the memory of the member that created them, through a write session. Ranks are
+        sent as writes too, even when they only stream, so they run on that member and not on a reader.
+
+        """
+        return AccessMode.write
+
+    @property
+    def cacheable(self) -> bool:
+        return self.projection.has_fixed_name
+
+    def run(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        with self.projection.in_use():
+            return super().run(log, timeout, tag)
+
+    def stream(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        with self.projection.in_use():
+            yield from super().stream(log, timeout, tag)
+
+    def with_job_id(self, job_id: str) -> "Rank":
+        return replace(self, configuration=replace(self.configuration, job_id=job_id))
+
+    @property
+    def column(self) -> str:
+        """
+        Name of the score column when the rank is fused with others, e.g. pageRank.
+
+        """
+        return self.function_name.split(".")[-1]
+
     @property
     @abstractmethod
     def function_name(self) -> str:
@@ -101,86 +208,159 @@ class Rank(Algorithm):
 
     @property
     @abstractmethod
-    def operation(self) -> str:
+    def operation(self) -> AlgorithmOperation:
         raise NotImplementedError
 
     @property
-    def match_lines(self) -> str:
-        return self.configuration.match_lines
+    def projected_labels(self) -> Optional[Tuple[str, ...]]:
+        """
+        Labels of the nodes the algorithm runs on, or None when the projection loads every label.
+
+        """
+        if self.configuration.node_labels:
+            return tuple(self.configuration.node_labels)
+        labels = self.projection.identity.labels
+        return None if labels == '"*"' else tuple(labels)
+
+    @property
+    def pushed_labels(self) -> Optional[Tuple[str, ...]]:
+        """
+        Label filter run by the algorithm itself through nodeLabels. Scores are then computed on the subgraph of
+        the labelled nodes, which changes them, so it's only done when subgraph is set. GDS keeps nodes with
+        any of nodeLabels while labels_filter keeps nodes with all of them, so only a single label is pushed.
+
+        """
+        labels = tuple(self.labels_filter or ())
+        projected_labels = self.projected_labels
+        if (
+            self.subgraph
+            and len(labels) == 1
+            and projected_labels
+            and labels[0] in projected_labels
+        ):
+            return labels
+        return None
+
+    @property
+    def post_filter_labels(self) -> Tuple[str, ...]:
+        """
+        Labels still checked on the streamed rows. A label is left out when every projected node has it.
+
+        """
+        pushed_labels = self.pushed_labels or self.projected_labels or ()
+        if len(pushed_labels) == 1:
+            return tuple(
+                label for label in self.labels_filter or () if label != pushed_labels[0]
+            )
+        return tuple(self.labels_filter or ())
 
     @property
-    def call_line(self) -> str:
-        return f"CALL {self.function_name}.{self.operation}('{self.projection.name}', {self.configuration})"
+    def match_clauses(self) -> Tuple[Clause, ...]:
+        return self.configuration.match_clauses
 
     @property
-    def yield_line(self) -> str:
-        return "YIELD nodeId, score"
+    def call_clause(self) -> Call:
+        configuration = self.configuration.with_defaults(self.connection.concurrency)
+        if self.pushed_labels:
+            configuration = replace(configuration, node_labels=self.pushed_labels)
+        return Call(
+            f"{self.function_name}.{self.operation.value}",
+            (str(self.projection.name), Expression(str(configuration))),
+        )
 
     @property
-    def with_line(self) -> str:
-        return "WITH gds.util.asNode(nodeId) as node, score"
+    def yield_clause(self) -> Optional[Yield]:
+        return Yield(("nodeId", "score"))
 
     @property
-    def additional_operation(self) -> str:
-        return ""
+    def with_clause(self) -> Optional[Clause]:
+        """
+        Rows filtered by label look their node up by id with the label in the pattern, so nodes that don't match
+        are discarded before they are materialized.
+
+        """
+        labels = self.post_filter_labels
+        if labels:
+            pattern = "(node" + "".join(f":{name(label)}" for label in labels) + ")"
+            return Match(
+                (pattern,), predicates=(Predicate("id(node) = nodeId", ("nodeId",)),)
+            )
+        return With(("gds.util.asNode(nodeId) AS node", "score"))
 
     @property
-    def filter_line(self) -> str:
-        if self.labels_filter or self.additional_filter:
-            if not self.additional_filter:
-                labels_filter = " AND ".join(
-                    [f"node:{label}" for label in self.labels_filter]
-                )
-                filter_line = f"WHERE {labels_filter}"
-            elif not self.labels_filter:
-                filter_line = f"WHERE {self.additional_filter}"
-            else:
-                labels_filter = " AND ".join(
-                    [f"node:{label}" for label in self.labels_filter]
-                )
-                filter_line = f"WHERE {labels_filter} AND {self.additional_filter}"
-        else:
-            filter_line = ""
-        return filter_line
+    def additional_clauses(self) -> Tuple[Clause, ...]:
+        return ()
 
     @property
-    def return_line(self) -> str:
-        if self.returned_properties:
-            node_properties = ", ".join(
-                [
-                    f"node.{returned_property} as {returned_property}"
-                    for returned_property in self.returned_properties
-                ]
+    def where_clause(self) -> Optional[Where]:
+        if self.additional_filter:
+            return Where((Predicate(self.additional_filter),))
+        return Where(())
+
+    @property
+    def group_clauses(self) -> Tuple[Clause, ...]:
+        """
+        Rows are sorted by score and collected per group, and only the first group_limit of every group are
+        unwound, so the rest never leave the server. Normalized scores are divided by the top score of their
+        group.
+
+        """
+        if not self.group_by:
+            return ()
+        group = name(self.group_by)
+        top = "collect({node: node, score: score})"
+        if self.group_limit is not None:
+            top += f"[0..{self.group_limit}]"
+        score = "row.score AS score"
+        if self.normalize_per_group:
+            score = (
+                "CASE top[0].score WHEN 0 THEN 0.0 "
+                "ELSE row.score / top[0].score END AS score"
             )
-            return_line = f"RETURN {node_properties}, score"
-        else:
-            return_line = "RETURN node, score"
-        return return_line
+        return (
+            With(("node", "score")),
+            OrderBy(("score",), descending=True),
+            With((f"node.{group} AS {group}", f"{top} AS top")),
+            Unwind("top", "row"),
+            With((group, "row.node AS node", score)),
+        )
 
     @property
-    def order_line(self) -> str:
-        if self.sort_by_properties:
-            node_properties = ", ".join(
-                [f"{property}" for property in self.sort_by_properties]
+    def return_clause(self) -> Optional[Return]:
+        group = (name(self.group_by),) if self.group_by else ()
+        if self.group_by in set(self.returned_properties or ()):
+            group = ()
+        if self.returned_properties:
+            return Return(
+                (
+                    *group,
+                    *(
+                        f"node.{name(returned_property)} AS {name(returned_property)}"
+                        for returned_property in self.returned_properties
+                    ),
+                    "score",
+                )
             )
-            descending_part = "DESC" if self.sort_descending else ""
-            return f"ORDER BY {node_properties} {descending_part}"
-        return ""
+        return Return((*group, "node", "score"))
+
+    @property
+    def order_clause(self) -> Optional[OrderBy]:
+        return OrderBy(tuple(self.sort_by_properties or ()), self.sort_descending)
 
     @property
-    def limit_line(self) -> str:
-        return f"LIMIT {self.limit}" if self.limit else ""
+    def limit_clause(self) -> Optional[Limit]:
+        return Limit(self.limit or None)
 
     @property
-    def skip_line(self) -> str:
-        return f"SKIP {self.skip}" if self.skip else ""
+    def skip_clause(self) -> Optional[Skip]:
+        return Skip(self.skip)
 
 
 @dataclass(frozen=True)
 class PageRank(Rank):
     @property
     @abstractmethod
-    def operation(self) -> str:
+    def operation(self) -> AlgorithmOperation:
         raise NotImplementedError
 
     @property
@@ -195,34 +375,39 @@ class WriteRank(Rank):
     def function_name(self) -> str:
         raise NotImplementedError
 
-    def run(self, log: bool = True) -> List[Dict[str, Any]]:
+    def run(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
         if not self.configuration.write_property:
             raise NeededPropertyNameNotSpecified()
-        return super().run(log)
+        return super().run(log, timeout, tag)
 
     @property
-    def with_line(self) -> str:
-        return ""
+    def with_clause(self) -> Optional[Clause]:
+        return None
 
     @property
-    def additional_operation(self) -> str:
-        return ""
+    def where_clause(self) -> Optional[Where]:
+        return None
 
     @property
-    def filter_line(self) -> str:
-        return ""
+    def group_clauses(self) -> Tuple[Clause, ...]:
+        return ()
 
     @property
-    def return_line(self) -> str:
-        return ""
+    def return_clause(self) -> Optional[Return]:
+        return None
 
     @property
-    def order_line(self) -> str:
-        return ""
+    def order_clause(self) -> Optional[OrderBy]:
+        return None
 
     @property
-    def limit_line(self) -> str:
-        return ""
+    def limit_clause(self) -> Optional[Limit]:
+        return None
 
 
 @dataclass(frozen=True)
@@ -239,19 +424,19 @@ class WritePageRank(PageRank, WriteRank):
         return AlgorithmOperation.write
 
     @property
-    def yield_line(self) -> str:
-        return "YIELD nodePropertiesWritten AS writtenProperties, ranIterations"
+    def yield_clause(self) -> Optional[Yield]:
+        return Yield(("nodePropertiesWritten AS writtenProperties", "ranIterations"))
 
     @property
-    def return_line(self) -> str:
-        return "RETURN writtenProperties, ranIterations"
+    def return_clause(self) -> Optional[Return]:
+        return Return(("writtenProperties", "ranIterations"))
 
 
 @dataclass(frozen=True)
 class ArticleRank(Rank):
     @property
     @abstractmethod
-    def operation(self) -> str:
+    def operation(self) -> AlgorithmOperation:
         raise NotImplementedError
 
     @property
@@ -273,9 +458,180 @@ class WriteArticleRank(ArticleRank, WriteRank):
         return AlgorithmOperation.write
 
     @property
-    def yield_line(self) -> str:
-        return "YIELD nodes, iterations, createMillis, computeMillis, writeMillis, dampingFactor, writeProperty"
+    def yield_clause(self) -> Optional[Yield]:
+        return Yield(WRITE_ARTICLE_RANK_ITEMS)
+
+    @property
+    def return_clause(self) -> Optional[Return]:
+        return Return(WRITE_ARTICLE_RANK_ITEMS)
+
+
+@dataclass(frozen=True)
+class FusedRank(Query):
+    """
+    Several ranks computed on the same projection by a single query that chains their procedure calls, so
+    their results are joined in the server and transferred once.
+
+    """
+
+    ranks: Tuple[Rank, ...]
+
+    def __post_init__(self):
+        first = self.ranks[0]
+        for rank in self.ranks[1:]:
+            if rank.projection.name != first.projection.name:
+                raise IncompatibleRanks("Fused ranks must use the same projection")
+            if rank.configuration.node_labels != first.configuration.node_labels:
+                raise IncompatibleRanks("Fused ranks must run on the same node labels")
+        columns = [rank.column for rank in self.ranks]
+        if len(set(columns)) != len(columns):
+            raise IncompatibleRanks(f"Ranks are repeated: {', '.join(columns)}")
+
+    @property
+    def projection(self) -> Projection:
+        return self.ranks[0].projection
+
+    @property
+    def cacheable(self) -> bool:
+        return self.projection.has_fixed_name
+
+    @property
+    def source_nodes(self) -> Tuple[str, ...]:
+        """
+        Variables bound by the filter matches, which every call needs as sourceNodes.
+
+        """
+        match_clauses = self.ranks[0].match_clauses
+        if not match_clauses or match_clauses[-1].bound is None:
+            return ()
+        return match_clauses[-1].bound
+
+    def run(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        with self.projection.in_use():
+            return super().run(log, timeout, tag)
+
+    def stream(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        with self.projection.in_use():
+            yield from super().stream(log, timeout, tag)
+
+    def with_job_id(self, job_id: str) -> "FusedRank":
+        ranks = tuple(rank.with_job_id(job_id) for rank in self.ranks)
+        return replace(self, ranks=ranks)
+
+
+@dataclass(frozen=True)
+class StreamFusedRank(FusedRank):
+    """
+    The scores of every call are collected in the server before any row is returned, even with a limit: a
+    projection of N nodes and k ranks holds k + 1 lists of N values in the memory of the transaction, bounded by
+    dbms.memory.transaction.max. Ranks of large projections should be written with WriteFusedRank and read
+    from the written properties instead.
+
+    """
+
+    limit: Optional[int] = None
+    returned_properties: Optional[Iterable[str]] = None
+    sort_by_properties: Optional[Iterable[str]] = None
+    sort_descending: bool = False
+    skip: Optional[int] = None
 
     @property
-    def return_line(self) -> str:
-        return "RETURN nodes, iterations, createMillis, computeMillis, writeMillis, dampingFactor, writeProperty"
+    def statement(self) -> Statement:
+        """
+        Every call is collected sorted by node id before the next one runs. Ranks on the same projection and
+        labels score the same nodes, so the lists line up and rows are joined by position.
+
+        """
+        clauses = list(self.ranks[0].match_clauses)
+        carried = self.source_nodes
+        for index, rank in enumerate(self.ranks):
+            node_ids = ("collect(nodeId) AS nodeIds",) if index == 0 else ()
+            clauses += [
+                rank.call_clause,
+                Yield(("nodeId", "score")),
+                With((*carried, "nodeId", "score")),
+                OrderBy(("nodeId",)),
+                With((*carried, *node_ids, f"collect(score) AS {rank.column}")),
+            ]
+            if index == 0:
+                carried += ("nodeIds",)
+            carried += (rank.column,)
+
+        columns = tuple(rank.column for rank in self.ranks)
+        scores = tuple(f"{column}[i] AS {column}" for column in columns)
+        clauses.append(Unwind("range(0, size(nodeIds) - 1)", "i"))
+        labels = self.ranks[0].post_filter_labels
+        if labels:
+            pattern = "(node" + "".join(f":{name(label)}" for label in labels) + ")"
+            clauses += [
+                Match((pattern,), predicates=(Predicate("id(node) = nodeIds[i]"),)),
+                With(("node", *scores)),
+            ]
+        else:
+            clauses.append(With(("gds.util.asNode(nodeIds[i]) AS node", *scores)))
+        clauses += [
+            self.return_clause(columns),
+            OrderBy(tuple(self.sort_by_properties or ()), self.sort_descending),
+            Skip(self.skip),
+            Limit(self.limit or None),
+        ]
+        return Statement(tuple(clauses))
+
+    def return_clause(self, columns: Tuple[str, ...]) -> Return:
+        if self.returned_properties:
+            return Return(
+                (
+                    *(
+                        f"node.{name(returned_property)} AS {name(returned_property)}"
+                        for returned_property in self.returned_properties
+                    ),
+                    *columns,
+                )
+            )
+        return Return(("node", *columns))
+
+
+@dataclass(frozen=True)
+class WriteFusedRank(FusedRank):
+    """
+    Every call writes its own property, set in its configuration. Each call yields a single row, so the next
+    call runs once.
+
+    """
+
+    def run(
+        self,
+        log: bool = True,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        write_properties = [rank.configuration.write_property for rank in self.ranks]
+        if not all(write_properties):
+            raise NeededPropertyNameNotSpecified()
+        if len(set(write_properties)) != len(write_properties):
+            raise IncompatibleRanks("Fused ranks must write different properties")
+        return super().run(log, timeout, tag)
+
+    @property
+    def statement(self) -> Statement:
+        clauses = list(self.ranks[0].match_clauses)
+        items = []
+        for rank in self.ranks:
+            rank_items = (
+                f"computeMillis AS {rank.column}ComputeMillis",
+                f"writeMillis AS {rank.column}WriteMillis",
+            )
+            clauses += [rank.call_clause, Yield(rank_items)]
+            items += [alias(item) for item in rank_items]
+        clauses.append(Return(tuple(items)))
+        return Statement(tuple(clauses))
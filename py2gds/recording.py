@@ -0,0 +1,181 @@
+import gzip
+import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from itertools import cycle
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple, Union
+
+from py2gds.concurrency import Concurrency
+from py2gds.connection import AccessMode, Connection, query_key
+from py2gds.exceptions import RecordingNotFound
+
+
+@dataclass(frozen=True)
+class Recording:
+    """
+    Execution of a query. round_trip is the time the client waited for its results, so it includes the network
+    and the driver besides the server time.
+
+    """
+
+    query: str
+    access_mode: AccessMode
+    parameters: Optional[Dict[str, Any]]
+    results: Any
+    round_trip: float
+
+    @classmethod
+    def from_line(cls, line: str) -> "Recording":
+        record = json.loads(line)
+        return cls(
+            record["query"],
+            AccessMode(record["access_mode"]),
+            record["parameters"],
+            record["results"],
+            record["round_trip"],
+        )
+
+    @property
+    def key(self) -> Tuple[str, AccessMode, str]:
+        return query_key(self.query, self.access_mode, self.parameters)
+
+    def to_line(self) -> str:
+        record = {
+            "query": self.query,
+            "access_mode": self.access_mode.value,
+            "parameters": self.parameters,
+            "results": self.results,
+            "round_trip": round(self.round_trip, 6),
+        }
+        return json.dumps(record, separators=(",", ":"), default=str) + "\n"
+
+
+def read_recordings(path: Union[str, Path]) -> Iterator[Recording]:
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield Recording.from_line(line)
+
+
+@dataclass(frozen=True)
+class RecordingConnection(Connection):
+    """
+    It runs the queries through connection and appends every execution, with its parameters, results and
+    round trip time, to a gzipped JSON lines file. Executions that fail aren't recorded.
+
+    """
+
+    connection: Connection
+    path: Union[str, Path]
+    _file: Optional[IO] = field(default=None, init=False, repr=False, compare=False)
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    def __enter__(self) -> "RecordingConnection":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def concurrency(self) -> Optional[Concurrency]:
+        return self.connection.concurrency
+
+    @property
+    def members(self) -> Tuple[Connection, ...]:
+        return self.connection.members
+
+    def execute(
+        self,
+        query: str,
+        access_mode: AccessMode = AccessMode.write,
+        parameters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        start = time.perf_counter()
+        results = self.connection.execute(
+            query, access_mode, parameters, timeout, metadata
+        )
+        round_trip = time.perf_counter() - start
+        self.record(Recording(query, access_mode, parameters, results, round_trip))
+        return results
+
+    def explain(
+        self, query: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        return self.connection.explain(query, parameters)
+
+    def record(self, recording: Recording):
+        line = recording.to_line()
+        with self._lock:
+            file = self._file
+            if not file:
+                file = gzip.open(self.path, "at", encoding="utf-8")
+                object.__setattr__(self, "_file", file)
+            file.write(line)
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                object.__setattr__(self, "_file", None)
+
+
+@dataclass(frozen=True)
+class ReplayConnection(Connection):
+    """
+    It answers queries with recorded results, without a database. Every execution waits for the recorded
+    round trip time multiplied by latency_scale, so 0 replays as fast as possible. When a query was recorded several
+    times its results are served in the recorded order, starting over when they run out. It stands for a single
+    member, so queries that run on every member are answered once per run.
+
+    """
+
+    recordings: Dict[Tuple[str, AccessMode, str], List[Recording]]
+    latency_scale: float = 1.0
+    _cursors: Dict[Tuple[str, AccessMode, str], Iterator[Recording]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    @classmethod
+    def load(
+        cls, path: Union[str, Path], latency_scale: float = 1.0
+    ) -> "ReplayConnection":
+        recordings = defaultdict(list)
+        for recording in read_recordings(path):
+            recordings[recording.key].append(recording)
+        return cls(dict(recordings), latency_scale)
+
+    def __len__(self):
+        return sum(len(recordings) for recordings in self.recordings.values())
+
+    def execute(
+        self,
+        query: str,
+        access_mode: AccessMode = AccessMode.write,
+        parameters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        recording = self.next_recording(query, access_mode, parameters)
+        if self.latency_scale:
+            time.sleep(recording.round_trip * self.latency_scale)
+        return recording.results
+
+    def next_recording(
+        self,
+        query: str,
+        access_mode: AccessMode,
+        parameters: Optional[Dict[str, Any]],
+    ) -> Recording:
+        key = query_key(query, access_mode, parameters)
+        if key not in self.recordings:
+            raise RecordingNotFound(f"Query wasn't recorded:\n {query}")
+        with self._lock:
+            if key not in self._cursors:
+                self._cursors[key] = cycle(self.recordings[key])
+            return next(self._cursors[key])
@@ -0,0 +1,239 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from py2gds.dsl import QueryBuilder
+from py2gds.exceptions import InvalidSchedule
+from py2gds.projection import Projection
+
+
+@dataclass(frozen=True)
+class Job:
+    name: str
+    query: QueryBuilder
+    depends_on: Tuple[str, ...] = ()
+
+    @property
+    def projection(self) -> Projection:
+        return self.query.projection
+
+
+@dataclass(frozen=True)
+class JobResult:
+    """
+    Outcome of a job. A job whose dependencies failed isn't run: it's skipped and has no results.
+
+    """
+
+    name: str
+    results: Any = None
+    error: Optional[BaseException] = None
+    skipped: bool = False
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None and not self.skipped
+
+
+@dataclass
+class _ProjectionState:
+    projection: Projection
+    pending: int
+    creation: Optional[Future] = None
+    created: bool = False
+
+
+@dataclass
+class JobScheduler:
+    """
+    It runs a batch of rank jobs grouped by projection. Every projection is created once, before its first
+    job, and dropped as soon as its last job finishes, so only max_projections are held in memory at a time.
+    Jobs run after the jobs they depend on, up to max_concurrent_jobs at once, and jobs of projections that
+    are already loaded go first. Projections that existed before the batch are never dropped.
+
+    """
+
+    max_concurrent_jobs: int = 4
+    max_projections: int = 2
+    drop_projections: bool = True
+    log: bool = True
+    _states: Dict[str, _ProjectionState] = field(default_factory=dict, repr=False)
+
+    def run(self, jobs: Iterable[Job]) -> Dict[str, JobResult]:
+        by_name = {job.name: job for job in jobs}
+        self.validate(by_name)
+        self._states = {}
+        for job in by_name.values():
+            state = self._states.setdefault(
+                job.projection.name, _ProjectionState(job.projection, 0)
+            )
+            state.pending += 1
+
+        results: Dict[str, JobResult] = {}
+        running: Dict[Future, str] = {}
+        with ThreadPoolExecutor(
+            self.max_concurrent_jobs, thread_name_prefix="py2gds-scheduler"
+        ) as executor:
+            while len(results) < len(by_name):
+                self._fail_jobs_of_failed_creations(
+                    by_name, results, set(running.values())
+                )
+                self._skip_failed_dependents(by_name, results)
+                self._start_creations(by_name, results, executor)
+                for job in self._ready(by_name, results, set(running.values())):
+                    running[executor.submit(job.query.run, self.log)] = job.name
+                creations = [
+                    state.creation
+                    for state in self._states.values()
+                    if state.creation and not state.creation.done()
+                ]
+                if not running and not creations:
+                    if len(results) < len(by_name):
+                        self._start_creations(by_name, results, executor, force=True)
+                    continue
+                done, _ = wait([*running, *creations], return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in running:
+                        name = running.pop(future)
+                        results[name] = self._result(name, future)
+                        self._finish(by_name[name])
+        return results
+
+    @staticmethod
+    def validate(jobs: Dict[str, Job]):
+        for job in jobs.values():
+            missing = ", ".join(sorted(set(job.depends_on) - set(jobs)))
+            if missing:
+                raise InvalidSchedule(
+                    f"Job {job.name} depends on unknown jobs: {missing}"
+                )
+
+        visited: Set[str] = set()
+        visiting: Set[str] = set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise InvalidSchedule(f"Job {name} depends on itself")
+            visiting.add(name)
+            for dependency in jobs[name].depends_on:
+                visit(dependency)
+            visiting.remove(name)
+            visited.add(name)
+
+        for name in jobs:
+            visit(name)
+
+    def _ready(
+        self, jobs: Dict[str, Job], results: Dict[str, JobResult], running: Set[str]
+    ) -> List[Job]:
+        """
+        Jobs whose dependencies succeeded and whose projection is loaded, up to the free workers.
+
+        """
+        free = self.max_concurrent_jobs - len(running)
+        ready: List[Job] = []
+        for job in jobs.values():
+            if len(ready) >= free:
+                break
+            if job.name in results or job.name in running:
+                continue
+            if not all(
+                dependency in results and results[dependency].succeeded
+                for dependency in job.depends_on
+            ):
+                continue
+            creation = self._states[job.projection.name].creation
+            if creation and creation.done() and not creation.exception():
+                ready.append(job)
+        return ready
+
+    def _fail_jobs_of_failed_creations(
+        self, jobs: Dict[str, Job], results: Dict[str, JobResult], running: Set[str]
+    ):
+        """
+        Jobs whose projection couldn't be created fail with the creation error.
+
+        """
+        for job in jobs.values():
+            if job.name in results or job.name in running:
+                continue
+            creation = self._states[job.projection.name].creation
+            if creation and creation.done() and creation.exception():
+                error = creation.exception()
+                logging.error(f"Job {job.name} failed: {error}")
+                results[job.name] = JobResult(job.name, error=error)
+                self._finish(job)
+
+    def _start_creations(
+        self,
+        jobs: Dict[str, Job],
+        results: Dict[str, JobResult],
+        executor: ThreadPoolExecutor,
+        force: bool = False,
+    ):
+        """
+        It starts loading the projections of runnable jobs, while fewer than max_projections are loaded. When
+        every loaded projection waits for jobs of other projections, force loads one more.
+
+        """
+        loaded = sum(
+            1
+            for state in self._states.values()
+            if state.creation and state.pending > 0
+        )
+        limit = loaded + 1 if force else self.max_projections
+        for job in jobs.values():
+            if loaded >= limit:
+                return
+            if job.name in results or not all(
+                dependency in results for dependency in job.depends_on
+            ):
+                continue
+            state = self._states[job.projection.name]
+            if state.creation is None:
+                state.creation = executor.submit(self._create, job, state)
+                loaded += 1
+
+    def _create(self, job: Job, state: _ProjectionState):
+        state.created = job.query.create_projection(self.log)
+
+    def _skip_failed_dependents(
+        self, jobs: Dict[str, Job], results: Dict[str, JobResult]
+    ):
+        skipped = True
+        while skipped:
+            skipped = False
+            for job in jobs.values():
+                if job.name in results:
+                    continue
+                if any(
+                    dependency in results and not results[dependency].succeeded
+                    for dependency in job.depends_on
+                ):
+                    results[job.name] = JobResult(job.name, skipped=True)
+                    self._finish(job)
+                    skipped = True
+
+    def _result(self, name: str, future: Future) -> JobResult:
+        error = future.exception()
+        if error:
+            logging.error(f"Job {name} failed: {error}")
+            return JobResult(name, error=error)
+        return JobResult(name, future.result())
+
+    def _finish(self, job: Job):
+        state = self._states[job.projection.name]
+        state.pending -= 1
+        if state.pending == 0 and state.creation:
+            self._drop(state)
+
+    def _drop(self, state: _ProjectionState):
+        if not self.drop_projections or not state.created:
+            return
+        try:
+            state.projection.delete(self.log)
+        except Exception as error:
+            logging.warning(f"Projection {state.projection.name} not dropped: {error}")
@@ -0,0 +1,64 @@
+import asyncio
+from concurrent.futures import Future
+from threading import Lock
+from typing import Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    It coalesces concurrent calls with the same key: the first caller runs the function and the others, from
+    other threads or asyncio tasks, wait for it and share its result or exception. Once the call finishes,
+    the next call with that key runs again.
+
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, function: Callable[[], T]) -> T:
+        future, is_leader = self._join(key)
+        if is_leader:
+            self._run(key, future, function)
+        return future.result()
+
+    async def do_async(self, key: Hashable, function: Callable[[], T]) -> T:
+        """
+        Like do, but waiting without blocking the event loop. The function runs in the default executor, and
+        cancelling a waiting task doesn't cancel the shared call.
+
+        """
+        future, is_leader = self._join(key)
+        if is_leader:
+            asyncio.get_running_loop().run_in_executor(
+                None, self._run, key, future, function
+            )
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            if future := self._calls.get(key):
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _run(self, key: Hashable, future: Future, function: Callable[[], T]):
+        try:
+            result = function()
+        except BaseException as error:
+            self._finish(key)
+            future.set_exception(error)
+        else:
+            self._finish(key)
+            future.set_result(result)
+
+    def _finish(self, key: Hashable):
+        with self._lock:
+            self._calls.pop(key, None)
@@ -1,5 +1,8 @@
+import re
 from typing import Dict, Any, Callable
 
+QUOTED_PARTS = re.compile(r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`[^`]*`)""")
+
 
 def to_json_without_quotes(dictionary: Dict[Any, Any]):
     strings = [
@@ -9,9 +12,30 @@ def to_json_without_quotes(dictionary: Dict[Any, Any]):
     return f"{{{', '.join(strings)}}}"
 
 
-def match_clause(reference: str, label: str, filters: Dict[str, Any]):
+def match_clause(
+    reference: str, label: str, filters: Dict[str, Any], optional: bool = False
+):
     filter_string = to_json_without_quotes(filters)
-    return f"MATCH ({reference}: {label} {filter_string})\n"
+    match_verb = "OPTIONAL MATCH" if optional else "MATCH"
+    return f"{match_verb} ({reference}: {label} {filter_string})\n"
+
+
+def normalize_cypher(query: str) -> str:
+    """
+    It collapses the whitespace of a query outside of strings and quoted names, so equivalent queries compare
+    equal.
+
+    """
+    parts = QUOTED_PARTS.split(query)
+    return "".join(
+        part if index % 2 else re.sub(r"\s+", " ", part)
+        for index, part in enumerate(parts)
+    ).strip()
+
+
+def quote_identifier(name: str) -> str:
+    escaped_name = name.replace("`", "``")
+    return f"`{escaped_name}`"
 
 
 def builder(func: Callable) -> Callable:
@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Dict, Iterable, Optional, Union
+
+from py2gds.collection import Collection
+from py2gds.projection import Projection
+
+
+@dataclass(frozen=True)
+class WarmUpProgress:
+    total: int
+    ready: int
+    failed: int
+
+    @property
+    def pending(self) -> int:
+        return self.total - self.ready - self.failed
+
+    @property
+    def done(self) -> bool:
+        return self.pending == 0
+
+
+@dataclass
+class ProjectionWarmUp:
+    """
+    It builds projections in a background thread pool, e.g. at startup, so the first queries don't pay the
+    projection creation. Every projection gets a readiness future, and queries using the warm-up wait on an
+    in-flight build instead of starting a duplicate one.
+
+    The wait is bounded by its own timeout, independent of the transaction timeout of the queries.
+
+    """
+
+    max_workers: int = 4
+    read_concurrency: Optional[int] = None
+    wait_timeout: Optional[float] = None
+    _futures: Dict[str, Future] = field(default_factory=dict, repr=False)
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+    _executor: ThreadPoolExecutor = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._executor = ThreadPoolExecutor(
+            self.max_workers, thread_name_prefix="py2gds-warm-up"
+        )
+
+    def start(
+        self, projections: Union[Collection, Iterable[Projection]], log: bool = True
+    ) -> Dict[str, Future]:
+        return {
+            projection.name: self.submit(projection, log) for projection in projections
+        }
+
+    def submit(self, projection: Projection, log: bool = True) -> Future:
+        with self._lock:
+            future = self._futures.get(projection.name)
+            if not future or (future.done() and future.exception()):
+                future = self._executor.submit(self._build, projection, log)
+                self._futures[projection.name] = future
+            return future
+
+    def ready(self, projection: Projection) -> Optional[Future]:
+        with self._lock:
+            return self._futures.get(projection.name)
+
+    def wait(self, projection: Projection, timeout: Optional[float] = None) -> bool:
+        """
+        It waits until the projection is built if its build is in flight.
+
+        Args:
+            projection: Projection to wait for.
+            timeout: Maximum number of seconds to wait, wait_timeout by default.
+
+        Returns:
+            True if an in-flight build of the warm-up finished successfully while waiting. False if the projection
+            wasn't submitted, its build had already finished, failed or didn't finish in time; callers then check the
+            projection themselves, since it may have been dropped after an earlier build.
+
+        """
+        future = self.ready(projection)
+        if not future or future.done():
+            return False
+        try:
+            return (
+                future.exception(self.wait_timeout if timeout is None else timeout)
+                is None
+            )
+        except TimeoutError:
+            return False
+
+    def progress(self) -> WarmUpProgress:
+        with self._lock:
+            futures = list(self._futures.values())
+        done = [future for future in futures if future.done()]
+        failed = [future for future in done if future.exception()]
+        return WarmUpProgress(len(futures), len(done) - len(failed), len(failed))
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait)
+
+    def _build(self, projection: Projection, log: bool) -> Projection:
+        if not projection.exists(log):
+            projection.create(log, self.read_concurrency)
+        return projection
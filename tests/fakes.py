@@ -0,0 +1,41 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from py2gds.connection import Connection, AccessMode
+
+
+class FakeConnection(Connection):
+    """
+    Local stand-in for a database member. It records executed queries and answers with canned results.
+
+    """
+
+    def __init__(
+        self,
+        results: Optional[List[Any]] = None,
+        plan: Optional[Dict[str, Any]] = None,
+    ):
+        self.results = results if results is not None else []
+        self.plan = plan or {}
+        self.executed: List[Tuple[str, AccessMode]] = []
+        self.parameters: List[Optional[Dict[str, Any]]] = []
+        self.timeouts: List[Optional[float]] = []
+        self.metadata: List[Optional[Dict[str, Any]]] = []
+
+    def execute(
+        self,
+        query: str,
+        access_mode: AccessMode = AccessMode.write,
+        parameters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        self.executed.append((query, access_mode))
+        self.parameters.append(parameters)
+        self.timeouts.append(timeout)
+        self.metadata.append(metadata)
+        return self.results
+
+    def explain(
+        self, query: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        return self.plan
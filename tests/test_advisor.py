@@ -0,0 +1,62 @@
+from py2gds.advisor import IndexAdvisor, IndexRequirement
+from py2gds.queries import Node, MatchNode
+from py2gds.rank import RankConfigurationWithFilter
+from tests.fakes import FakeConnection
+
+
+def test_missing_indexes():
+    connection = FakeConnection(
+        [
+            {
+                "name": "Page_name_index",
+                "labelsOrTypes": ["Page"],
+                "properties": ["name"],
+                "state": "ONLINE",
+                "populationPercent": 100.0,
+            }
+        ]
+    )
+    advisor = IndexAdvisor(connection)
+
+    missing_indexes = advisor.missing_indexes(
+        Node("Page", {"name": "Home"}),
+        RankConfigurationWithFilter(
+            filter_elements=[("site", "Site", {"domain": "example.com"})]
+        ),
+    )
+
+    assert missing_indexes == [IndexRequirement("Site", ("domain",))]
+
+
+def test_label_scans():
+    connection = FakeConnection(
+        plan={
+            "operatorType": "ProduceResults@neo4j",
+            "children": [
+                {
+                    "operatorType": "Filter@neo4j",
+                    "children": [
+                        {
+                            "operatorType": "NodeByLabelScan@neo4j",
+                            "args": {"Details": "home:Page"},
+                        }
+                    ],
+                }
+            ],
+        }
+    )
+
+    label_scans = IndexAdvisor(connection).label_scans(
+        MatchNode(connection, Node("Page", {"name": "Home"}, "home"))
+    )
+
+    assert label_scans == ["home:Page"]
+
+
+def test_unlisted_indexes_are_not_populated():
+    advisor = IndexAdvisor(FakeConnection([]))
+
+    assert not advisor.wait_for_population(
+        ["Site_domain_index"], timeout=0, log=False
+    )
+    assert advisor.requirements(RankConfigurationWithFilter()) == []
@@ -0,0 +1,69 @@
+import pytest
+
+from py2gds.collection import Collection
+from py2gds.exceptions import ProjectionNotFound
+from tests.fakes import FakeConnection
+
+
+@pytest.fixture
+def sites_collection():
+    return Collection.create_from_projections_parameters(
+        FakeConnection(),
+        (
+            {
+                "labels": ("{site}Page",),
+                "relationships": ("{site}_{kind}_LINKS",),
+                "tags": ("{site}_{kind}",),
+                "modifiers": {
+                    "site": [f"site{index}" for index in range(200)],
+                    "kind": ["internal", "external"],
+                },
+            },
+            {"labels": ("Site",), "relationships": ("OWNS",), "tags": ("sites",)},
+        ),
+    )
+
+
+def test_get_projection_by_tag(sites_collection: Collection):
+    projection = sites_collection.get_projection_by_tag("site17_external")
+
+    assert projection.identity.labels == ("site17Page",)
+    assert projection.identity.relationships == ("site17_external_LINKS",)
+    assert sites_collection.get_projection_by_tag("site17_external") is projection
+    assert sites_collection.get_projection_by_tag("sites").identity.labels == (
+        "Site",
+    )
+
+
+def test_unknown_tag(sites_collection: Collection):
+    with pytest.raises(ProjectionNotFound):
+        sites_collection.get_projection_by_tag("site200_internal")
+
+
+def test_collection_is_lazy(sites_collection: Collection):
+    assert len(sites_collection) == 401
+    assert not sites_collection._index
+    assert len({projection.name for projection in sites_collection}) == 401
+
+
+def test_projections_include_templates(sites_collection: Collection):
+    projections = sites_collection.projections
+
+    assert len(projections) == 401
+    assert projections[-1].tags == ["sites"]
+
+
+def test_tag_without_placeholders_resolves_to_the_first_combination():
+    collection = Collection.create_from_projections_parameters(
+        FakeConnection(),
+        (
+            {
+                "labels": ("{site}Page",),
+                "relationships": ("LINKS",),
+                "tags": ("pages",),
+                "modifiers": {"site": ["a", "b"]},
+            },
+        ),
+    )
+
+    assert collection.get_projection_by_tag("pages").identity.labels == ("aPage",)
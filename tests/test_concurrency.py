@@ -0,0 +1,47 @@
+from typing import Optional
+
+from py2gds.algorithm import AlgorithmType
+from py2gds.concurrency import Concurrency
+from py2gds.dsl import Query
+from tests.fakes import FakeConnection
+
+
+class EightCoresConnection(FakeConnection):
+    """
+    It reports a server with 8 cores and applies default_concurrency to its queries.
+
+    """
+
+    def __init__(self, default_concurrency: Optional[Concurrency] = None):
+        super().__init__([{"processors": 8}])
+        self.default_concurrency = default_concurrency
+
+    @property
+    def concurrency(self) -> Optional[Concurrency]:
+        return self.default_concurrency
+
+
+def test_policies_from_server_cores():
+    connection = EightCoresConnection()
+
+    assert Concurrency.from_server(connection) == Concurrency(7, 7, 7)
+    assert Concurrency.from_server(connection, interactive=True) == Concurrency(2, 2, 2)
+    assert "dbms.queryJmx" in connection.executed[0][0]
+
+
+def test_connection_default_is_overridden_by_the_query():
+    connection = EightCoresConnection(Concurrency(2, 2, 3))
+    query = (
+        Query.using(connection)
+        .rank(algorithm=AlgorithmType.PageRank)
+        .projected_by(labels=("Page",), relationships=("LINKS",))
+        .write("score")
+    )
+
+    default_cypher = str(query)
+    set_cypher = str(query.set(concurrency=4))
+
+    assert "concurrency: 2" in default_cypher
+    assert "writeConcurrency: 3" in default_cypher
+    assert "concurrency: 4" in set_cypher
+    assert "writeConcurrency: 3" in set_cypher
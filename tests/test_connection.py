@@ -0,0 +1,154 @@
+import asyncio
+import threading
+
+import pytest
+
+from py2gds.algorithm import AlgorithmType
+from py2gds.connection import RoutingConnection, AccessMode
+from py2gds.dsl import Query
+from py2gds.projection import NativeProjection, ProjectionIdentity
+from py2gds.queries import CreateNodes, MatchNode, Node, KillTaggedTransactions
+from py2gds.rank import StreamPageRank, WritePageRank, RankConfiguration
+from tests.fakes import FakeConnection
+
+
+def test_reads_are_balanced_over_readers():
+    writer = FakeConnection()
+    readers = (FakeConnection(), FakeConnection())
+    connection = RoutingConnection(writer, readers)
+
+    for _ in range(4):
+        MatchNode(connection, Node("Page", {"name": "Home"}, "home")).run()
+
+    assert not writer.executed
+    assert len(readers[0].executed) == len(readers[1].executed) == 2
+    assert all(
+        access_mode == AccessMode.read
+        for reader in readers
+        for _, access_mode in reader.executed
+    )
+
+
+def test_stream_ranks_run_where_their_projection_is():
+    writer = FakeConnection([{"exists": False}])
+    reader = FakeConnection()
+    connection = RoutingConnection(writer, (reader,))
+
+    Query.using(connection).rank(AlgorithmType.PageRank).projected_by(
+        labels=("Page",), relationships=("LINKS",)
+    ).run(log=False)
+
+    queries = [query for query, _ in writer.executed]
+    assert "gds.graph.exists" in queries[0]
+    assert "gds.graph.create" in queries[1]
+    assert "gds.pageRank.stream" in queries[2]
+    assert not reader.executed
+
+
+def test_writes_go_to_writer():
+    writer = FakeConnection()
+    reader = FakeConnection()
+    connection = RoutingConnection(writer, (reader,))
+    projection = NativeProjection(
+        connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+    )
+
+    WritePageRank(
+        connection, projection, RankConfiguration(write_property="score")
+    ).run()
+    CreateNodes(connection, [Node("Page", {"name": "Home"})], None).run()
+    projection.create()
+    projection.delete()
+
+    assert not reader.executed
+    assert [access_mode for _, access_mode in writer.executed] == [
+        AccessMode.write
+    ] * 4
+
+
+def test_reads_fall_back_to_writer():
+    writer = FakeConnection()
+    connection = RoutingConnection(writer)
+
+    MatchNode(connection, Node("Page", {"name": "Home"}, "home")).run()
+
+    assert [access_mode for _, access_mode in writer.executed] == [AccessMode.read]
+
+
+class BlockingConnection(FakeConnection):
+    """
+    It blocks page rank calls until a kill query arrives, like a long-running job on the server.
+
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.killed = threading.Event()
+
+    def execute(
+        self, query, access_mode=None, parameters=None, timeout=None, metadata=None
+    ):
+        super().execute(query, access_mode, parameters, timeout, metadata)
+        if "dbms.killTransaction" in query:
+            self.killed.set()
+        elif "gds.pageRank" in query:
+            self.started.set()
+            self.killed.wait(5)
+        return self.results
+
+
+def test_timeout_and_tag_are_sent_with_the_query():
+    connection = FakeConnection()
+
+    MatchNode(connection, Node("Page", {"name": "Home"})).run(timeout=30, tag="ranking")
+
+    assert connection.timeouts == [30]
+    assert connection.metadata == [{"py2gds": "ranking", "query": "MatchNode"}]
+
+
+def test_kill_runs_on_every_member():
+    writer = FakeConnection()
+    readers = (FakeConnection(), FakeConnection())
+
+    KillTaggedTransactions(RoutingConnection(writer, readers), "ranking").run()
+
+    for member in (writer, *readers):
+        query, _ = member.executed[0]
+        assert "dbms.killTransaction(transactionId)" in query
+        assert member.parameters == [{"tag": "ranking"}]
+        assert member.metadata == [None]
+
+
+def test_cancelled_task_kills_its_transactions():
+    connection = BlockingConnection()
+    projection = NativeProjection(
+        connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+    )
+    rank = StreamPageRank(connection, projection, RankConfiguration())
+
+    async def cancel_rank():
+        task = asyncio.ensure_future(rank.run_async(tag="ranking"))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_rank())
+
+    assert connection.killed.is_set()
+    assert connection.parameters[-1] == {"tag": "ranking"}
+
+
+def test_running_query_can_be_cancelled():
+    connection = BlockingConnection()
+    projection = NativeProjection(
+        connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+    )
+    running = StreamPageRank(connection, projection, RankConfiguration()).start()
+    connection.started.wait(5)
+
+    running.cancel()
+
+    assert running.result(5) == []
+    assert connection.parameters[-1] == {"tag": running.tag}
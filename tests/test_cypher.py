@@ -0,0 +1,93 @@
+from py2gds.cypher import (
+    Call,
+    Limit,
+    Match,
+    OrderBy,
+    Predicate,
+    Return,
+    Statement,
+    Where,
+    With,
+    Yield,
+    map_literal,
+    node_pattern,
+)
+from py2gds.queries import CreateNode, Node
+
+
+def test_literals_and_names_are_escaped():
+    properties = {"name": "Bob's", "my key": 1}
+    assert map_literal(properties) == "{name: 'Bob\\'s', `my key`: 1}"
+    assert node_pattern("n", "Web Page") == "(n:`Web Page`)"
+
+
+def test_node_properties_are_escaped():
+    query = CreateNode(None, Node("Person", {"name": "Bob's"}, "p"))
+    assert query.cypher == "CREATE (:Person {name: 'Bob\\'s'})"
+
+
+def test_dead_clauses_are_removed():
+    statement = Statement(
+        (
+            Call("gds.pageRank.stream", ("graph", {})),
+            Yield(("nodeId", "score")),
+            With(("nodeId", "score")),
+            Where(()),
+            Return(("nodeId", "score")),
+            Limit(None),
+        )
+    )
+    assert statement.optimize().render() == (
+        "CALL gds.pageRank.stream('graph', {})\n"
+        "YIELD nodeId, score\n"
+        "RETURN nodeId, score"
+    )
+
+
+def test_predicates_are_pushed_down_to_yield():
+    statement = Statement(
+        (
+            Call("gds.pageRank.stream", ("graph",)),
+            Yield(("nodeId", "score")),
+            With(("nodeId", "score", "gds.util.asNode(nodeId) AS node")),
+            Where(
+                (
+                    Predicate("score > 0.5", ("score",)),
+                    Predicate("node:Page", ("node",)),
+                )
+            ),
+            Return(("node", "score")),
+        )
+    )
+    assert statement.optimize().render() == (
+        "CALL gds.pageRank.stream('graph')\n"
+        "YIELD nodeId, score\n"
+        "WHERE score > 0.5\n"
+        "WITH nodeId, score, gds.util.asNode(nodeId) AS node\n"
+        "WHERE node:Page\n"
+        "RETURN node, score"
+    )
+
+
+def test_predicates_are_not_pushed_through_aggregations():
+    statement = Statement(
+        (
+            Match(("(n)",)),
+            With(("n", "count(*) AS total"), (Predicate("total > 1", ("total",)),)),
+            Yield(("n",)),
+            With(("n", "collect(n) AS nodes"), (Predicate("n.x = 1", ("n",)),)),
+        )
+    )
+    assert statement.optimize().clauses == statement.clauses
+
+
+def test_with_owning_an_order_by_is_kept():
+    statement = Statement(
+        (
+            Yield(("nodeId", "score")),
+            With(("nodeId", "score")),
+            OrderBy(("score",), descending=True),
+            Return(("nodeId", "score")),
+        )
+    )
+    assert "WITH nodeId, score\nORDER BY score DESC" in statement.optimize().render()
@@ -1,3 +1,5 @@
+import pytest
+
 from py2gds.algorithm import AlgorithmType
 from py2gds.connection import Connection
 from py2gds.dsl import Query
@@ -9,6 +11,7 @@ from py2gds.rank import (
     WritePageRank,
     RankConfiguration,
 )
+from tests.fakes import FakeConnection
 
 
 def test_stream_articlerank(
@@ -207,4 +210,48 @@ def test_skip(
 
     normal_results = normal_query.run(log=True)
     skipped_results = skipped_query.run(log=True)
-    assert normal_results[3]["score"] == skipped_results[0]["score"]
\ No newline at end of file
+    assert normal_results[3]["score"] == skipped_results[0]["score"]
+
+
+def test_concurrency():
+    connection = FakeConnection()
+    query = (
+        Query.using(connection)
+        .rank(algorithm=AlgorithmType.PageRank)
+        .projected_by(labels=("Page",), relationships=("LINKS",))
+        .set(concurrency=4, write_concurrency=2)
+        .write("test_property")
+    )
+    manual_query = WritePageRank(
+        connection,
+        query.projection,
+        RankConfiguration(
+            write_property="test_property", concurrency=4, write_concurrency=2
+        ),
+    ).cypher
+
+    assert manual_query == str(query)
+    assert "concurrency: 4" in manual_query
+    assert "writeConcurrency: 2" in manual_query
+
+
+def test_fused_ranks_write_a_property_each():
+    query = (
+        Query.using(FakeConnection())
+        .rank(AlgorithmType.PageRank, AlgorithmType.ArticleRank)
+        .projected_by(labels=("Page",), relationships=("LINKS",))
+        .write("score")
+    )
+
+    cypher = str(query)
+    assert "CALL gds.pageRank.write" in cypher
+    assert "writeProperty: 'score_pagerank'" in cypher
+    assert "CALL gds.alpha.articleRank.write" in cypher
+    assert "writeProperty: 'score_articlerank'" in cypher
+
+
+def test_top_per_needs_at_least_one_row_per_group():
+    query = Query.using(FakeConnection()).rank(AlgorithmType.PageRank)
+
+    with pytest.raises(ValueError):
+        query.top_per("site", 0)
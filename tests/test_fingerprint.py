@@ -0,0 +1,102 @@
+import pytest
+
+from py2gds.algorithm import AlgorithmType
+from py2gds.dsl import Query
+from py2gds.fingerprint import GraphStatisticsQuery
+from py2gds.projection import ProjectionIdentity, RelationshipProjection
+from tests.fakes import FakeConnection
+
+
+class GraphConnection(FakeConnection):
+    """
+    It answers graph statistics with pages and links counts, and keeps stored fingerprints.
+
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.pages = 10
+        self.updated_at = 1
+        self.fingerprints = {}
+
+    def execute(
+        self, query, access_mode=None, parameters=None, timeout=None, metadata=None
+    ):
+        super().execute(query, access_mode, parameters, timeout, metadata)
+        if "AS key" in query:
+            return [
+                {"key": "nodes:Page", "value": self.pages},
+                {"key": "relationships:LINKS", "value": 20},
+                {"key": "max:Page.updatedAt", "value": self.updated_at},
+            ]
+        if "MERGE (f:Py2gdsFingerprint" in query:
+            self.fingerprints[parameters["key"]] = parameters["fingerprint"]
+        elif "Py2gdsFingerprint" in query:
+            fingerprint = self.fingerprints.get(parameters["key"])
+            return [{"fingerprint": fingerprint}] if fingerprint else []
+        if "gds.graph.exists" in query:
+            return [{"exists": True}]
+        return []
+
+    @property
+    def ranks(self) -> int:
+        return sum("gds.pageRank.write" in query for query, _ in self.executed)
+
+
+def test_statistics_are_counted_per_label_and_type():
+    identity = ProjectionIdentity(
+        labels=("Page", "Site"),
+        relationships=(RelationshipProjection("LINKS"), "LINKS"),
+    )
+    cypher = GraphStatisticsQuery(FakeConnection(), identity, "updatedAt").cypher
+
+    assert "MATCH (n:Page) RETURN 'nodes:Page' AS key, count(n) AS value" in cypher
+    assert cypher.count("()-[r:LINKS]->()") == 1
+    assert "max(n.updatedAt)" in cypher
+    assert cypher.count("UNION ALL") == 4
+
+
+def test_unchanged_rank_is_skipped():
+    connection = GraphConnection()
+    query = (
+        Query.using(connection)
+        .rank(AlgorithmType.PageRank)
+        .projected_by(labels=("Page",), relationships=("LINKS",))
+        .write("score")
+        .skip_unchanged("updatedAt")
+    )
+
+    query.run(log=False)
+    query.run(log=False)
+    assert connection.ranks == 1
+
+    connection.pages += 1
+    query.run(log=False)
+    assert connection.ranks == 2
+
+    connection.updated_at += 1
+    query.run(log=False)
+    assert connection.ranks == 3
+
+    query.run(log=False, force=True)
+    assert connection.ranks == 4
+
+
+def test_fingerprint_nodes_are_not_counted():
+    cypher = GraphStatisticsQuery(FakeConnection(), ProjectionIdentity()).cypher
+
+    assert "nodes - count(f) AS value" in cypher
+    assert "MATCH (f:Py2gdsFingerprint)" in cypher
+
+
+def test_unchanged_rank_of_every_label_is_refused():
+    query = (
+        Query.using(GraphConnection())
+        .rank(AlgorithmType.PageRank)
+        .projected_by(relationships=("LINKS",))
+        .write("score")
+        .skip_unchanged("updatedAt")
+    )
+
+    with pytest.raises(ValueError):
+        query.run(log=False)
@@ -0,0 +1,111 @@
+import pytest
+from neo4j.exceptions import TransientError
+
+from py2gds.exceptions import IngestionFailed
+from py2gds.ingestion import IngestionPipeline, NodeMapping
+from tests.fakes import FakeConnection
+
+
+class FlakyConnection(FakeConnection):
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    def execute(
+        self, query, access_mode=None, parameters=None, timeout=None, metadata=None
+    ):
+        if self.failures:
+            self.failures -= 1
+            raise TransientError("Deadlock detected")
+        return super().execute(query, access_mode, parameters, timeout, metadata)
+
+
+class InterruptedConnection(FakeConnection):
+    """
+    It writes the first batches and fails from the batch with index failing_batch on.
+
+    """
+
+    def __init__(self, failing_batch: int):
+        super().__init__()
+        self.failing_batch = failing_batch
+
+    def execute(
+        self, query, access_mode=None, parameters=None, timeout=None, metadata=None
+    ):
+        if len(self.executed) == self.failing_batch:
+            raise RuntimeError("Connection lost")
+        return super().execute(query, access_mode, parameters, timeout, metadata)
+
+
+def written_keys(connection):
+    return [row["key"] for parameters in connection.parameters for row in parameters["rows"]]
+
+
+@pytest.fixture
+def pages_csv(tmp_path):
+    path = tmp_path / "pages.csv"
+    lines = ["name,visits"] + [f"page {index},{index}" for index in range(95)]
+    path.write_text("\n".join(lines))
+    return path
+
+
+def test_ingest_csv_in_batches(pages_csv):
+    connection = FakeConnection()
+    pipeline = IngestionPipeline(
+        connection,
+        NodeMapping("Page", "name", properties={"visits": "visits"}),
+        batch_size=10,
+        workers=3,
+        max_pending_batches=2,
+    )
+
+    report = pipeline.run_file(pages_csv)
+
+    assert report.rows == 95
+    assert report.batches == 10
+    assert sorted(
+        row["key"] for parameters in connection.parameters for row in parameters["rows"]
+    ) == sorted(f"page {index}" for index in range(95))
+    assert "MERGE (n:`Page` {`name`: row.key})" in connection.executed[0][0]
+
+
+def test_transient_errors_are_retried(pages_csv):
+    pipeline = IngestionPipeline(
+        FlakyConnection(failures=2),
+        NodeMapping("Page", "name"),
+        batch_size=50,
+        workers=1,
+        retry_delay=0,
+    )
+
+    report = pipeline.run_file(pages_csv)
+
+    assert report.rows == 95
+    assert report.retries == 2
+
+
+def test_resume_from_checkpoint(pages_csv, tmp_path):
+    checkpoint_path = tmp_path / "pages.checkpoint"
+    mapping = NodeMapping("Page", "name")
+    interrupted_connection = InterruptedConnection(failing_batch=4)
+    with pytest.raises(IngestionFailed):
+        IngestionPipeline(
+            interrupted_connection,
+            mapping,
+            batch_size=10,
+            workers=1,
+            checkpoint_path=checkpoint_path,
+        ).run_file(pages_csv)
+
+    connection = FakeConnection()
+    report = IngestionPipeline(
+        connection, mapping, batch_size=10, checkpoint_path=checkpoint_path
+    ).run_file(pages_csv)
+
+    assert report.skipped_rows == 40
+    assert report.rows == 55
+    assert sorted(written_keys(interrupted_connection) + written_keys(connection)) == sorted(
+        f"page {index}" for index in range(95)
+    )
+    assert '"committed_batches": 10' in checkpoint_path.read_text()
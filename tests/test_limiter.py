@@ -0,0 +1,89 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from neo4j.exceptions import TransientError
+
+from py2gds.connection import AccessMode, RoutingConnection
+from py2gds.exceptions import CircuitOpen, ConcurrencyLimitExceeded
+from py2gds.limiter import (
+    AIMDLimit,
+    CircuitBreaker,
+    CircuitState,
+    LimitedConnection,
+    Limiter,
+)
+from tests.fakes import FakeConnection
+
+
+class OverloadedConnection(FakeConnection):
+    def execute(
+        self, query, access_mode=None, parameters=None, timeout=None, metadata=None
+    ):
+        super().execute(query, access_mode, parameters, timeout, metadata)
+        if "gds.pageRank" in query:
+            raise TransientError("Out of memory")
+        if "sleep" in query:
+            time.sleep(0.1)
+        return self.results
+
+
+def test_limit_backs_off_on_slow_queries():
+    limit = AIMDLimit(limit=10, latency_threshold=1.0)
+
+    limit.update(0.5)
+    assert 10 < limit.limit < 11
+
+    assert limit.update(2.0) == 7
+    assert limit.update(0.1, overloaded=True) == 4
+
+
+def test_limiter_bounds_in_flight_queries():
+    connection = LimitedConnection(
+        OverloadedConnection(),
+        light=Limiter(AIMDLimit(limit=2, max_limit=2), timeout=0.01),
+    )
+
+    with ThreadPoolExecutor(3) as executor:
+        futures = [
+            executor.submit(connection.execute, "CALL sleep()", AccessMode.read)
+            for _ in range(3)
+        ]
+    errors = [future.exception() for future in futures]
+
+    assert sum(isinstance(error, ConcurrencyLimitExceeded) for error in errors) == 1
+
+
+def test_breaker_sheds_heavy_and_light_queries():
+    inner_connection = OverloadedConnection()
+    connection = LimitedConnection(
+        inner_connection, breaker=CircuitBreaker(minimum_requests=2, reset_timeout=0.05)
+    )
+
+    for _ in range(2):
+        with pytest.raises(TransientError):
+            connection.execute("CALL gds.pageRank.stream('graph', {})")
+
+    assert connection.breaker.state == CircuitState.open
+    with pytest.raises(CircuitOpen):
+        connection.execute("MATCH (n) RETURN n", AccessMode.read)
+    connection.execute("CALL dbms.listTransactions()", AccessMode.read)
+
+    time.sleep(0.05)
+    connection.execute("MATCH (n) RETURN n", AccessMode.read)
+    assert connection.breaker.state == CircuitState.closed
+    assert len(inner_connection.executed) == 4
+
+
+def test_gds_catalog_calls_are_light():
+    assert LimitedConnection.is_heavy("CALL gds.pageRank.write('graph', {})")
+    assert LimitedConnection.is_heavy("CALL gds.graph.create('graph', ['Page'], '*')")
+    assert not LimitedConnection.is_heavy("CALL gds.graph.exists('graph')")
+    assert not LimitedConnection.is_heavy("MATCH (n:Page) RETURN n")
+
+
+def test_members_of_the_limited_connection_are_the_routed_members():
+    writer, reader = FakeConnection(), FakeConnection()
+    connection = LimitedConnection(RoutingConnection(writer, (reader,)))
+
+    assert connection.members == (writer, reader)
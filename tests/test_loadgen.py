@@ -0,0 +1,95 @@
+import gzip
+import json
+
+import pytest
+
+from py2gds.loadgen import Workload, main
+
+
+def workload_spec(**spec):
+    return {
+        "connection": {"type": "fake", "results": [{"nodeId": 1, "score": 0.5}]},
+        "queries": [
+            {
+                "name": "site_rank",
+                "weight": 3,
+                "steps": [
+                    ["rank", "pagerank"],
+                    ["projected_by", {"labels": ["Page"], "relationships": ["LINKS"]}],
+                    ["limit", 10],
+                ],
+            },
+            {
+                "name": "home_rank",
+                "steps": [
+                    ["rank", "articlerank"],
+                    ["projected_by", {"labels": ["Page"], "relationships": ["LINKS"]}],
+                ],
+                "filters": [
+                    [["home", "Page", {"name": "Home"}]],
+                    [["home", "Page", {"name": "About"}]],
+                ],
+            },
+        ],
+        "requests": 40,
+        "seed": 7,
+        **spec,
+    }
+
+
+def test_threads_workload():
+    report = Workload.from_spec(workload_spec(concurrency=4)).run()
+
+    summary = report.summary()
+    assert summary["total"]["requests"] == 40
+    assert summary["total"]["error_rate"] == 0
+    assert set(summary["queries"]) == {"site_rank", "home_rank"}
+    assert summary["total"]["p99"] >= summary["total"]["p50"]
+
+
+def test_asyncio_workload_at_rate():
+    report = Workload.from_spec(
+        workload_spec(mode="asyncio", concurrency=4, rate=1000)
+    ).run()
+
+    assert report.summary()["total"]["requests"] == 40
+
+
+@pytest.mark.parametrize("mode", ["threads", "asyncio"])
+def test_fixed_rate_latencies_count_the_wait_behind_slow_queries(mode):
+    spec = workload_spec(
+        connection={"type": "fake", "latency": 0.02},
+        mode=mode,
+        concurrency=1,
+        rate=100,
+        requests=5,
+    )
+
+    report = Workload.from_spec(spec).run()
+
+    assert report.summary()["total"]["p99"] > 0.1
+
+
+def test_main_reports_errors(tmp_path, capsys):
+    trace_path = tmp_path / "trace.jsonl.gz"
+    gzip.open(trace_path, "wt").close()
+    spec_path = tmp_path / "workload.json"
+    spec = workload_spec(connection={"type": "replay", "path": str(trace_path)})
+    spec_path.write_text(json.dumps(spec))
+
+    exit_code = main([str(spec_path), "--requests", "5", "--json"])
+
+    summary = json.loads(capsys.readouterr().out)
+    assert exit_code == 1
+    assert summary["total"]["errors"] == {"RecordingNotFound": 5}
+
+
+def test_personalized_queries_use_the_filters_in_turns():
+    workload = Workload.from_spec(workload_spec())
+    query = next(query for query in workload.queries if query.name == "home_rank")
+    builders = query.builders(workload.connection)
+
+    first, second = next(builders), next(builders)
+
+    assert "{name: 'Home'}" in str(first)
+    assert "{name: 'About'}" in str(second)
@@ -0,0 +1,146 @@
+import re
+import time
+
+import pytest
+
+from py2gds.algorithm import AlgorithmType
+from py2gds.dsl import Query
+from py2gds.exceptions import CursorExpired
+from py2gds.pagination import Cursor
+from tests.fakes import FakeConnection
+
+
+class RankedConnection(FakeConnection):
+    """
+    It answers page queries like the server would over a ranking already written to nodes, and lists the
+    indexes it was asked to create as online.
+
+    """
+
+    scores = {node_id: float(node_id % 4) for node_id in range(10)}
+
+    def __init__(self):
+        super().__init__()
+        self.indexes = []
+
+    def execute(
+        self, query, access_mode=None, parameters=None, timeout=None, metadata=None
+    ):
+        super().execute(query, access_mode, parameters, timeout, metadata)
+        if "gds.graph.exists" in query:
+            return [{"exists": True}]
+        if query.startswith("CREATE INDEX"):
+            name, label, index_property = re.search(
+                r"INDEX (\S+) FOR \(n:(\S+)\)\s+ON \(n\.(\S+)\)", query
+            ).groups()
+            self.indexes.append(
+                {
+                    "name": name,
+                    "labelsOrTypes": [label],
+                    "properties": [index_property],
+                    "state": "ONLINE",
+                    "populationPercent": 100.0,
+                }
+            )
+        if query.startswith("SHOW INDEXES"):
+            return self.indexes
+        if "LIMIT $pageSize" not in query:
+            return []
+        rows = sorted(
+            ({"nodeId": node_id, "score": score} for node_id, score in self.scores.items()),
+            key=lambda row: (-row["score"], row["nodeId"]),
+        )
+        if "score" in parameters:
+            rows = [
+                row
+                for row in rows
+                if row["score"] < parameters["score"]
+                or (row["score"] == parameters["score"] and row["nodeId"] > parameters["nodeId"])
+            ]
+        return rows[: parameters["pageSize"]]
+
+
+@pytest.fixture
+def ranking():
+    connection = RankedConnection()
+    return (
+        Query.using(connection)
+        .rank(algorithm=AlgorithmType.PageRank)
+        .projected_by(labels=("Page",), relationships=("LINKS",))
+        .paginate(page_size=4)
+    )
+
+
+def test_pages_are_served_without_recomputing(ranking):
+    pages = [ranking.page()]
+    while pages[-1].next_cursor:
+        pages.append(ranking.page(pages[-1].next_cursor))
+
+    rows = [row for page in pages for row in page.rows]
+    assert [row["nodeId"] for row in rows] == [3, 7, 2, 6, 1, 5, 9, 0, 4, 8]
+    rank_queries = [
+        query for query, _ in ranking.connection.executed if "gds.pageRank" in query
+    ]
+    assert len(rank_queries) == 1
+    assert f"writeProperty: '{ranking.score_property}_" in rank_queries[0]
+
+
+def test_cursor_expires(ranking):
+    expired_cursor = Cursor(ranking.score_property, None, 1.0, 5, time.time() - 1)
+
+    with pytest.raises(CursorExpired):
+        ranking.page(expired_cursor.encode())
+
+
+def test_recomputed_ranking_rejects_previous_cursors(ranking):
+    next_cursor = ranking.page().next_cursor
+    ranking.compute()
+
+    with pytest.raises(CursorExpired):
+        ranking.page(next_cursor)
+
+
+def test_recomputed_ranking_is_switched_to_once_written(ranking):
+    ranking.page()
+    previous_property = ranking.generation_property(ranking._generation)
+    ranking.compute()
+
+    queries = [query for query, _ in ranking.connection.executed]
+    writes = [
+        index for index, query in enumerate(queries) if "gds.pageRank.write" in query
+    ]
+    removals = [
+        index for index, query in enumerate(queries) if query.startswith("MATCH (n)\nREMOVE")
+    ]
+    assert len(writes) == 2 and len(removals) == 1
+    assert writes[1] < removals[0]
+    assert f"REMOVE n.{previous_property}" in queries[removals[0]]
+    assert f"node.{previous_property}" not in queries[-1]
+    assert ranking.page().rows
+
+
+def test_pages_are_filtered_by_labels():
+    ranking = (
+        Query.using(RankedConnection())
+        .rank(algorithm=AlgorithmType.PageRank)
+        .projected_by(labels=("Page",), relationships=("LINKS",))
+        .labelled("Page", "Home")
+        .paginate(page_size=4)
+    )
+
+    ranking.page()
+
+    page_query, _ = ranking.connection.executed[-1]
+    assert page_query.startswith("MATCH (node:`Page`:`Home`)")
+
+
+def test_limited_ranking_cant_be_paginated():
+    builder = (
+        Query.using(RankedConnection())
+        .rank(algorithm=AlgorithmType.PageRank)
+        .projected_by(labels=("Page",), relationships=("LINKS",))
+        .limit(10)
+    )
+
+    with pytest.raises(ValueError):
+        builder.paginate()
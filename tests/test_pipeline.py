@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from py2gds.exceptions import MissingDependency
+from py2gds.pipeline import ParallelPipeline, chunked
+from py2gds.queries import MatchNode, Node
+from tests.fakes import FakeConnection
+
+
+def squared_scores(rows):
+    return [{"id": row["id"], "score": row["score"] ** 2} for row in rows]
+
+
+def arrow_scores(batch):
+    return batch.column("score")
+
+
+def worker_pids(rows):
+    return [os.getpid()]
+
+
+def test_chunks_keep_the_order_of_rows():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_results_are_gathered_in_order():
+    rows = ({"id": index, "score": index} for index in range(1000))
+    pipeline = ParallelPipeline(
+        squared_scores, chunk_size=7, max_workers=2, max_pending=3
+    )
+
+    results = list(pipeline.map(rows))
+
+    assert [result["id"] for result in results] == list(range(1000))
+    assert results[10]["score"] == 100
+
+
+def test_chunks_are_transformed_in_other_processes():
+    rows = ({"id": index, "score": index} for index in range(10))
+    pipeline = ParallelPipeline(worker_pids, chunk_size=1, max_workers=2)
+
+    assert os.getpid() not in set(pipeline.map(rows))
+
+
+def test_query_results_are_streamed():
+    connection = FakeConnection([{"n": 1}, {"n": 2}])
+    query = MatchNode(connection, Node("Page", {"name": "Home"}, "n"))
+
+    stream = query.stream(log=False)
+
+    assert not connection.executed
+    assert list(stream) == [{"n": 1}, {"n": 2}]
+
+
+def test_arrow_chunks_are_record_batches():
+    pipeline = ParallelPipeline(arrow_scores, max_workers=1, arrow=True)
+    rows = [{"id": 1, "score": 1.0}, {"id": 2, "score": 0.5}]
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        with pytest.raises(MissingDependency):
+            list(pipeline.map(rows))
+    else:
+        assert list(pipeline.map(rows)) == [1.0, 0.5]
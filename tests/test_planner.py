@@ -0,0 +1,104 @@
+from py2gds.algorithm import AlgorithmType
+from py2gds.dsl import Query
+from py2gds.planner import ProjectionPlanner
+from py2gds.projection import NativeProjection, ProjectionIdentity
+from tests.fakes import FakeConnection
+
+
+def test_subset_is_served_by_existing_superset():
+    connection = FakeConnection()
+    superset = NativeProjection(
+        connection,
+        ProjectionIdentity(labels=("Page", "Site"), relationships=("LINKS", "OWNS")),
+    )
+    connection.results = [{"graphName": superset.name}]
+    planner = ProjectionPlanner.create(connection, [superset])
+
+    plan = planner.plan(
+        NativeProjection(
+            connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+        )
+    )
+
+    assert plan.projection == superset
+    assert plan.node_labels == ("Page",)
+    assert plan.relationship_types == ("LINKS",)
+
+
+def test_missing_superset_is_not_reused():
+    connection = FakeConnection()
+    superset = NativeProjection(
+        connection, ProjectionIdentity(labels=("Page", "Site"), relationships=("LINKS",))
+    )
+    planner = ProjectionPlanner.create(connection, [superset])
+    projection = NativeProjection(
+        connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+    )
+
+    plan = planner.plan(projection)
+
+    assert plan.projection == projection
+    assert plan.node_labels is None
+
+
+def test_dsl_uses_planner():
+    connection = FakeConnection()
+    superset = NativeProjection(
+        connection,
+        ProjectionIdentity(labels=("Page", "Site"), relationships=("LINKS",)),
+    )
+    connection.results = [{"graphName": superset.name, "exists": True}]
+    planner = ProjectionPlanner.create(connection, [superset])
+
+    Query.using(connection, planner=planner).rank(
+        algorithm=AlgorithmType.PageRank
+    ).projected_by(labels=("Page",), relationships=("LINKS",)).run()
+
+    rank_query, _ = connection.executed[-1]
+    assert f"'{superset.name}'" in rank_query
+    assert "nodeLabels: ['Page']" in rank_query
+    assert "relationshipTypes" not in rank_query
+
+
+def test_catalog_is_listed_once_per_ttl():
+    connection = FakeConnection()
+    planner = ProjectionPlanner(connection, catalog_ttl=60)
+    projection = NativeProjection(
+        connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+    )
+
+    planner.plan(projection, log=False)
+    planner.plan(projection, log=False)
+    listed = len(connection.executed)
+    planner.invalidate()
+    planner.plan(projection, log=False)
+
+    assert listed == 1
+    assert len(connection.executed) == 2
+
+
+def test_rendering_dsl_query_does_not_plan():
+    connection = FakeConnection()
+    superset = NativeProjection(
+        connection,
+        ProjectionIdentity(labels=("Page", "Site"), relationships=("LINKS",)),
+    )
+    connection.results = [{"graphName": superset.name}]
+    planner = ProjectionPlanner.create(connection, [superset])
+    builder = (
+        Query.using(connection, planner=planner)
+        .rank(algorithm=AlgorithmType.PageRank)
+        .projected_by(labels=("Page",), relationships=("LINKS",))
+    )
+    requested = builder._projection
+
+    cypher = str(builder)
+
+    assert f"'{requested.name}'" in cypher
+    assert not connection.executed
+    assert builder._projection is requested
+
+    connection.results = [{"graphName": superset.name, "exists": True}]
+    builder.run(log=False)
+    assert f"'{superset.name}'" in str(builder)
+    assert "nodeLabels: ['Page']" in str(builder)
@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+
+from py2gds.algorithm import AlgorithmType
+from py2gds.dsl import Query
+from py2gds.progress import JobProgress, ProgressMonitor, Stage, monitor
+from py2gds.projection import NativeProjection, ProjectionIdentity
+from tests.fakes import FakeConnection
+
+
+class ProgressingConnection(FakeConnection):
+    """
+    It reports a job that advances 25% on every poll until it is killed.
+
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.polls = 0
+        self.killed = threading.Event()
+
+    def execute(
+        self, query, access_mode=None, parameters=None, timeout=None, metadata=None
+    ):
+        super().execute(query, access_mode, parameters, timeout, metadata)
+        if "gds.beta.listProgress" in query:
+            self.polls += 1
+            return [
+                {
+                    "jobId": parameters["jobId"],
+                    "taskName": "GraphCreate",
+                    "progress": f"{min(self.polls * 25, 100)}%",
+                }
+            ]
+        if "dbms.killTransaction" in query:
+            self.killed.set()
+        if "gds.graph.create" in query:
+            self.killed.wait(5)
+        return []
+
+
+def test_progress_from_result():
+    progress = JobProgress.from_result(
+        {"jobId": "ranking", "taskName": "PageRank", "progress": "25.0%"}, elapsed=10
+    )
+
+    assert progress.percent == 25.0
+    assert progress.phase == "PageRank"
+    assert progress.eta == 30.0
+    assert JobProgress.from_result(
+        {"jobId": "ranking", "taskName": "PageRank", "progress": "n/a"}, elapsed=10
+    ).eta is None
+
+
+def test_monitor_reports_progress():
+    connection = ProgressingConnection()
+    progresses = []
+
+    with ProgressMonitor(connection, "ranking", progresses.append, interval=0.01):
+        while connection.polls < 2:
+            threading.Event().wait(0.01)
+
+    assert [progress.percent for progress in progresses][:2] == [25.0, 50.0]
+    assert progresses[-1].percent == 100.0
+
+
+def test_creation_is_killed_when_callback_returns_false():
+    connection = ProgressingConnection()
+    projection = NativeProjection(
+        connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+    )
+
+    projection.create(tag="ranking", progress=lambda progress: progress.percent < 50)
+
+    create_query, _ = connection.executed[0]
+    kill_query, _ = connection.executed[-1]
+    assert "jobId: 'ranking'" in create_query
+    assert "dbms.killTransaction" in kill_query
+    assert connection.parameters[-1] == {"tag": "ranking"}
+
+
+def test_projection_and_rank_are_reported_as_stages():
+    connection = FakeConnection([{"exists": False}])
+    progresses = []
+
+    Query.using(connection).rank(AlgorithmType.PageRank).projected_by(
+        labels=("Page",), relationships=("LINKS",)
+    ).run(log=False, progress=progresses.append)
+
+    assert [(progress.stage, progress.percent) for progress in progresses] == [
+        (Stage.projection, 100.0),
+        (Stage.rank, 100.0),
+    ]
+
+
+def test_untagged_jobs_cant_be_monitored():
+    with pytest.raises(ValueError):
+        monitor(FakeConnection(), None, print)
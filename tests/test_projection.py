@@ -1,4 +1,15 @@
-from py2gds.projection import Projection
+from py2gds.projection import (
+    Projection,
+    NativeProjection,
+    ProjectionIdentity,
+    FilteredProjection,
+    RelationshipProjection,
+    Orientation,
+    Aggregation,
+    RefreshableProjection,
+)
+from py2gds.rank import RankConfiguration, StreamPageRank
+from tests.fakes import FakeConnection
 
 
 def test_check_projection(pages_and_links_projection: Projection):
@@ -6,3 +17,111 @@ def test_check_projection(pages_and_links_projection: Projection):
         pages_and_links_projection.delete()
     pages_and_links_projection.create()
     assert pages_and_links_projection.exists()
+
+
+def test_read_concurrency():
+    connection = FakeConnection()
+    projection = NativeProjection(
+        connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+    )
+
+    projection.create(read_concurrency=8)
+
+    query, _ = connection.executed[0]
+    assert "{readConcurrency: 8}" in query
+
+
+def test_filtered_projection_with_properties():
+    connection = FakeConnection([{"exists": False}])
+    projection = NativeProjection(
+        connection,
+        ProjectionIdentity(
+            labels=("Page",),
+            relationships=("LINKS",),
+            node_properties=("visits",),
+            relationship_properties=("weight",),
+        ),
+    )
+    filtered_projection = FilteredProjection.of(projection, "n.visits > 10")
+
+    filtered_projection.create()
+
+    _, create_query, create_subgraph_query = [query for query, _ in connection.executed]
+    assert "nodeProperties: ['visits'], relationshipProperties: ['weight']" in create_query
+    assert f"'{projection.name}'" in create_subgraph_query
+    assert "'n.visits > 10'" in create_subgraph_query
+    assert filtered_projection.name != projection.name
+
+
+def test_relationship_orientation():
+    connection = FakeConnection()
+    undirected_projection = NativeProjection(
+        connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+    )
+    directed_projection = NativeProjection(
+        connection,
+        ProjectionIdentity(
+            labels=("Page",),
+            relationships=(
+                RelationshipProjection("LINKS", Orientation.natural, Aggregation.single),
+            ),
+        ),
+    )
+
+    assert "orientation:'UNDIRECTED'" in undirected_projection.create_query.cypher
+    assert (
+        "orientation:'NATURAL', aggregation:'SINGLE'"
+        in directed_projection.create_query.cypher
+    )
+    assert undirected_projection.name != directed_projection.name
+
+
+def test_refresh_keeps_serving_the_old_generation():
+    connection = FakeConnection()
+    projection = RefreshableProjection(
+        connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+    )
+    base_name = projection.base_name
+
+    with projection.in_use() as name:
+        new_name = projection.refresh()
+
+        assert name == base_name
+        assert projection.name == base_name
+        assert new_name == f"{base_name}_v1"
+        assert not any("gds.graph.drop" in query for query, _ in connection.executed)
+
+    assert projection.name == new_name
+    query, _ = connection.executed[-1]
+    assert query == f"CALL gds.graph.drop('{base_name}')"
+
+
+def test_refresh_drops_unused_generation():
+    connection = FakeConnection()
+    projection = RefreshableProjection(
+        connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+    )
+
+    projection.refresh()
+    projection.refresh()
+
+    queries = [query for query, _ in connection.executed]
+    assert f"'{projection.base_name}_v1'" in queries[0]
+    assert queries[1] == f"CALL gds.graph.drop('{projection.base_name}')"
+    assert queries[3] == f"CALL gds.graph.drop('{projection.base_name}_v1')"
+    assert projection.name == f"{projection.base_name}_v2"
+
+
+def test_rendered_rank_runs_on_the_refreshed_generation():
+    connection = FakeConnection()
+    projection = RefreshableProjection(
+        connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+    )
+    rank = StreamPageRank(connection, projection, RankConfiguration())
+    assert f"'{projection.base_name}'" in rank.cypher
+
+    new_name = projection.refresh()
+    rank.run()
+
+    query, _ = connection.executed[-1]
+    assert f"gds.pageRank.stream('{new_name}'" in query
@@ -1,6 +1,40 @@
 from py2gds.connection import Connection
-from py2gds.queries import MatchNode
+from py2gds.queries import (
+    CheckLabel,
+    CreateIndex,
+    DeleteNode,
+    MatchNode,
+    Node,
+    ShowIndexes,
+)
+from tests.fakes import FakeConnection
 
 
 def test_create_node(graph_connection: Connection, home_page):
     assert MatchNode(graph_connection, home_page).run()
+
+
+def test_queries_with_custom_results_can_be_started():
+    connection = FakeConnection([{"exists": True}])
+
+    running = CheckLabel(connection, "Page").start(log=False, timeout=5)
+
+    assert running.result() is True
+    assert connection.timeouts == [5]
+
+
+def test_node_without_reference_is_deleted_as_n():
+    cypher = DeleteNode(FakeConnection(), Node("Page", {"name": "Home"})).cypher
+
+    assert cypher == "MATCH (n:Page {name: 'Home'})\nDELETE n"
+
+
+def test_index_queries_escape_names():
+    connection = FakeConnection()
+
+    create = CreateIndex(connection, "Page", ["page rank"], None).cypher
+    show = ShowIndexes(connection).cypher
+
+    assert create == "CREATE INDEX Page_index FOR (n:Page)\nON (n.`page rank`)"
+    assert "YIELD name, labelsOrTypes, properties, state, populationPercent, " in show
+    assert "WHERE entityType = 'NODE'" in show
@@ -1,5 +1,8 @@
+import pytest
+
 from py2gds.connection import Connection
-from py2gds.projection import Projection
+from py2gds.exceptions import IncompatibleRanks
+from py2gds.projection import Projection, NativeProjection, ProjectionIdentity
 from py2gds.queries import RemoveProperty
 from py2gds.rank import (
     StreamPageRank,
@@ -7,7 +10,10 @@ from py2gds.rank import (
     WritePageRank,
     WriteArticleRank,
     RankConfiguration,
+    RankConfigurationWithFilter,
+    StreamFusedRank,
 )
+from tests.fakes import FakeConnection
 
 
 def test_stream_pagerank(
@@ -50,3 +56,151 @@ def test_write_articlerank(
     ).run()
     assert results
     RemoveProperty(graph_connection, "test_2").run()
+
+
+def test_source_nodes_are_collected_once():
+    connection = FakeConnection()
+    projection = NativeProjection(
+        connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+    )
+
+    cypher = StreamPageRank(
+        connection,
+        projection,
+        RankConfigurationWithFilter(
+            filter_elements=[
+                ("home", "Page", {"name": "Home"}),
+                ("sites", "Site", {"country": "ES"}),
+            ]
+        ),
+    ).cypher
+
+    assert "WITH collect(home) AS home_nodes" in cypher
+    assert "WITH home_nodes, collect(sites) AS sites_nodes" in cypher
+    assert "sourceNodes: home_nodes + sites_nodes" in cypher
+    assert "\nMATCH" not in cypher
+
+
+def test_labels_filter_runs_on_node_ids_before_materializing_nodes():
+    connection = FakeConnection()
+    projection = NativeProjection(
+        connection,
+        ProjectionIdentity(labels=("Page", "Site"), relationships=("LINKS",)),
+    )
+
+    cypher = StreamPageRank(
+        connection, projection, RankConfiguration(), labels_filter=("Page",)
+    ).cypher
+
+    assert "nodeLabels" not in cypher
+    assert "MATCH (node:Page)\nWHERE id(node) = nodeId" in cypher
+    assert "asNode" not in cypher
+
+
+def test_labels_filter_is_pushed_into_the_algorithm_with_subgraph():
+    connection = FakeConnection()
+    projection = NativeProjection(
+        connection,
+        ProjectionIdentity(labels=("Page", "Site"), relationships=("LINKS",)),
+    )
+
+    cypher = StreamPageRank(
+        connection,
+        projection,
+        RankConfiguration(),
+        labels_filter=("Page",),
+        subgraph=True,
+    ).cypher
+
+    assert "nodeLabels: ['Page']" in cypher
+    assert "MATCH" not in cypher
+    assert "gds.util.asNode(nodeId) AS node" in cypher
+
+
+def test_redundant_labels_filter_is_dropped():
+    connection = FakeConnection()
+    projection = NativeProjection(
+        connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+    )
+
+    cypher = StreamPageRank(
+        connection, projection, RankConfiguration(), labels_filter=("Page",)
+    ).cypher
+
+    assert ":Page" not in cypher
+    assert "nodeLabels" not in cypher
+
+
+def test_top_per_group_is_sliced_in_the_server():
+    connection = FakeConnection()
+    projection = NativeProjection(
+        connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+    )
+
+    cypher = StreamPageRank(
+        connection,
+        projection,
+        RankConfiguration(),
+        group_by="site",
+        group_limit=10,
+        normalize_per_group=True,
+    ).cypher
+
+    assert "WITH node, score\nORDER BY score DESC" in cypher
+    assert "collect({node: node, score: score})[0..10] AS top" in cypher
+    assert "row.score / top[0].score END AS score" in cypher
+    assert cypher.endswith("RETURN site, node, score")
+
+
+def test_selected_group_property_is_returned_once():
+    connection = FakeConnection()
+    projection = NativeProjection(
+        connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+    )
+
+    cypher = StreamPageRank(
+        connection,
+        projection,
+        RankConfiguration(),
+        group_by="site",
+        group_limit=3,
+        returned_properties=("site", "url"),
+    ).cypher
+
+    assert cypher.endswith("RETURN node.site AS site, node.url AS url, score")
+
+
+def test_fused_ranks_are_joined_in_one_query():
+    connection = FakeConnection()
+    projection = NativeProjection(
+        connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+    )
+    configuration = RankConfiguration()
+
+    cypher = StreamFusedRank(
+        connection,
+        (
+            StreamPageRank(connection, projection, configuration),
+            StreamArticleRank(connection, projection, configuration),
+        ),
+    ).cypher
+
+    assert cypher.count("CALL") == 2
+    assert "WITH nodeIds, pageRank, collect(score) AS articleRank" in cypher
+    assert "pageRank[i] AS pageRank, articleRank[i] AS articleRank" in cypher
+    assert cypher.endswith("RETURN node, pageRank, articleRank")
+
+
+def test_fused_ranks_must_share_the_projection():
+    connection = FakeConnection()
+    pages = NativeProjection(connection, ProjectionIdentity(labels=("Page",)))
+    sites = NativeProjection(connection, ProjectionIdentity(labels=("Site",)))
+
+    with pytest.raises(IncompatibleRanks):
+        StreamFusedRank(
+            connection,
+            (
+                StreamPageRank(connection, pages, RankConfiguration()),
+                StreamArticleRank(connection, sites, RankConfiguration()),
+            ),
+        )
@@ -0,0 +1,63 @@
+import pytest
+
+from py2gds.connection import AccessMode, RoutingConnection
+from py2gds.exceptions import RecordingNotFound
+from py2gds.projection import NativeProjection, ProjectionIdentity
+from py2gds.queries import MatchNode, Node
+from py2gds.rank import StreamPageRank, RankConfiguration
+from py2gds.recording import RecordingConnection, ReplayConnection, read_recordings
+from tests.fakes import FakeConnection
+
+
+def test_replay_serves_recorded_results(tmp_path):
+    path = tmp_path / "trace.jsonl.gz"
+    results = [{"nodeId": 1, "score": 0.5}]
+    with RecordingConnection(FakeConnection(results), path) as connection:
+        projection = NativeProjection(
+            connection, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+        )
+        StreamPageRank(connection, projection, RankConfiguration()).run()
+        MatchNode(connection, Node("Page", {"name": "Home"})).run()
+
+    recordings = list(read_recordings(path))
+    replay = ReplayConnection.load(path, latency_scale=0)
+    projection = NativeProjection(
+        replay, ProjectionIdentity(labels=("Page",), relationships=("LINKS",))
+    )
+
+    assert [recording.access_mode for recording in recordings] == [
+        AccessMode.write,
+        AccessMode.read,
+    ]
+    assert len(replay) == 2
+    assert StreamPageRank(replay, projection, RankConfiguration()).run() == results
+    with pytest.raises(RecordingNotFound):
+        MatchNode(replay, Node("Page", {"name": "About"})).run()
+
+
+def test_repeated_queries_replay_in_order(tmp_path):
+    path = tmp_path / "trace.jsonl.gz"
+    inner_connection = FakeConnection()
+    with RecordingConnection(inner_connection, path) as connection:
+        for count in range(3):
+            inner_connection.results = [{"count": count}]
+            connection.execute("MATCH (n) RETURN count(n) AS count", AccessMode.read)
+
+    replay = ReplayConnection.load(path, latency_scale=0)
+
+    counts = [
+        replay.execute("MATCH (n)\nRETURN count(n) AS count", AccessMode.read)
+        for _ in range(4)
+    ]
+    assert counts == [[{"count": 0}], [{"count": 1}], [{"count": 2}], [{"count": 0}]]
+
+
+def test_recording_keeps_the_members_of_the_wrapped_connection(tmp_path):
+    writer, reader = FakeConnection(), FakeConnection()
+    recording = RecordingConnection(
+        RoutingConnection(writer, (reader,)), tmp_path / "trace.jsonl.gz"
+    )
+    replay = ReplayConnection({}, latency_scale=0)
+
+    assert recording.members == (writer, reader)
+    assert replay.members == (replay,)
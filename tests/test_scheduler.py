@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+
+from py2gds.algorithm import AlgorithmType
+from py2gds.dsl import Query
+from py2gds.exceptions import InvalidSchedule
+from py2gds.scheduler import Job, JobScheduler
+from tests.fakes import FakeConnection
+
+
+class CatalogConnection(FakeConnection):
+    """
+    It keeps the graph catalog and tracks how many projections are loaded at once.
+
+    """
+
+    def __init__(self, failing_property=None, failing_label=None):
+        super().__init__()
+        self.catalog = set()
+        self.created = []
+        self.dropped = []
+        self.peak = 0
+        self.failing_property = failing_property
+        self.failing_label = failing_label
+        self.lock = threading.Lock()
+
+    def execute(
+        self, query, access_mode=None, parameters=None, timeout=None, metadata=None
+    ):
+        super().execute(query, access_mode, parameters, timeout, metadata)
+        name = query.split("('", 1)[1].split("'", 1)[0] if "('" in query else None
+        with self.lock:
+            if "gds.graph.exists" in query:
+                return [{"exists": name in self.catalog}]
+            if "gds.graph.create" in query:
+                if self.failing_label and f"'{self.failing_label}'" in query:
+                    raise RuntimeError("Projection failed")
+                self.catalog.add(name)
+                self.created.append(name)
+                self.peak = max(self.peak, len(self.catalog))
+            if "gds.graph.drop" in query:
+                self.catalog.discard(name)
+                self.dropped.append(name)
+            if self.failing_property and f"'{self.failing_property}'" in query:
+                raise RuntimeError("Rank failed")
+        return []
+
+
+def rank_job(connection, name, label, depends_on=()):
+    query = (
+        Query.using(connection)
+        .rank(AlgorithmType.PageRank)
+        .projected_by(labels=(label,), relationships=("LINKS",))
+        .write(name)
+    )
+    return Job(name, query, depends_on)
+
+
+def test_projections_are_shared_and_dropped_after_their_last_job():
+    connection = CatalogConnection()
+    jobs = [
+        rank_job(connection, "page_1", "Page"),
+        rank_job(connection, "page_2", "Page"),
+        rank_job(connection, "site_1", "Site", depends_on=("page_1",)),
+        rank_job(connection, "user_1", "User"),
+    ]
+
+    results = JobScheduler(max_projections=1, log=False).run(jobs)
+
+    assert all(result.succeeded for result in results.values())
+    assert len(connection.created) == 3
+    assert sorted(connection.dropped) == sorted(connection.created)
+    assert connection.peak == 1
+
+
+def test_dependents_of_failed_jobs_are_skipped():
+    connection = CatalogConnection(failing_property="page_1")
+    jobs = [
+        rank_job(connection, "page_1", "Page"),
+        rank_job(connection, "site_1", "Site", depends_on=("page_1",)),
+        rank_job(connection, "site_2", "Site", depends_on=("site_1",)),
+    ]
+
+    results = JobScheduler(log=False).run(jobs)
+
+    assert results["page_1"].error
+    assert results["site_1"].skipped
+    assert results["site_2"].skipped
+    assert len(connection.created) == 1
+
+
+def test_jobs_of_failed_projections_fail_without_running():
+    connection = CatalogConnection(failing_label="Page")
+    jobs = [
+        rank_job(connection, "page_1", "Page"),
+        rank_job(connection, "page_2", "Page"),
+        rank_job(connection, "user_1", "User"),
+    ]
+
+    results = JobScheduler(log=False).run(jobs)
+
+    assert str(results["page_1"].error) == "Projection failed"
+    assert str(results["page_2"].error) == "Projection failed"
+    assert results["user_1"].succeeded
+    assert not any("page_" in query for query, _ in connection.executed)
+
+
+def test_cyclic_dependencies_are_rejected():
+    connection = CatalogConnection()
+    jobs = [
+        rank_job(connection, "a", "Page", depends_on=("b",)),
+        rank_job(connection, "b", "Page", depends_on=("a",)),
+    ]
+
+    with pytest.raises(InvalidSchedule):
+        JobScheduler(log=False).run(jobs)
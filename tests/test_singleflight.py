@@ -0,0 +1,86 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from py2gds.connection import SingleFlightConnection, AccessMode
+from py2gds.limiter import LimitedConnection
+from py2gds.projection import NativeProjection, ProjectionIdentity
+from tests.fakes import FakeConnection
+
+
+class SlowConnection(FakeConnection):
+    def execute(
+        self,
+        query,
+        access_mode=AccessMode.write,
+        parameters=None,
+        timeout=None,
+        metadata=None,
+    ):
+        time.sleep(0.2)
+        return super().execute(query, access_mode, parameters, timeout, metadata)
+
+
+def test_concurrent_identical_reads_share_one_execution():
+    inner_connection = SlowConnection([{"score": 1.0}])
+    connection = SingleFlightConnection(inner_connection)
+    queries = ["MATCH (n:Page)\n RETURN n", "MATCH (n:Page) RETURN n"] * 4
+
+    with ThreadPoolExecutor(len(queries)) as executor:
+        results = list(
+            executor.map(lambda query: connection.execute(query, AccessMode.read), queries)
+        )
+
+    assert len(inner_connection.executed) == 1
+    assert all(result == [{"score": 1.0}] for result in results)
+
+
+def test_asyncio_tasks_share_one_execution():
+    inner_connection = SlowConnection()
+    connection = SingleFlightConnection(inner_connection)
+
+    async def run_queries():
+        return await asyncio.gather(
+            *(
+                connection.execute_async("RETURN $x", AccessMode.read, {"x": 1})
+                for _ in range(5)
+            ),
+            connection.execute_async("RETURN $x", AccessMode.read, {"x": 2}),
+        )
+
+    asyncio.run(run_queries())
+
+    assert len(inner_connection.executed) == 2
+
+
+def test_asyncio_writes_are_not_coalesced():
+    inner_connection = SlowConnection()
+    connection = SingleFlightConnection(inner_connection)
+
+    async def run_writes():
+        return await asyncio.gather(
+            *(
+                connection.execute_async("CREATE (:Page)", AccessMode.write)
+                for _ in range(5)
+            )
+        )
+
+    asyncio.run(run_writes())
+
+    assert len(inner_connection.executed) == 5
+
+
+def test_concurrent_projection_creations_are_coalesced():
+    connection = SlowConnection([{"graphName": "pages"}])
+    projection = NativeProjection(
+        LimitedConnection(connection),
+        ProjectionIdentity(labels=("Page",), relationships=("LINKS",)),
+    )
+
+    with ThreadPoolExecutor(4) as executor:
+        futures = [executor.submit(projection.create) for _ in range(4)]
+        results = [future.result() for future in futures]
+
+    assert len(connection.executed) == 1
+    assert all(result == [{"graphName": "pages"}] for result in results)
+    assert results[0] is not results[1]
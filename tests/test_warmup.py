@@ -0,0 +1,76 @@
+from threading import Event
+
+from py2gds.collection import Collection
+from py2gds.dsl import Query
+from py2gds.projection import TaggedProjection, ProjectionIdentity
+from py2gds.warmup import ProjectionWarmUp
+from tests.fakes import FakeConnection
+
+
+def test_warm_up_builds_each_projection_once():
+    connection = FakeConnection([{"exists": False}])
+    collection = Collection(
+        [
+            TaggedProjection(
+                connection,
+                ProjectionIdentity(labels=("Page",), relationships=("LINKS",)),
+                ["pages"],
+            ),
+            TaggedProjection(
+                connection,
+                ProjectionIdentity(labels=("Site",), relationships=("OWNS",)),
+                ["sites"],
+            ),
+        ]
+    )
+    warm_up = ProjectionWarmUp(max_workers=2)
+
+    futures = warm_up.start(collection)
+    warm_up.start(collection)
+    for future in futures.values():
+        future.result(timeout=5)
+
+    assert warm_up.progress().ready == 2
+    assert warm_up.progress().done
+    assert not warm_up.wait(collection.get_projection_by_tag("pages"))
+    assert len(connection.executed) == 4
+    warm_up.shutdown()
+
+
+class BlockedConnection(FakeConnection):
+    def __init__(self):
+        super().__init__([{"exists": False}])
+        self.unblocked = Event()
+
+    def execute(self, *args, **kwargs):
+        self.unblocked.wait(5)
+        return super().execute(*args, **kwargs)
+
+
+def test_wait_gives_up_after_its_own_timeout():
+    connection = BlockedConnection()
+    projection = TaggedProjection(
+        connection,
+        ProjectionIdentity(labels=("Page",), relationships=("LINKS",)),
+        ["pages"],
+    )
+    warm_up = ProjectionWarmUp(wait_timeout=0.01)
+    future = warm_up.submit(projection)
+
+    assert not warm_up.wait(projection)
+    connection.unblocked.set()
+    future.result(timeout=5)
+    warm_up.shutdown()
+
+
+def test_projection_dropped_after_warm_up_is_created_again():
+    connection = FakeConnection([{"exists": False}])
+    warm_up = ProjectionWarmUp()
+    builder = Query.using(connection, warm_up=warm_up).projected_by(
+        labels=("Page",), relationships=("LINKS",)
+    )
+    warm_up.submit(builder._projection).result(timeout=5)
+
+    assert builder.create_projection()
+    assert len(connection.executed) == 4
+    warm_up.shutdown()